@@ -1,9 +1,42 @@
 import uvicorn
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from routers import user, myTrip, tripPlan, crew, joinRequest, chat
+from routers import user, myTrip, tripPlan, crew, joinRequest, chat, notification
+from utils.metrics import MetricsMiddleware, metricsPayload
+from utils.queryDetector import QueryDetectorMiddleware, QUERY_DETECTOR_MODE
+from database import connectDatabases, closeDatabases, MONGO_BACKEND
+from utils.mongoIndex import ensureIndexes, indexUsageStats
+from utils.httpClient import startHttpClient, closeHttpClient
+from utils.llmGateway import closeLlmGateway
+from utils.notification import startNotificationHub, stopNotificationHub
+from utils.intentRouter import flushIntentLogs
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    connectDatabases()
+    # MongoDB 인덱스 생성 및 TTL 설정, 실패해도 서버는 시작
+    try:
+        ensureIndexes()
+        # mongomock(임베디드 모드)은 $indexStats를 지원하지 않음
+        if MONGO_BACKEND == "mongodb":
+            logger.info("mongo index usage: %s", indexUsageStats())
+    except Exception:
+        logger.exception("failed to ensure mongo indexes")
+    await startHttpClient()
+    await startNotificationHub()
+    yield
+    await stopNotificationHub()
+    # 아직 기록하지 못한 의도 분류 로그를 DB 연결을 닫기 전에 기록
+    await flushIntentLogs()
+    await closeHttpClient()
+    await closeLlmGateway()
+    closeDatabases()
+
+app = FastAPI(lifespan=lifespan)
 
 origins = ["*"]
 
@@ -15,13 +48,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
+# 개발 환경에서만 N+1 쿼리 감지 (secret.json의 QUERY_DETECTOR_MODE: "log" 또는 "raise")
+if QUERY_DETECTOR_MODE != "off":
+    app.add_middleware(QueryDetectorMiddleware)
+
 @app.get('/')
 async def health_check():
     return "OK"
 
+@app.get('/getIndexStats', description="MongoDB 컬렉션별 인덱스 사용 통계")
+async def getIndexStats():
+    try:
+        return {"result code": 200, "response": indexUsageStats()}
+    except Exception as e:
+        return {"result code": 500, "response": str(e)}
+
+@app.get('/metrics', include_in_schema=False)
+async def metrics():
+    content, content_type = metricsPayload()
+    return Response(content=content, media_type=content_type)
+
 app.include_router(user.router, tags=["user"])
 app.include_router(myTrip.router, tags=["mytrip"])
 app.include_router(tripPlan.router, tags=["tripPlan"])
 app.include_router(crew.router, tags=["crew"])
 app.include_router(joinRequest.router, tags=["joinRequest"])
-app.include_router(chat.router, tags=["chat"])
\ No newline at end of file
+app.include_router(chat.router, tags=["chat"])
+app.include_router(notification.router, tags=["notification"])
@@ -0,0 +1,66 @@
+import os
+import sys
+import math
+import random
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.geo import dailyRouteStats, distanceMatrix
+
+# 일정 수가 많은 여행에서 날짜별 이동 거리 계산 시간을 측정
+# 실행: python benchmarks/benchRouteStats.py [일정 수 ...]
+def syntheticPlans(count, days=10, seed=0):
+    random.seed(seed)
+    return [
+        {
+            "planId": str(i),
+            "date": f"2024-05-{1 + i % days:02d}",
+            "time": f"{9 + (i // days) % 12:02d}:00:00",
+            "place": f"place {i}",
+            "latitude": 37.5 + random.uniform(-0.2, 0.2),
+            "longitude": 127.0 + random.uniform(-0.2, 0.2)
+        }
+        for i in range(count)
+    ]
+
+def loopRouteStats(plans):
+    # 비교용: 구간마다 math로 계산하는 단순 구현 (같은 응답 형태)
+    plans = sorted(plans, key=lambda plan: (plan["date"], plan["time"]))
+    days = {}
+    for plan in plans:
+        days.setdefault(plan["date"], {"date": plan["date"], "planCount": 0, "totalKm": 0.0, "legs": []})["planCount"] += 1
+    for prev, plan in zip(plans, plans[1:]):
+        if prev["date"] != plan["date"]:
+            continue
+        lat1, lon1, lat2, lon2 = map(math.radians, (prev["latitude"], prev["longitude"], plan["latitude"], plan["longitude"]))
+        a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        km = 2 * 6371.0 * math.asin(math.sqrt(a))
+        day = days[plan["date"]]
+        day["totalKm"] += km
+        day["legs"].append({
+            "fromPlanId": prev["planId"], "toPlanId": plan["planId"],
+            "fromPlace": prev["place"], "toPlace": plan["place"], "km": round(km, 3)
+        })
+    return {date: day["totalKm"] for date, day in days.items()}
+
+def timeit(func, *args, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main(sizes):
+    print(f"{'plans':>6} {'routeStats ms':>14} {'loop ms':>9} {'matrix ms':>10}")
+    for size in sizes:
+        plans = syntheticPlans(size)
+        coords = [[plan["latitude"], plan["longitude"]] for plan in plans]
+        vectorized = {day["date"]: day["totalKm"] for day in dailyRouteStats(plans)}
+        looped = loopRouteStats(plans)
+        assert all(abs(vectorized[date] - round(km, 3)) < 1e-6 for date, km in looped.items())
+        print(f"{size:>6} {timeit(dailyRouteStats, plans):>14.2f} {timeit(loopRouteStats, plans):>9.2f} {timeit(distanceMatrix, coords):>10.2f}")
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [100, 300, 1000, 3000])
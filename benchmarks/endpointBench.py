@@ -0,0 +1,335 @@
+import os
+import sys
+import argparse
+import asyncio
+import datetime
+import json
+import random
+import subprocess
+import time
+import uuid
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+# 기본은 임베디드 모드(SQLite + mongomock)라 외부 서비스 없이 실행, 실제 DB로 측정하려면 STORAGE_MODE=external
+os.environ.setdefault("STORAGE_MODE", "embedded")
+
+import httpx
+from sqlalchemy import insert
+from database import sqldb, db, mongodb_url, USE_MONGODB
+from models.models import user, myTrips, tripPlans, crew, joinRequests
+from utils.chatBucket import buildBuckets
+from utils.passwordHash import pwd_context
+from utils.providers import FAKE_PROVIDER_URL
+
+# 합성 데이터를 규모별로 넣고 실제 FastAPI 앱을 프로세스 안에서(ASGI) 호출해서 엔드포인트별 처리량/지연시간 측정
+# 외부 API를 부르는 엔드포인트는 --providers일 때만 가짜 서버(benchmarks/fakeProviders.py)로 측정, 결과는 커밋 간 비교용 JSON
+# 실행: python benchmarks/endpointBench.py --rows 10000 --requests 200 --output result.json
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "mysql", "mongodb"}
+PREFIX = "bench-"
+PASSWORD = "bench-password"
+CHUNK = 5000
+
+CITIES = [
+    ("대한민국", "서울", 37.5665, 126.9780),
+    ("일본", "도쿄", 35.6762, 139.6503),
+    ("프랑스", "파리", 48.8566, 2.3522),
+    ("스페인", "바르셀로나", 41.3874, 2.1686),
+    ("미국", "뉴욕", 40.7128, -74.0060),
+]
+
+def checkLocal(providers=False):
+    # 운영 DB에 합성 데이터를 넣지 않도록 로컬 주소가 아니면 중단
+    sql_url = sqldb.engine.url
+    hosts = [sql_url.host] if sql_url.get_backend_name() != "sqlite" else []
+    if USE_MONGODB:
+        hosts.append(urlsplit(mongodb_url).hostname)
+    if providers:
+        # 유료 API를 부르지 않도록 가짜 서버가 설정된 경우만 허용
+        if not FAKE_PROVIDER_URL:
+            raise SystemExit("--providers needs FAKE_PROVIDER_URL (run benchmarks/fakeProviders.py)")
+        hosts.append(urlsplit(FAKE_PROVIDER_URL).hostname)
+    remote = [host for host in hosts if host and host not in LOCAL_HOSTS]
+    if remote:
+        raise SystemExit(f"refusing to run against non-local hosts: {', '.join(remote)}")
+
+def benchId():
+    # 키 컬럼이 String(36)이라 접두어 + uuid hex 30자리
+    return f"{PREFIX}{uuid.uuid4().hex[:30]}"
+
+def bulkInsert(session, model, rows):
+    for start in range(0, len(rows), CHUNK):
+        session.execute(insert(model), rows[start:start + CHUNK])
+
+def seed(rows, rnd):
+    # 전체 행 수를 테이블별로 나눔: 계획 60%, 참가 신청/채팅 메시지 각 10%, 여행 10%, 사용자/크루 각 5%
+    counts = {
+        "users": max(10, rows // 20),
+        "trips": max(20, rows // 10),
+        "plans": max(100, rows * 6 // 10),
+        "crews": max(10, rows // 20),
+        "joinRequests": max(20, rows // 10),
+        "chatMessages": max(20, rows // 10),
+    }
+    passwd = pwd_context.hash(PASSWORD)
+    users = [
+        {
+            "userId": benchId(), "id": f"{PREFIX}user{i}", "passwd": passwd, "nickname": f"bench{i}",
+            "birthDate": "1995-01-01", "sex": rnd.choice(["male", "female"]), "mainTrip": None,
+            "personality": {"transport": rnd.choice(["transport1", "transport2"]), "schedule": rnd.choice(["schedule1", "schedule2"])}
+        }
+        for i in range(counts["users"])
+    ]
+    trips = []
+    for i in range(counts["trips"]):
+        contry, city, latitude, longitude = rnd.choice(CITIES)
+        start = datetime.date(2024, 1, 1) + datetime.timedelta(days=rnd.randrange(300))
+        trips.append({
+            "tripId": benchId(), "userId": rnd.choice(users)["userId"], "title": f"bench trip {i}",
+            "contry": contry, "city": city, "latitude": latitude, "longitude": longitude,
+            "startDate": start.isoformat(), "endDate": (start + datetime.timedelta(days=rnd.randint(1, 6))).isoformat()
+        })
+    plans = []
+    for i in range(counts["plans"]):
+        trip = rnd.choice(trips)
+        start = datetime.date.fromisoformat(trip["startDate"])
+        days = (datetime.date.fromisoformat(trip["endDate"]) - start).days
+        plans.append({
+            "planId": benchId(), "userId": trip["userId"], "tripId": trip["tripId"], "title": f"plan {i}",
+            "date": (start + datetime.timedelta(days=rnd.randint(0, days))).isoformat(), "time": f"{rnd.randint(9, 21):02d}:00:00",
+            "place": f"place {i}", "address": f"address {i}",
+            "latitude": trip["latitude"] + rnd.uniform(-0.05, 0.05), "longitude": trip["longitude"] + rnd.uniform(-0.05, 0.05),
+            "description": "bench", "crewId": None
+        })
+    crews = []
+    for plan in rnd.sample(plans, min(counts["crews"], len(plans))):
+        plan["crewId"] = benchId()
+        crews.append({
+            "crewId": plan["crewId"], "planId": plan["planId"], "tripId": plan["tripId"], "title": "bench crew",
+            "contact": "bench", "note": "bench", "numOfMate": 4, "tripmate": plan["userId"], "sincheongIn": None,
+            "crewLeader": plan["userId"]
+        })
+    requests = []
+    for _ in range(counts["joinRequests"]):
+        target = rnd.choice(crews)
+        applicant = rnd.choice(users)["userId"]
+        requests.append({"crewId": target["crewId"], "tripId": rnd.choice(trips)["tripId"], "userId": applicant, "status": rnd.choice([0, 1, 2]), "alert": 0})
+        target["sincheongIn"] = applicant if not target["sincheongIn"] else f"{target['sincheongIn']},{applicant}"[:255]
+
+    session = sqldb.sessionmaker()
+    try:
+        bulkInsert(session, user, users)
+        bulkInsert(session, myTrips, trips)
+        bulkInsert(session, tripPlans, plans)
+        bulkInsert(session, crew, crews)
+        bulkInsert(session, joinRequests, requests)
+        session.commit()
+    finally:
+        session.close()
+
+    # 채팅 기록은 여행별 버킷 문서로, SavePlace는 여행마다 장소 10개
+    conversations = {}
+    now = datetime.datetime.now()
+    for i in range(counts["chatMessages"]):
+        trip = trips[i % len(trips)]
+        conversations.setdefault((trip["userId"], trip["tripId"]), []).append({
+            "timestamp": now - datetime.timedelta(minutes=counts["chatMessages"] - i),
+            "sender": "bot" if i % 2 else trip["userId"],
+            "message": f"bench message {i}", "isSerp": False
+        })
+    buckets = [bucket for (userId, tripId), conversation in conversations.items() for bucket in buildBuckets(userId, tripId, conversation)]
+    if buckets:
+        db['ChatBucket'].insert_many(buckets)
+    db['SavePlace'].insert_many([
+        {"userId": trip["userId"], "tripId": trip["tripId"], "placeData": [
+            {"title": f"saved {j}", "address": "bench", "latitude": trip["latitude"], "longitude": trip["longitude"], "description": "bench", "date": None, "time": None}
+            for j in range(10)
+        ]}
+        for trip in trips
+    ])
+
+    sample = lambda items: rnd.sample(items, min(1000, len(items)))
+    return counts, {"users": sample(users), "trips": sample(trips), "plans": sample(plans), "crews": sample(crews)}
+
+def cleanup():
+    session = sqldb.sessionmaker()
+    try:
+        for model, column in [(joinRequests, joinRequests.userId), (crew, crew.crewId), (tripPlans, tripPlans.tripId), (myTrips, myTrips.tripId), (user, user.userId)]:
+            session.query(model).filter(column.like(f"{PREFIX}%")).delete(synchronize_session=False)
+        session.commit()
+    finally:
+        session.close()
+    for collection in ["ChatBucket", "SavePlace", "SerpData"]:
+        db[collection].delete_many({"tripId": {"$regex": f"^{PREFIX}"}})
+
+def endpoints(data, rnd):
+    # (이름, 요청 인자를 만드는 함수) 목록, 라우터마다 DB만 사용하는 엔드포인트
+    pick = lambda key: rnd.choice(data[key])
+    def bulkPlans():
+        trip = pick("trips")
+        plans = [{"title": "bulk", "date": trip["startDate"], "time": "10:00:00", "place": f"saved {j}", "address": "bench",
+                  "latitude": trip["latitude"], "longitude": trip["longitude"], "description": "bench"} for j in range(10)]
+        return {"method": "POST", "url": "/insertTripPlansBulk", "json": {"userId": trip["userId"], "tripId": trip["tripId"], "plans": plans}}
+    def crewNearby():
+        plan = next((plan for plan in rnd.sample(data["plans"], len(data["plans"])) if plan["crewId"]), pick("plans"))
+        return {"method": "GET", "url": "/getCrewNearby", "params": {"planId": plan["planId"], "radiusKm": 5}}
+    return [
+        ("GET /", lambda: {"method": "GET", "url": "/"}),
+        ("GET /getUser", lambda: {"method": "GET", "url": "/getUser", "params": {"userId": pick("users")["userId"]}}),
+        ("GET /getUserId", lambda: {"method": "GET", "url": "/getUserId", "params": {"id": pick("users")["id"]}}),
+        ("POST /login", lambda: {"method": "POST", "url": "/login", "data": {"id": pick("users")["id"], "passwd": PASSWORD}}),
+        ("GET /getMyTrips", lambda: {"method": "GET", "url": "/getMyTrips", "params": {"userId": pick("trips")["userId"]}}),
+        ("GET /getTripPlans", lambda: {"method": "GET", "url": "/getTripPlans", "params": {"tripId": pick("trips")["tripId"]}}),
+        ("GET /getTripPlansDate", lambda: (lambda plan: {"method": "GET", "url": "/getTripPlansDate", "params": {"tripId": plan["tripId"], "date": plan["date"]}})(pick("plans"))),
+        ("GET /getTripRouteStats", lambda: {"method": "GET", "url": "/getTripRouteStats", "params": {"tripId": pick("trips")["tripId"]}}),
+        ("POST /insertTripPlansBulk", bulkPlans),
+        ("GET /getCrew", lambda: {"method": "GET", "url": "/getCrew", "params": {"crewId": pick("crews")["crewId"]}}),
+        ("GET /getThisTripCrew", lambda: {"method": "GET", "url": "/getThisTripCrew", "params": {"tripId": pick("crews")["tripId"]}}),
+        ("GET /getMyCrew", lambda: (lambda item: {"method": "GET", "url": "/getMyCrew", "params": {"tripId": item["tripId"], "userId": item["crewLeader"]}})(pick("crews"))),
+        ("GET /getCrewCalc", lambda: (lambda trip: {"method": "GET", "url": "/getCrewCalc", "params": {"mainTrip": trip["tripId"], "userId": trip["userId"]}})(pick("trips"))),
+        ("GET /getCrewNearby", crewNearby),
+        ("GET /getJoinRequests", lambda: {"method": "GET", "url": "/getJoinRequests", "params": {"userId": pick("users")["userId"]}}),
+        ("GET /getCrewSincheongIn", lambda: (lambda item: {"method": "GET", "url": "/getCrewSincheongIn", "params": {"crewId": item["crewId"], "userId": item["crewLeader"]}})(pick("crews"))),
+        ("POST /updateNotificationStatusBulk", lambda: {"method": "POST", "url": "/updateNotificationStatusBulk", "json": {"userId": pick("users")["userId"], "alert": 0}}),
+        ("GET /getChatMessages", lambda: (lambda trip: {"method": "GET", "url": "/getChatMessages", "params": {"userId": trip["userId"], "tripId": trip["tripId"]}})(pick("trips"))),
+        ("GET /getSavePlace", lambda: (lambda trip: {"method": "GET", "url": "/getSavePlace", "params": {"userId": trip["userId"], "tripId": trip["tripId"]}})(pick("trips"))),
+        ("GET /getIntentStats", lambda: {"method": "GET", "url": "/getIntentStats"}),
+    ]
+
+CHAT_MESSAGES = ["근처 카페 추천해줘", "이 근처 맛집 찾아줘", "오늘 날씨 어때?", "여행 준비물 알려줘", "안녕!"]
+
+def providerEndpoints(data, rnd):
+    # LLM, 검색, 번역, 날씨 API를 거치는 파이프라인 (채팅, 여행 생성, 날씨)
+    pick = lambda key: rnd.choice(data[key])
+    def chat():
+        trip = pick("trips")
+        return {"method": "POST", "url": "/callOpenAIFunction", "json": {
+            "userId": trip["userId"], "tripId": trip["tripId"], "sender": trip["userId"], "message": rnd.choice(CHAT_MESSAGES),
+            "latitude": trip["latitude"], "longitude": trip["longitude"], "personality": json.dumps({"food": "food1", "transport": "transport1"})
+        }}
+    def insertTrip():
+        trip = pick("trips")
+        return {"method": "POST", "url": "/insertmyTrips", "data": {
+            "userId": trip["userId"], "title": "bench new trip", "contry": trip["contry"], "city": trip["city"],
+            "latitude": trip["latitude"], "longitude": trip["longitude"], "startDate": trip["startDate"], "endDate": trip["endDate"]
+        }}
+    return [
+        ("POST /callOpenAIFunction", chat),
+        ("POST /insertmyTrips", insertTrip),
+        ("GET /getWeather", lambda: {"method": "GET", "url": "/getWeather", "params": {"city": pick("trips")["city"]}}),
+        ("GET /getTripWeather", lambda: {"method": "GET", "url": "/getTripWeather", "params": {"tripId": [pick("trips")["tripId"] for _ in range(3)]}}),
+    ]
+
+def isError(response):
+    # 일부 라우터는 예외를 HTTP 200 + result code 400/500으로 돌려줌
+    if response.status_code >= 500:
+        return True
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    code = body.get("result_code", body.get("result code")) if isinstance(body, dict) else None
+    return isinstance(code, int) and (code == 400 or code >= 500)
+
+def percentile(values, p):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * p / 100))] * 1000, 3) if values else None
+
+async def measure(client, build, requests, concurrency):
+    latencies = []
+    errors = 0
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with limit:
+            start = time.perf_counter()
+            try:
+                response = await client.request(**build())
+                if isError(response):
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    for _ in range(min(5, requests)):
+        await one()
+    latencies.clear()
+    errors = 0
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99)
+    }
+
+async def run(args):
+    from app import app
+    rnd = random.Random(args.seed)
+    report = {}
+    # 앱과 같은 연결을 쓰도록 lifespan 안에서 데이터 준비/측정/정리
+    async with app.router.lifespan_context(app):
+        cleanup()
+        seed_start = time.perf_counter()
+        counts, data = seed(args.rows, rnd)
+        report["rows"] = counts
+        report["seedSeconds"] = round(time.perf_counter() - seed_start, 2)
+        results = report["endpoints"] = {}
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                for name, build in endpoints(data, rnd) + (providerEndpoints(data, rnd) if args.providers else []):
+                    if args.only and not any(pattern in name for pattern in args.only):
+                        continue
+                    results[name] = await measure(client, build, args.requests, args.concurrency)
+                    print(f"{name:<40} {json.dumps(results[name])}", file=sys.stderr)
+        finally:
+            if not args.keep:
+                cleanup()
+    return report
+
+def gitCommit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000, help="합성 데이터 전체 행 수 (10k ~ 1M)")
+    parser.add_argument("--requests", type=int, default=200, help="엔드포인트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="이름에 이 문자열이 들어간 엔드포인트만 실행")
+    parser.add_argument("--providers", action="store_true", help="외부 API 파이프라인도 측정 (FAKE_PROVIDER_URL 필요)")
+    parser.add_argument("--keep", action="store_true", help="측정 후 합성 데이터를 지우지 않음")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (기본: stdout)")
+    args = parser.parse_args()
+
+    checkLocal(args.providers)
+    result = asyncio.run(run(args))
+    report = {
+        "commit": gitCommit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "rows": result["rows"],
+        "seedSeconds": result["seedSeconds"],
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "endpoints": result["endpoints"]
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
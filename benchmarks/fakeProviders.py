@@ -0,0 +1,346 @@
+import os
+import argparse
+import asyncio
+import hashlib
+import html
+import json
+import math
+import random
+import re
+import struct
+import time
+import zlib
+from collections import Counter
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+
+# SerpAPI, OpenAI, Gemini(REST), 구글 번역, OpenWeatherMap, 카카오를 흉내 내는 로컬 가짜 서버
+# 공급자별 지연시간/지터/오류 비율을 설정할 수 있어서 유료 API 없이 채팅, 일정 생성 파이프라인 부하 테스트 가능
+# 실행: python benchmarks/fakeProviders.py --port 8090 --latency-scale 1 --error-rate 0.02
+# 앱 설정(secret.json): "FAKE_PROVIDER_URL": "http://127.0.0.1:8090"
+# 실행 중 설정 변경: curl -X POST localhost:8090/_config -d '{"openai": {"latency_ms": 300}}'
+
+# 실제 API와 비슷한 기본 지연시간(ms), --latency-scale로 한꺼번에 조절
+DEFAULT_LATENCY_MS = {
+    "openai": 1200,
+    "gemini": 1500,
+    "serpapi": 1500,
+    "translate": 150,
+    "weather": 120,
+    "kakao": 100,
+    "image": 300,
+}
+# 오류 주입 시 공급자별 오류 응답 형식
+ERROR_BODIES = {
+    "openai": lambda status: {"error": {"message": "injected error", "type": "server_error" if status >= 500 else "rate_limit_error", "code": None}},
+    "gemini": lambda status: {"error": {"code": status, "message": "injected error", "status": "UNAVAILABLE" if status >= 500 else "RESOURCE_EXHAUSTED"}},
+    "serpapi": lambda status: {"error": "injected error"},
+    "weather": lambda status: {"cod": status, "message": "injected error"},
+    "kakao": lambda status: {"msg": "injected error", "code": -1},
+}
+
+# 일반 텍스트 응답 길이와 검색 결과 개수
+TEXT_LENGTH = 400
+SEARCH_RESULTS = 20
+EMBEDDING_DIM = 1536
+CATEGORIES = [
+    ("Cafe", "cafe", "$$"), ("Restaurant", "restaurant", "$$$"), ("Bakery", "bakery", "$"),
+    ("Museum", "museum", "$$"), ("Park", "park", None), ("Tower", "tourist attraction", "$$"),
+    ("Gallery", "art gallery", "$"), ("Market", "market", "$"), ("Cathedral", "church", None),
+    ("Beach", "beach", None),
+]
+
+settings = {}
+stats = Counter()
+fixtures = {}
+app = FastAPI()
+
+def configure(latency_scale=1.0, jitter=0.2, error_rate=0.0, error_status=503, seed=None):
+    for provider, latency in DEFAULT_LATENCY_MS.items():
+        settings[provider] = {
+            "latency_ms": latency * latency_scale,
+            "jitter": jitter,
+            "error_rate": error_rate,
+            "error_status": error_status,
+        }
+    settings["_random"] = random.Random(seed)
+
+def loadFixtures(path):
+    # <이름>.json 파일이 있으면 생성 응답 대신 그 내용을 그대로 반환 (실제 API 응답을 녹화해서 사용)
+    for name in os.listdir(path):
+        if name.endswith(".json"):
+            with open(os.path.join(path, name), encoding="utf-8") as f:
+                fixtures[name[:-5]] = json.load(f)
+
+def seeded(*parts):
+    # 같은 요청에는 같은 응답이 나오도록 요청 내용으로 난수 시드 생성
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+async def simulate(provider, operation):
+    # 지연시간만큼 기다린 뒤 오류를 주입할 차례면 오류 응답 반환
+    setting = settings[provider]
+    rnd = settings["_random"]
+    stats[f"{provider}.{operation}"] += 1
+    delay = setting["latency_ms"] * (1 + rnd.uniform(-setting["jitter"], setting["jitter"]))
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+    if rnd.random() < setting["error_rate"]:
+        stats[f"{provider}.{operation}.error"] += 1
+        status = setting["error_status"]
+        body = ERROR_BODIES.get(provider, lambda status: {"error": "injected error"})(status)
+        return JSONResponse(body, status_code=status)
+    return None
+
+def fakeText(prompt, length=TEXT_LENGTH):
+    rnd = seeded(prompt)
+    words = ["여행", "일정", "추천", "장소", "시간", "이동", "날씨", "준비", "예약", "주의", "현지", "교통", "식사", "관광"]
+    text = ""
+    while len(text) < length:
+        text += " ".join(rnd.choice(words) for _ in range(rnd.randint(5, 10))) + ".\n"
+    return text[:length]
+
+# 관리용 엔드포인트
+@app.get("/_config")
+async def getSettings():
+    return {provider: value for provider, value in settings.items() if not provider.startswith("_")}
+
+@app.post("/_config")
+async def updateSettings(request: Request):
+    # {"openai": {"latency_ms": 300, "error_rate": 0.1}, "*": {...}} 형태, "*"는 모든 공급자에 적용
+    body = await request.json()
+    for provider, values in body.items():
+        for name in (DEFAULT_LATENCY_MS if provider == "*" else [provider]):
+            settings[name].update(values)
+    return await getSettings()
+
+@app.get("/_stats")
+async def getStats():
+    return dict(stats)
+
+@app.post("/_stats/reset")
+async def resetStats():
+    stats.clear()
+    return {}
+
+# OpenAI (openai==0.28, api_base = <서버>/openai)
+FUNCTION_KEYWORDS = [
+    ("update_trip_plan", re.compile(r"수정|변경|바꿔")),
+    ("save_plan", re.compile(r"일정.*(만들|짜|저장)|(만들|짜).*일정")),
+    ("save_place", re.compile(r"저장")),
+    ("search_place_details", re.compile(r"어때|정보|알려줘")),
+    ("search_places", re.compile(r"추천|찾아|검색|근처|맛집|카페|어디")),
+]
+
+@app.post("/openai/chat/completions")
+async def openaiChat(request: Request):
+    error = await simulate("openai", "chat")
+    if error:
+        return error
+    body = await request.json()
+    query = next((m.get("content") or "" for m in reversed(body.get("messages", [])) if m.get("role") == "user"), "")
+    message = {"role": "assistant", "content": None}
+    if body.get("functions") and body.get("function_call", "auto") != "none":
+        names = {function["name"] for function in body["functions"]}
+        name = next((name for name, pattern in FUNCTION_KEYWORDS if name in names and pattern.search(query)), "just_chat")
+        if name in names:
+            message["function_call"] = {"name": name, "arguments": json.dumps({"query": query}, ensure_ascii=False)}
+    if "function_call" not in message:
+        message["content"] = fixtures.get("openai-chat") or fakeText(query)
+    return {
+        "id": f"chatcmpl-fake{stats['openai.chat']}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{"index": 0, "message": message, "finish_reason": "function_call" if "function_call" in message else "stop"}],
+        "usage": {"prompt_tokens": len(query), "completion_tokens": 100, "total_tokens": len(query) + 100},
+    }
+
+@app.post("/openai/embeddings")
+async def openaiEmbeddings(request: Request):
+    error = await simulate("openai", "embeddings")
+    if error:
+        return error
+    body = await request.json()
+    texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    data = []
+    for index, text in enumerate(texts):
+        rnd = seeded(text)
+        vector = [rnd.gauss(0, 1) for _ in range(EMBEDDING_DIM)]
+        norm = math.sqrt(sum(value * value for value in vector))
+        data.append({"object": "embedding", "index": index, "embedding": [value / norm for value in vector]})
+    return {"object": "list", "data": data, "model": body.get("model"), "usage": {"prompt_tokens": 0, "total_tokens": 0}}
+
+@app.post("/openai/images/generations")
+async def openaiImages(request: Request):
+    error = await simulate("openai", "image")
+    if error:
+        return error
+    body = await request.json()
+    return {"created": int(time.time()), "data": [{"url": f"{str(request.base_url).rstrip('/')}/image/banner.png"} for _ in range(body.get("n", 1))]}
+
+def pngImage(width, height, color):
+    # 단색 PNG, 배너 다운로드 경로(httpClient.download) 측정용
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+    row = b"\x00" + bytes(color) * width
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height)) + chunk(b"IEND", b""))
+
+@app.get("/image/banner.png")
+async def bannerImage(size: int = 1024):
+    error = await simulate("image", "download")
+    if error:
+        return error
+    return Response(pngImage(size, size, (70, 130, 180)), media_type="image/png")
+
+# Gemini (google-generativeai REST 전송, api_endpoint = <서버>/gemini)
+def geminiText(prompt):
+    # 앱이 응답을 파싱하는 프롬프트(일정 제목 json 배열, 장소 재정렬)는 형식에 맞게 생성
+    if "일정 제목" in prompt and "json 배열" in prompt:
+        places = json.loads(prompt[prompt.rindex("["):prompt.rindex("]") + 1])
+        return json.dumps([f"{place} 관광" for place in places], ensure_ascii=False)
+    if "재정렬" in prompt:
+        titles = re.findall(r"장소 이름:\s*(.+)", prompt)
+        seeded(prompt).shuffle(titles)
+        return "\n".join(f"{i + 1}. 장소 이름: {title.strip()}" for i, title in enumerate(titles))
+    return fixtures.get("gemini") or fakeText(prompt)
+
+@app.post("/gemini/{version}/models/{target}")
+async def geminiGenerate(version: str, target: str, request: Request):
+    error = await simulate("gemini", target.split(":")[-1])
+    if error:
+        return error
+    body = await request.json()
+    prompt = "\n".join(part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", []))
+    text = geminiText(prompt)
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": 1, "index": 0, "safetyRatings": []}],
+        "usageMetadata": {"promptTokenCount": len(prompt), "candidatesTokenCount": len(text), "totalTokenCount": len(prompt) + len(text)},
+    }
+
+# SerpAPI (google-search-results, BACKEND = <서버>/serpapi)
+def fakePlaces(query, latitude, longitude):
+    rnd = seeded(query, round(latitude, 3), round(longitude, 3))
+    places = []
+    for i in range(SEARCH_RESULTS):
+        name, kind, price = rnd.choice(CATEGORIES)
+        distance = rnd.uniform(0.1, 3.0) / 111
+        angle = rnd.uniform(0, 2 * math.pi)
+        place = {
+            "position": i + 1,
+            "title": f"{query.title()} {name} {i + 1}",
+            "rating": round(rnd.uniform(3.5, 5.0), 1),
+            "reviews": rnd.randint(10, 20000),
+            "address": f"{rnd.randint(1, 300)} Fake Street, {query.title()}",
+            "gps_coordinates": {"latitude": latitude + distance * math.sin(angle), "longitude": longitude + distance * math.cos(angle)},
+            "description": f"A popular {kind} loved by travelers for its atmosphere.",
+            "type": kind,
+            "types": [kind],
+        }
+        if price:
+            place["price"] = price
+        places.append(place)
+    return places
+
+@app.get("/serpapi/search")
+async def serpSearch(request: Request):
+    error = await simulate("serpapi", request.query_params.get("engine", "google"))
+    if error:
+        return error
+    if "serpapi" in fixtures:
+        return fixtures["serpapi"]
+    query = request.query_params.get("q", "")
+    match = re.match(r"@(-?[\d.]+),(-?[\d.]+)", request.query_params.get("ll", ""))
+    latitude, longitude = (float(match.group(1)), float(match.group(2))) if match else (37.5665, 126.9780)
+    places = fakePlaces(query, latitude, longitude)
+    # search_places는 local_results, search_place_details는 place_results를 읽음
+    return {"search_metadata": {"status": "Success"}, "local_results": places, "place_results": places[0]}
+
+# 구글 번역 (deep-translator, base_url = <서버>/translate), 번역 없이 원문을 그대로 돌려줌
+@app.get("/translate")
+async def googleTranslate(q: str = "", tl: str = "", sl: str = ""):
+    error = await simulate("translate", f"{sl}-{tl}")
+    if error:
+        return error
+    return HTMLResponse(f'<html><body><div class="result-container">{html.escape(q)}</div></body></html>')
+
+# OpenWeatherMap (<서버>/weather)
+WEATHER = [("Clear", "01d"), ("Clouds", "03d"), ("Rain", "10d"), ("Snow", "13d")]
+
+@app.get("/weather/data/2.5/weather")
+async def currentWeather(q: str = "", lat: float = 0.0, lon: float = 0.0):
+    error = await simulate("weather", "current")
+    if error:
+        return error
+    if "weather-current" in fixtures:
+        return fixtures["weather-current"]
+    rnd = seeded(q, lat, lon, int(time.time() // 600))
+    main, icon = rnd.choice(WEATHER)
+    return {"name": q, "timezone": 0, "weather": [{"main": main, "icon": icon}], "main": {"temp": round(rnd.uniform(-5, 32), 2)}}
+
+@app.get("/weather/data/2.5/forecast")
+async def forecastWeather(lat: float = 0.0, lon: float = 0.0):
+    error = await simulate("weather", "forecast")
+    if error:
+        return error
+    if "weather-forecast" in fixtures:
+        return fixtures["weather-forecast"]
+    # 실제 API처럼 3시간 단위 5일치(40개)
+    rnd = seeded(lat, lon, int(time.time() // 600))
+    now = int(time.time() // 10800) * 10800 + 10800
+    steps = []
+    for step in range(40):
+        main, icon = rnd.choice(WEATHER)
+        low = rnd.uniform(-5, 25)
+        steps.append({"dt": now + step * 10800, "weather": [{"main": main, "icon": icon}], "main": {"temp": low + 1, "temp_min": low, "temp_max": low + rnd.uniform(1, 4)}})
+    return {"cnt": len(steps), "list": steps, "city": {"coord": {"lat": lat, "lon": lon}, "timezone": 0}}
+
+# 카카오 로그인 (<서버>/kakao-auth, <서버>/kakao-api)
+@app.get("/kakao-auth/oauth/authorize")
+async def kakaoAuthorize(redirect_uri: str, client_id: str = ""):
+    return RedirectResponse(f"{redirect_uri}?code=fake-{random.randint(1, 10 ** 9)}")
+
+@app.post("/kakao-auth/oauth/token")
+async def kakaoToken(request: Request):
+    error = await simulate("kakao", "token")
+    if error:
+        return error
+    form = await request.form()
+    return {"access_token": f"fake-token-{form.get('code', '')}", "token_type": "bearer", "expires_in": 21599}
+
+@app.get("/kakao-api/v2/user/me")
+async def kakaoProfile(request: Request):
+    error = await simulate("kakao", "profile")
+    if error:
+        return error
+    if "kakao-profile" in fixtures:
+        return fixtures["kakao-profile"]
+    token = request.headers.get("authorization", "")
+    kakao_id = seeded(token).randint(10 ** 9, 10 ** 10)
+    return {"id": kakao_id, "properties": {"nickname": f"fake{kakao_id % 10000}", "profile_image": ""}}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="기본 지연시간 배율 (0이면 지연 없음)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="지연시간 변동 비율 (0.2 = ±20%%)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fixtures", help="녹화한 응답(<이름>.json) 디렉터리: serpapi, openai-chat, gemini, weather-current, weather-forecast, kakao-profile")
+    args = parser.parse_args()
+
+    configure(args.latency_scale, args.jitter, args.error_rate, args.error_status, args.seed)
+    if args.fixtures:
+        loadFixtures(args.fixtures)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+configure()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import os
+import sys
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import subprocess
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# gunicorn 워커 수를 바꿔가며 같은 부하를 주고 처리량(req/s)과 지연시간을 비교
+# 실행: python benchmarks/loadServe.py --workers 1 2 4 --path / --duration 10
+def freePort():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def waitReady(url, timeout=60):
+    import httpx
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError(f"server did not start: {url}")
+
+async def clientLoop(url, duration, concurrency):
+    import httpx
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies, errors
+
+def clientProcess(args):
+    url, duration, concurrency = args
+    return asyncio.run(clientLoop(url, duration, concurrency))
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))] * 1000 if values else 0.0
+
+def run(workers, path, duration, clients, concurrency):
+    port = freePort()
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "BIND": f"127.0.0.1:{port}", "ACCESS_LOG": "", "LOG_LEVEL": "warning"}
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"], cwd=ROOT, env=env)
+    try:
+        url = f"http://127.0.0.1:{port}{path}"
+        waitReady(url)
+        # 부하 생성기도 여러 프로세스로 나눠서 클라이언트가 병목이 되지 않게 함
+        with multiprocessing.Pool(clients) as pool:
+            results = pool.map(clientProcess, [(url, duration, concurrency)] * clients)
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    latencies = [latency for result, _ in results for latency in result]
+    errors = sum(error for _, error in results)
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=max(1, multiprocessing.cpu_count() // 2))
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"cpu count: {multiprocessing.cpu_count()}")
+    results = [run(workers, args.path, args.duration, args.clients, args.concurrency) for workers in args.workers]
+    baseline = results[0]["rps"] or 1
+    for result in results:
+        result["speedup"] = round(result["rps"] / baseline, 2)
+        print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
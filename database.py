@@ -2,7 +2,7 @@ import os
 import json
 from sqlalchemy import *
 from sqlalchemy.orm import sessionmaker
-from pymongo import MongoClient
+from sqlalchemy.pool import StaticPool
 
 # BASE_DIR = os.path.dirname(os.path.relpath("./"))
 # secret_file = os.path.join(BASE_DIR, 'secret.json')
@@ -10,49 +10,177 @@ from pymongo import MongoClient
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 secret_file = os.path.join(BASE_DIR, 'secret.json')
 
-with open(secret_file) as f:
-    secrets = json.loads(f.read())
+# secret.json이 없어도 시작 가능 (임베디드 모드, 환경 변수로만 설정하는 경우)
+secrets = {}
+if os.path.exists(secret_file):
+    with open(secret_file) as f:
+        secrets = json.loads(f.read())
+
+class ImproperlyConfigured(Exception):
+    pass
+
+def _env(setting):
+    # 같은 이름의 환경 변수가 있으면 secret.json보다 우선, 숫자/객체는 JSON으로 해석
+    value = os.environ.get(setting)
+    if value is None:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+# 선택 설정값, secret.json에 없으면 기본값 사용
+def get_config(setting, default, secrets=secrets):
+    value = _env(setting)
+    if value is not None:
+        return value
+    return secrets.get(setting, default)
+
+# 저장소 모드: "external"(MySQL + MongoDB 서버) 또는 "embedded"(SQLite + mongomock, 외부 서비스 없이 테스트/벤치마크용)
+STORAGE_MODE = get_config("STORAGE_MODE", "external")
+EMBEDDED = STORAGE_MODE == "embedded"
+SQL_BACKEND = get_config("SQL_BACKEND", "sqlite" if EMBEDDED else "mysql")
+MONGO_BACKEND = get_config("MONGO_BACKEND", "mongomock" if EMBEDDED else "mongodb")
 
 def get_secret(setting, secrets=secrets):
+    # 비밀번호/키는 JSON으로 해석하지 않고 문자열 그대로 사용
+    value = os.environ.get(setting)
+    if value is not None:
+        return value
     try:
         return secrets[setting]
     except KeyError:
+        # 임베디드 모드에서는 외부 서비스 키가 없어도 시작 (호출하는 순간 실패)
+        if EMBEDDED:
+            return None
         error_msg = "Set the {} environment variable".format(setting)
         raise ImproperlyConfigured(error_msg)
 
-PORT = get_secret("MYSQL_PORT")
-SQLUSERNAME = get_secret("MYSQL_USER_NAME")
-SQLPASSWORD = get_secret("MYSQL_PASSWORD")
-SQLDBNAME = get_secret("MYSQL_DB_NAME")
-HOSTNAME = get_secret("MYSQL_HOST")
+# DB 접속 정보는 해당 백엔드를 쓸 때만 필수
+def backendSecret(setting, required):
+    return get_secret(setting) if required else get_config(setting, None)
+
+USE_MYSQL = SQL_BACKEND == "mysql"
+USE_MONGODB = MONGO_BACKEND == "mongodb"
+
+PORT = backendSecret("MYSQL_PORT", USE_MYSQL)
+SQLUSERNAME = backendSecret("MYSQL_USER_NAME", USE_MYSQL)
+SQLPASSWORD = backendSecret("MYSQL_PASSWORD", USE_MYSQL)
+SQLDBNAME = backendSecret("MYSQL_DB_NAME", USE_MYSQL)
+HOSTNAME = backendSecret("MYSQL_HOST", USE_MYSQL)
 KAKAO_CLIENT_ID = get_secret("KAKAO_CLIENT_ID")
 KAKAO_REDIRECT_URI = get_secret("KAKAO_REDIRECT_URI")
 OPENAI_API_KEY = get_secret("OPENAI_API_KEY")
 WEATHER_API_KEY = get_secret("WEATHER_API_KEY")
 SERP_API_KEY = get_secret("SERP_API_KEY")
-MongoDB_Hostname = get_secret("MongoDB_Hostname")
-MongoDB_Username = get_secret("MongoDB_Username")
-MongoDB_Password = get_secret("MongoDB_Password")
+MongoDB_Hostname = backendSecret("MongoDB_Hostname", USE_MONGODB)
+MongoDB_Username = backendSecret("MongoDB_Username", USE_MONGODB)
+MongoDB_Password = backendSecret("MongoDB_Password", USE_MONGODB)
 GEMINI_API_KEY = get_secret("GEMINI_API_KEY")
 
-DB_URL = f'mysql+pymysql://{SQLUSERNAME}:{SQLPASSWORD}@{HOSTNAME}:{PORT}/{SQLDBNAME}'
+# SerpData 검색 결과 보관 시간(초), 지나면 TTL 인덱스로 자동 삭제
+SERP_DATA_TTL_SECONDS = get_config("SERP_DATA_TTL_SECONDS", 60 * 60 * 24)
+
+# SQLite는 SQLITE_PATH가 없으면 메모리 DB, SQL_URL을 지정하면 다른 SQLAlchemy 주소도 사용 가능
+SQLITE_PATH = get_config("SQLITE_PATH", None)
+if USE_MYSQL:
+    DEFAULT_DB_URL = f'mysql+pymysql://{SQLUSERNAME}:{SQLPASSWORD}@{HOSTNAME}:{PORT}/{SQLDBNAME}'
+else:
+    DEFAULT_DB_URL = f'sqlite:///{SQLITE_PATH}' if SQLITE_PATH else 'sqlite://'
+DB_URL = get_config("SQL_URL", DEFAULT_DB_URL)
 
+def createEngine():
+    if not DB_URL.startswith("sqlite"):
+        return create_engine(DB_URL, pool_recycle=500)
+    # 라우트가 스레드풀에서도 실행되므로 check_same_thread 해제, 메모리 DB는 연결 하나를 공유(StaticPool)
+    # 메모리 DB는 세션들이 한 연결을 같이 쓰므로 동시 쓰기가 많은 측정은 SQLITE_PATH로 파일 DB 사용
+    options = {"connect_args": {"check_same_thread": False}}
+    if DB_URL == "sqlite://":
+        options["poolclass"] = StaticPool
+    engine = create_engine(DB_URL, **options)
+    # 임베디드 DB는 마이그레이션이 없으므로 연결할 때 테이블 생성
+    from models.models import Base
+    Base.metadata.create_all(engine)
+    return engine
+
+# SQL 엔진과 Mongo 클라이언트는 import 시점이 아니라 처음 사용할 때(또는 lifespan의 connectDatabases) 생성
 class db_conn:
     def __init__(self):
-        self.engine = create_engine(DB_URL, pool_recycle=500)
+        self._engine = None
+        self._session_factory = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = createEngine()
+            self._session_factory = sessionmaker(bind=self._engine)
+        return self._engine
 
     def sessionmaker(self):
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
+        self.engine
+        session = self._session_factory()
         return session
     
     def connection(self):
-        conn = self.engine.connection()
+        conn = self.engine.connect()
         return conn
 
+    def dispose(self):
+        # 다음 사용 때 엔진을 새로 만듦 (메모리 SQLite는 이때 테이블도 다시 생성)
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+            self._session_factory = None
+
 sqldb = db_conn()
 
 # Mongo 연결 설정
-mongodb_url = f'mongodb://{MongoDB_Username}:{MongoDB_Password}@{MongoDB_Hostname}:27017/'
-client = MongoClient(mongodb_url)
-db = client['TripPass']
\ No newline at end of file
+mongodb_url = f'mongodb://{MongoDB_Username}:{MongoDB_Password}@{MongoDB_Hostname}:27017/' if USE_MONGODB else None
+_mongo_client = None
+
+def getMongoClient():
+    global _mongo_client
+    if _mongo_client is None:
+        if MONGO_BACKEND == "mongomock":
+            # 프로세스 메모리 안의 MongoDB 호환 저장소 (임베디드 모드)
+            import mongomock
+            _mongo_client = mongomock.MongoClient()
+        else:
+            from pymongo import MongoClient
+            _mongo_client = MongoClient(mongodb_url)
+    return _mongo_client
+
+class LazyCollection:
+    # db['X']를 모듈 로딩 시점에 잡아 둬도 실제 컬렉션은 처음 사용할 때 연결
+    def __init__(self, name):
+        self._name = name
+        self._client = None
+        self._collection = None
+
+    def __getattr__(self, attr):
+        client = getMongoClient()
+        if self._client is not client:
+            self._client = client
+            self._collection = client['TripPass'][self._name]
+        return getattr(self._collection, attr)
+
+class LazyDatabase:
+    def __getitem__(self, name):
+        return LazyCollection(name)
+
+    def __getattr__(self, attr):
+        return getattr(getMongoClient()['TripPass'], attr)
+
+db = LazyDatabase()
+
+def connectDatabases():
+    # lifespan 시작 시 연결 생성, 요청 전에 연결 풀을 미리 채움
+    sqldb.engine
+    getMongoClient()
+
+def closeDatabases():
+    global _mongo_client
+    sqldb.dispose()
+    if _mongo_client is not None:
+        _mongo_client.close()
+        _mongo_client = None
@@ -0,0 +1,40 @@
+import multiprocessing
+import os
+
+# 운영 서버 설정: gunicorn -c gunicorn.conf.py app:app
+# 개발은 docker-compose.yml의 uvicorn --reload 그대로 사용
+bind = os.environ.get("BIND", "0.0.0.0:3000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "utils.serverWorker.TripPassWorker"
+
+# 알림(utils/notification.py)의 "local" 백엔드는 워커 프로세스 안에서만 전달되므로 워커가 여러 개면 "mongo"가 필요
+# 지정하지 않았으면 mongo로 정하고(워커는 이 환경 변수를 물려받음), local을 직접 지정했으면 시작하지 않음
+if workers > 1:
+    if os.environ.setdefault("NOTIFICATION_BACKEND", "mongo") == "local":
+        raise RuntimeError(
+            f"NOTIFICATION_BACKEND=local delivers only within one worker, use NOTIFICATION_BACKEND=mongo "
+            f"or WEB_CONCURRENCY=1 (workers={workers})"
+        )
+
+# 워커마다 app을 import하고 lifespan에서 연결을 만듦 (fork 전에 만든 Mongo/MySQL 연결을 공유하지 않도록)
+preload_app = False
+
+# 종료 신호를 받으면 새 요청은 받지 않고 진행 중인 요청(LLM 호출 포함)을 기다린 뒤 종료
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+timeout = int(os.environ.get("WORKER_TIMEOUT", 120))
+keepalive = int(os.environ.get("KEEPALIVE", 5))
+
+# 메모리 증가를 막기 위해 일정 요청 수마다 워커 재시작, 지터로 모든 워커가 동시에 재시작되지 않게 함
+max_requests = int(os.environ.get("MAX_REQUESTS", 5000))
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", 500))
+
+# Prometheus 멀티 프로세스 모드: PROMETHEUS_MULTIPROC_DIR 디렉터리에 워커별 지표 파일 기록
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+# 빈 값이면 access log 끔
+accesslog = os.environ.get("ACCESS_LOG", "-") or None
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info")
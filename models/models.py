@@ -4,13 +4,16 @@ from sqlalchemy.dialects.mysql import LONGBLOB
 
 Base = declarative_base()
 
+# MySQL에서는 LONGBLOB(최대 4GB), 그 외(SQLite 등)에서는 일반 BLOB
+LongBlob = LargeBinary().with_variant(LONGBLOB, "mysql")
+
 class user(Base):
     __tablename__ = 'user'
     userId = Column(String(36), primary_key=True)
     id = Column(String(36), nullable=False)
     passwd = Column(String(255), nullable=False)
     nickname = Column(String(50), nullable=False)
-    profileImage = Column(LONGBLOB,  nullable=True)
+    profileImage = Column(LongBlob,  nullable=True)
     socialProfileImage = Column(String(255), nullable=True)
     birthDate = Column(String(36), nullable=False)
     sex = Column(String(36), nullable=False)
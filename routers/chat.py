@@ -7,11 +7,12 @@ from models.models import *
 import json
 from database import sqldb, db
 from utils.function import *
+from utils.chatBucket import appendChatMessage, clearChat, getChatPage, DEFAULT_PAGE_SIZE
+from utils.intentRouter import intentStats
 
 router = APIRouter()
 
 # mongodb collection
-ChatData_collection = db['ChatData']
 SavePlace_collection = db['SavePlace']
 
 class QuestionRequest(BaseModel):
@@ -49,28 +50,16 @@ async def getWelcomeMessage(
             welcome_message = f"안녕하세요,\n {startDate}부터 {endDate}까지 \n{trip_info.city}(으)로 여행을 가시는 {user_info.nickname}님!\n{user_info.nickname}님만의 여행 플랜을 함께 만들어 볼까요?🤓"
 
             # 환영 메시지를 메모리에 저장
-            from utils.function import memory
-            memory.save_context({"input": ""}, {"output": welcome_message})
-
-            # 환영 메시지를 ChatData_collection에 저장
-            chat_log = {
-                "userId": userId,
-                "tripId": tripId,
-                "conversation": [
-                    {
-                        "timestamp": datetime.datetime.now(),
-                        "sender": "bot",
-                        "message": welcome_message,
-                        "isSerp": False
-                    }
-                ]
-            }
-
-            ChatData_collection.update_one(
-                {"userId": userId, "tripId": tripId},
-                {"$set": chat_log},
-                upsert=True
-            )
+            getMemory().save_context({"input": ""}, {"output": welcome_message})
+
+            # 기존 채팅 로그를 비우고 환영 메시지를 첫 메시지로 저장
+            clearChat(userId, tripId)
+            appendChatMessage(userId, tripId, {
+                "timestamp": datetime.datetime.now(),
+                "sender": "bot",
+                "message": welcome_message,
+                "isSerp": False
+            })
 
             return {"result_code": 200, "welcome_message": welcome_message}
         else:
@@ -79,14 +68,17 @@ async def getWelcomeMessage(
         return {"result_code": 400, "message": f"Error: {str(e)}"}
 
 
-@router.get(path='/getChatMessages', description="채팅 로그 가져오기")
-async def getChatMessages(userId: str = Query(...), tripId: str = Query(...)):
+@router.get(path='/getChatMessages', description="채팅 로그 가져오기, 최신 메시지부터 limit개씩 가져오고 이전 페이지는 before, beforeSeq(nextBefore, nextBeforeSeq 값)로 요청")
+async def getChatMessages(
+    userId: str = Query(...),
+    tripId: str = Query(...),
+    before: Optional[datetime.datetime] = Query(None),
+    beforeSeq: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1)):
     try:
-        chat_log = ChatData_collection.find_one({"userId": userId, "tripId": tripId})
-        if chat_log:
-            response_data = convert_objectid_to_str(chat_log)
-            conversation = response_data.get("conversation", [])
-            return {"result_code": 200, "messages": conversation}
+        page = getChatPage(userId, tripId, before, limit, beforeSeq)
+        if page:
+            return {"result_code": 200, "messages": page["messages"], "hasMore": page["hasMore"], "nextBefore": page["nextBefore"], "nextBeforeSeq": page["nextBeforeSeq"]}
         else:
             return {"result_code": 404, "messages": []}
     except Exception as e:
@@ -102,20 +94,10 @@ async def saveChatMessage(request: QuestionRequest):
             "message": request.message,
             "isSerp": request.isSerp or False
         }
-        # userId와 tripId가 있는지 확인하고 업데이트 또는 삽입
-        result = ChatData_collection.update_one(
-            {"userId": request.userId, "tripId": request.tripId},
-            {
-                "$push": {"conversation": chat_log},
-                "$setOnInsert": {
-                    "userId": request.userId,
-                    "tripId": request.tripId
-                }
-            },
-            upsert=True
-        )
+        # 현재 시간 버킷에 추가, 버킷이 없거나 가득 찼으면 새 버킷 생성
+        created = appendChatMessage(request.userId, request.tripId, chat_log)
 
-        if result.upserted_id is not None:
+        if created:
             response_message = "New chat log created successfully"
         else:
             response_message = "Chat log updated successfully"
@@ -188,7 +170,7 @@ async def updateTripPlan(
 @router.post(path='/callOpenAIFunction', description="OpenAI 함수 호출")
 async def call_openai_function_endpoint(request: QuestionRequest):
     try:
-        response = call_openai_function(request.message, request.userId, request.tripId, request.latitude, request.longitude, request.personality)
+        response = await call_openai_function(request.message, request.userId, request.tripId, request.latitude, request.longitude, request.personality)
         return {"result_code": 200, 
                 "response": response["result"], 
                 "geo": response.get("geo_coordinates"), 
@@ -199,10 +181,14 @@ async def call_openai_function_endpoint(request: QuestionRequest):
     except Exception as e:
         return {"result_code": 400, "response": f"Error: {str(e)}"}
 
+@router.get(path='/getIntentStats', description="로컬 의도 분류기 직접 처리 횟수와 LLM 라우터 일치율")
+async def getIntentStats():
+    return {"result_code": 200, "response": intentStats()}
+
 @router.post(path='/clearMemory', description="메모리 초기화")
 async def clear_memory_endpoint():
     try:
-        memory.clear()
+        getMemory().clear()
         return {"result_code": 200, "response": "Memory has been cleared."}
     except Exception as e:
         return {"result_code": 400, "response": f"Error: {str(e)}"}
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from models.models import crew, tripPlans, myTrips
 from database import sqldb
 from sqlalchemy import and_
+from utils import crewIndex
 import base64
 import uuid
 
@@ -196,6 +197,73 @@ session: Session = Depends(sqldb.sessionmaker)):
     finally:
         session.close()
 
+@router.get('/getCrewNearby', description="planId(또는 latitude, longitude) 기준 radiusKm 안에 있는 크루를 거리, 날짜 순으로 가져오기, 날짜 범위 기본값은 해당 plan 날짜")
+async def getCrewNearby(
+    planId: str = None,
+    latitude: float = None,
+    longitude: float = None,
+    radiusKm: float = 5.0,
+    startDate: str = None,
+    endDate: str = None,
+    userId: str = None,
+    limit: int = 50,
+    session: Session = Depends(sqldb.sessionmaker)):
+    try:
+        excludeTripId = None
+        if planId is not None:
+            plan = session.query(tripPlans.tripId, tripPlans.date, tripPlans.latitude, tripPlans.longitude).filter(tripPlans.planId == planId).first()
+            if not plan:
+                return {"result code": 404, "response": "Trip plan not found"}
+            latitude, longitude, excludeTripId = plan.latitude, plan.longitude, plan.tripId
+            startDate = startDate or str(plan.date)[:10]
+            endDate = endDate or str(plan.date)[:10]
+        if latitude is None or longitude is None:
+            raise HTTPException(status_code=400, detail="planId or latitude and longitude are required")
+
+        crewIndex.ensureCrewIndex(session)
+        nearby = crewIndex.crewsNearby(latitude, longitude, radiusKm, startDate, endDate, excludeTripId)
+
+        # 크루/계획 상세 정보는 후보 crewId만 한 번에 조회
+        crewIds = [entry["crewId"] for entry, _ in nearby]
+        crews = {crew_data.crewId: crew_data for crew_data in session.query(crew).filter(crew.crewId.in_(crewIds)).all()} if crewIds else {}
+        planIds = [entry["planId"] for entry, _ in nearby]
+        plans = {plan.planId: plan for plan in session.query(tripPlans).filter(tripPlans.planId.in_(planIds)).all()} if planIds else {}
+
+        results = []
+        for entry, distance in nearby:
+            crew_data = crews.get(entry["crewId"])
+            plan = plans.get(entry["planId"])
+            if not crew_data or not plan:
+                continue
+            if userId is not None and userId in (crew_data.tripmate or "").split(","):
+                continue
+            results.append({
+                "crewId": crew_data.crewId,
+                "planId": crew_data.planId,
+                "userId": plan.userId,
+                "tripId": crew_data.tripId,
+                "date": entry["date"],
+                "time": plan.time,
+                "place": plan.place,
+                "title": crew_data.title,
+                "contact": crew_data.contact,
+                "note": crew_data.note,
+                "numOfMate": crew_data.numOfMate,
+                "banner": base64.b64encode(crew_data.banner).decode('utf-8') if crew_data.banner else None,
+                "tripmate": crew_data.tripmate,
+                "sincheongIn": crew_data.sincheongIn,
+                "address": plan.address,
+                "latitude": plan.latitude,
+                "longitude": plan.longitude,
+                "distanceKm": round(distance, 3)
+            })
+            if len(results) >= limit:
+                break
+
+        return {"result code": 200, "response": results}
+    finally:
+        session.close()
+
 @router.post('/insertCrew', description="mySQL crew Table에 추가, crewId는 uuid로 생성, insert data 중 일부는 tripPlans planId를 이용해 가져오는거임")
 async def insertCrewTable(
     planId: str = Form(...),
@@ -237,6 +305,7 @@ async def insertCrewTable(
         # Update tripPlans table with new crewId
         trip_plan.crewId = new_crew.crewId
         session.commit()
+        crewIndex.addCrew(new_crew.crewId, planId, tripId, trip_plan.date, trip_plan.latitude, trip_plan.longitude)
 
         return {"result code": 200, "response": new_crew.crewId}
     except Exception as e:
@@ -277,6 +346,7 @@ session: Session = Depends(sqldb.sessionmaker)):
         if trip_plan:
             trip_plan.crewId = None
             session.commit()
+        crewIndex.removeCrew(crewId)
 
         return {"result code": 200, "response": "Crew deleted successfully"}
     except Exception as e:
@@ -1,12 +1,23 @@
 from fastapi import FastAPI, Form, Depends, APIRouter
 from sqlalchemy.orm import Session
 from models.models import joinRequests, crew, user, tripPlans
-from database import sqldb
+from database import sqldb, get_config
+from utils.notification import publish, joinRequestEvent
+from pydantic import BaseModel
+from typing import List, Optional
 import base64
 import uuid
 
 router = APIRouter()
 
+# crew 최대 인원 (리더 포함)
+MAX_TRIPMATES = get_config("MAX_TRIPMATES", 4)
+
+class NotificationStatusBulkRequest(BaseModel):
+    requestIds: Optional[List[int]] = None
+    userId: Optional[str] = None
+    alert: int = 1
+
 @router.get('/getJoinRequests', description="mySQL joinRequests Table 접근해서 정보 가져오기, userId는 필수")
 async def getJoinRequestsTable(userId: str = None, session: Session = Depends(sqldb.sessionmaker)):
     try:
@@ -80,6 +91,8 @@ async def insertJoinRequestsTable(
             crew_data.sincheongIn = str(sincheongIn) + "," + userId
         session.commit()
         session.refresh(new_joinRequest)
+        # crew 리더에게 새 참가 신청 알림
+        publish([crew_data.crewLeader], joinRequestEvent("joinRequest.created", new_joinRequest, crew_data))
 
         return {"result code": 200, "response": crewId}
     finally:
@@ -93,21 +106,27 @@ async def updateCrewTripMate(
     session: Session = Depends(sqldb.sessionmaker)
 ):
     try:
+        # crew 행을 SELECT ... FOR UPDATE로 잠가서 동시에 들어온 수락 요청을 순서대로 처리, commit은 마지막에 한 번
+        crew_data = session.query(crew).filter(crew.crewId == crewId).with_for_update().first()
+        if not crew_data:
+            return {"result code": 404, "response": "Crew not found"}
+
         join_request = session.query(joinRequests).filter(
             joinRequests.crewId == crewId,
             joinRequests.userId == userId
         ).first()
 
         if not join_request:
+            session.rollback()
             return {"result code": 404, "response": "Join request not found"}
 
+        tripmates = crew_data.tripmate.split(",") if crew_data.tripmate else []
+        if status == 1 and userId not in tripmates and len(tripmates) >= MAX_TRIPMATES:
+            session.rollback()
+            return {"result code": 409, "response": "Crew is full"}
+
         join_request.status = status
         join_request.alert = 0  # 알림 미확인 상태로 설정
-        session.commit()
-
-        crew_data = session.query(crew).filter(crew.crewId == crewId).first()
-        if not crew_data:
-            return {"result code": 404, "response": "Crew not found"}
 
         sincheongIn = crew_data.sincheongIn.split(",") if crew_data.sincheongIn else []
         if userId in sincheongIn:
@@ -116,26 +135,17 @@ async def updateCrewTripMate(
                 crew_data.sincheongIn = None
             else:
                 crew_data.sincheongIn = ",".join(sincheongIn)
-        session.commit()
-        # print(status)
-    
-        if status == 1:
-            tripmates = crew_data.tripmate.split(",") if crew_data.tripmate else []
-            if (userId not in tripmates) and (len(tripmates) < 4):
-                tripmates.append(userId)
-                crew_data.tripmate = ",".join(tripmates)
-            session.commit()
 
-            # joinRequests 테이블에서 tripId 가져오기
-            tripId = join_request.tripId
+        if status == 1 and userId not in tripmates:
+            tripmates.append(userId)
+            crew_data.tripmate = ",".join(tripmates)
 
-            # tripPlans 테이블에서 tripId로 계획 찾기
+            # crew 계획을 수락한 사용자의 여행(joinRequests.tripId)에 복사
             trip_plans = session.query(tripPlans).filter(tripPlans.planId == crew_data.planId).first()
-            # print(trip_plans)
             new_trip_plan = tripPlans(
                 planId=str(uuid.uuid4()),
                 userId=userId,
-                tripId=tripId,
+                tripId=join_request.tripId,
                 title=trip_plans.title,
                 date=trip_plans.date,
                 time=trip_plans.time,
@@ -147,8 +157,12 @@ async def updateCrewTripMate(
                 crewId=trip_plans.crewId
             )
             session.add(new_trip_plan)
-            session.commit()
 
+        # commit 후에는 속성이 만료되므로 알림 내용은 미리 구성
+        event = joinRequestEvent("joinRequest.updated", join_request, crew_data)
+        session.commit()
+        # 신청한 사용자에게 수락/거절 결과 알림
+        publish([userId], event)
         return {"result code": 200, "response": "Operation successful"}
     except Exception as e:
         session.rollback()
@@ -164,8 +178,11 @@ async def deleteJoinRequest(requestId: int, session: Session = Depends(sqldb.ses
         if not join_request:
             return {"result code": 404, "response": "Join request not found"}
         
+        crew_data = session.query(crew).filter(crew.crewId == join_request.crewId).first()
+        event = joinRequestEvent("joinRequest.deleted", join_request, crew_data)
         session.delete(join_request)
         session.commit()
+        publish([event["userId"], event["crewLeader"]], event)
         
         return {"result code": 200, "response": "Join request deleted successfully"}
     except Exception as e:
@@ -233,3 +250,39 @@ async def updateNotificationStatus(
         return {"result code": 500, "response": str(e)}
     finally:
         session.close()
+
+
+@router.post('/updateNotificationStatusBulk', description="mySQL joinRequests Table에서 여러 요청의 알림 상태를 한 번에 업데이트, requestIds 또는 userId(해당 사용자 알림 전체) 입력")
+async def updateNotificationStatusBulk(
+    request: NotificationStatusBulkRequest,
+    session: Session = Depends(sqldb.sessionmaker)
+):
+    try:
+        if request.requestIds:
+            condition = joinRequests.requestId.in_(request.requestIds)
+            rejected = condition
+        elif request.userId:
+            # /getJoinRequests와 같은 범위: 내가 보낸 신청 + 내가 리더인 crew에 들어온 신청
+            condition = (joinRequests.userId == request.userId) | (joinRequests.crewId.in_(
+                session.query(crew.crewId).filter(crew.crewLeader == request.userId)
+            ))
+            # 거절 알림은 신청한 사용자가 확인했을 때만 삭제
+            rejected = joinRequests.userId == request.userId
+        else:
+            return {"result code": 400, "response": "requestIds or userId is required"}
+
+        updated = session.query(joinRequests).filter(condition).update(
+            {"alert": request.alert}, synchronize_session=False
+        )
+        deleted = 0
+        # 확인한 거절 요청은 같은 트랜잭션에서 삭제
+        if request.alert == 1:
+            deleted = session.query(joinRequests).filter(rejected, joinRequests.status == 2).delete(synchronize_session=False)
+        session.commit()
+
+        return {"result code": 200, "response": {"updated": updated, "deleted": deleted}}
+    except Exception as e:
+        session.rollback()
+        return {"result code": 500, "response": str(e)}
+    finally:
+        session.close()
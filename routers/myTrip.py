@@ -1,17 +1,19 @@
-from fastapi import FastAPI, File, UploadFile, Form, Depends, HTTPException, Request, APIRouter
+from fastapi import FastAPI, File, UploadFile, Form, Depends, HTTPException, Request, APIRouter, Query
 from sqlalchemy.orm import Session
 from models.models import myTrips, user, crew, tripPlans
-from database import sqldb, db, OPENAI_API_KEY, WEATHER_API_KEY, GEMINI_API_KEY
+from database import sqldb, db, WEATHER_API_KEY
 from utils.ImageGeneration import imageGeneration
-from utils.GetWeather import getWeather
+from utils.GetWeather import getWeather, getForecastByCoord, summarizeTripWeather, roundCoord
 from utils.openaiMemo import openaiMemo
+from utils.chatBucket import clearChat
+from typing import List
+import asyncio
 import base64
 import uuid
 
 router = APIRouter()
 
 # mongodb collection
-ChatData_collection = db['ChatData']
 SavePlace_collection = db['SavePlace']
 SerpData_collection = db['SerpData']
 
@@ -57,11 +59,48 @@ async def getMyTripsTable(
 async def getWeatherInfo(city: str):
     # getWeather 함수를 호출하여 날씨 정보를 가져옴
     try:
-        weather, icon, temp = getWeather(city, WEATHER_API_KEY)
+        weather, icon, temp = await getWeather(city, WEATHER_API_KEY)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     return {"city": city, "weather": weather, "icon": icon, "temperature": temp}
 
+@router.get('/getTripWeather', description="myTrips에 저장된 좌표로 현재 날씨와 여행 기간의 일별 예보 가져오기, tripId 여러 개 가능")
+async def getTripWeatherInfo(
+    tripId: List[str] = Query(...),
+    session: Session = Depends(sqldb.sessionmaker)):
+    try:
+        trips = session.query(
+            myTrips.tripId, myTrips.city, myTrips.latitude, myTrips.longitude, myTrips.startDate, myTrips.endDate
+        ).filter(myTrips.tripId.in_(tripId)).all()
+    finally:
+        session.close()
+
+    if not trips:
+        return {"result code": 404, "response": "Trip not found"}
+
+    # 같은 지역의 여행은 한 번만 조회
+    coords = list({roundCoord(trip.latitude, trip.longitude) for trip in trips})
+    forecasts = await asyncio.gather(
+        *(getForecastByCoord(latitude, longitude, WEATHER_API_KEY) for latitude, longitude in coords),
+        return_exceptions=True
+    )
+    forecast_by_coord = dict(zip(coords, forecasts))
+
+    results = []
+    for trip in trips:
+        forecast = forecast_by_coord[roundCoord(trip.latitude, trip.longitude)]
+        if isinstance(forecast, Exception):
+            results.append({"tripId": trip.tripId, "city": trip.city, "error": str(forecast)})
+            continue
+        # startDate/endDate는 문자열 컬럼이라 날짜 형식이 아니면 그 여행만 오류로 표시
+        try:
+            summary = summarizeTripWeather(forecast, trip.startDate, trip.endDate)
+        except ValueError as e:
+            results.append({"tripId": trip.tripId, "city": trip.city, "error": f"Invalid trip dates: {e}"})
+            continue
+        results.append({"tripId": trip.tripId, "city": trip.city, **summary})
+    return {"result code": 200, "response": results}
+
 @router.post('/insertmyTrips', description="mySQL myTrips Table에 추가, tripId는 uuid로 생성")
 async def insertMyTripsTable(
     userId: str = Form(...),
@@ -74,10 +113,11 @@ async def insertMyTripsTable(
     endDate: str = Form(...),
     session: Session = Depends(sqldb.sessionmaker)
 ):
-    image_data = imageGeneration(contry, city, title, OPENAI_API_KEY)
-    image_data = base64.b64decode(image_data)
-
-    ai_memo = openaiMemo(contry, city, GEMINI_API_KEY)
+    # 배너 이미지와 메모는 서로 독립적이라 동시에 생성
+    image_data, ai_memo = await asyncio.gather(
+        imageGeneration(contry, city, title),
+        openaiMemo(contry, city)
+    )
 
     
     try:
@@ -184,7 +224,7 @@ async def delete_trip(
         session.query(myTrips).filter(myTrips.tripId == trip_id, myTrips.userId == user_id).delete()
         
         # MongoDB에서 관련 문서 삭제
-        ChatData_collection.delete_many({"userId": user_id, "tripId": trip_id})
+        clearChat(user_id, trip_id)
         SavePlace_collection.delete_many({"userId": user_id, "tripId": trip_id})
         SerpData_collection.delete_many({"userId": user_id, "tripId": trip_id})
 
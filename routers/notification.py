@@ -0,0 +1,44 @@
+import asyncio
+import json
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from utils.notification import subscribe, SSE_KEEPALIVE_SECONDS
+
+router = APIRouter()
+
+@router.websocket('/ws/notifications/{userId}')
+async def notificationSocket(websocket: WebSocket, userId: str):
+    await websocket.accept()
+    with subscribe(userId) as queue:
+        # 클라이언트가 끊으면 receive 쪽이 끝나므로 둘 중 먼저 끝나는 쪽 기준으로 종료
+        receiver = asyncio.ensure_future(websocket.receive())
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({receiver, getter}, return_when=asyncio.FIRST_COMPLETED)
+                if receiver in done:
+                    getter.cancel()
+                    message = receiver.result()
+                    if message["type"] == "websocket.disconnect":
+                        break
+                    receiver = asyncio.ensure_future(websocket.receive())
+                    continue
+                await websocket.send_json(getter.result())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            receiver.cancel()
+
+@router.get('/sse/notifications/{userId}', description="참가 신청 알림 Server-Sent Events 스트림")
+async def notificationStream(request: Request, userId: str):
+    async def events():
+        with subscribe(userId) as queue:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
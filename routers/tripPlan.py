@@ -2,12 +2,32 @@ from fastapi import FastAPI, File, UploadFile, Form, Depends, HTTPException, Req
 from sqlalchemy.orm import Session
 from models.models import tripPlans
 from database import sqldb , db
+from utils.geo import dailyRouteStats
+from utils.planStore import bulkInsertPlans, pullSavedPlaces
+from pydantic import BaseModel
+from typing import List, Optional
 import base64
 import uuid
 
 
 router = APIRouter()
 
+class TripPlanItem(BaseModel):
+    title: str
+    date: str
+    time: str
+    place: str
+    address: str
+    latitude: float
+    longitude: float
+    description: str
+    crewId: Optional[str] = None
+
+class TripPlansBulkRequest(BaseModel):
+    userId: str
+    tripId: str
+    plans: List[TripPlanItem]
+
 @router.get('/getTripPlans', description = "mySQL tripPlans Table 접근해서 정보 가져오기, tripId는 선택사항")
 async def getTripPlansTable(
     tripId: str = None,
@@ -68,6 +88,25 @@ async def insertTripPlansTable(
     finally:
         session.close()
 
+@router.post('/insertTripPlansBulk', description="mySQL tripPlans Table에 여러 계획을 한 번에 추가, 생성한 planId 목록을 순서대로 반환")
+async def insertTripPlansBulk(
+    request: TripPlansBulkRequest,
+    session: Session = Depends(sqldb.sessionmaker)
+):
+    try:
+        plans = [plan.model_dump() for plan in request.plans]
+        planIds = bulkInsertPlans(session, request.userId, request.tripId, plans)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        return {"result code": 500, "response": str(e)}
+    finally:
+        session.close()
+
+    # mongoDB SavePlace에서 추가한 장소들 한 번에 삭제
+    pullSavedPlaces(request.userId, request.tripId, [plan["place"] for plan in plans])
+    return {"result code": 200, "response": planIds}
+
 @router.delete('/deleteTripPlan', description="mySQL tripPlans Table에서 특정 요청 삭제")
 async def deleteTripPlanTable(
     planId: str,
@@ -83,3 +122,27 @@ async def deleteTripPlanTable(
             return {"result code": 404, "response": "Plan not found"}
     finally:
         session.close()
+
+@router.get('/getTripRouteStats', description="tripId의 날짜별 이동 거리(km), 구간 순서, 과밀한 날 여부 계산")
+async def getTripRouteStats(
+    tripId: str,
+    session: Session = Depends(sqldb.sessionmaker)):
+    try:
+        # 거리 계산에 필요한 컬럼만 조회
+        rows = session.query(
+            tripPlans.planId, tripPlans.date, tripPlans.time, tripPlans.place, tripPlans.latitude, tripPlans.longitude
+        ).filter(tripPlans.tripId == tripId).all()
+    finally:
+        session.close()
+
+    if not rows:
+        return {"result code": 404, "response": "Plans not found"}
+    days = dailyRouteStats([row._asdict() for row in rows])
+    return {
+        "result code": 200,
+        "response": {
+            "tripId": tripId,
+            "totalKm": round(sum(day["totalKm"] for day in days), 3),
+            "days": days
+        }
+    }
@@ -1,17 +1,17 @@
 from fastapi import FastAPI, File, UploadFile, Form, Depends, HTTPException, Request, APIRouter
 from fastapi.responses import RedirectResponse, JSONResponse
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 from models.models import myTrips, user, crew, tripPlans, joinRequests
 from database import sqldb, KAKAO_CLIENT_ID, KAKAO_REDIRECT_URI
+from utils.passwordHash import hashPassword, verifyPassword
+from utils import httpClient
+from utils.metrics import observeCall
+from utils.providers import providerUrl
 import base64
 import uuid
-import httpx
 
 router = APIRouter()
 
-bcrypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
-
 @router.get('/getUser', description="mySQL user Table 접근해서 정보 가져오기, userId는 선택사항")
 async def getUserTable(
     userId: str = None,
@@ -72,7 +72,7 @@ async def insertUserTable(
     session: Session = Depends(sqldb.sessionmaker)
 ):
     image_data = await profileImage.read() if profileImage else None
-    hashed_password = bcrypt_context.hash(passwd)
+    hashed_password = await hashPassword(passwd)
 
     try:
         userId = str(uuid.uuid4())
@@ -159,7 +159,7 @@ async def updateUserPasswd(
         user_data = query.first()
 
         if user_data:
-            hashed_password = bcrypt_context.hash(passwd.encode('utf-8'))
+            hashed_password = await hashPassword(passwd)
             user_data.passwd = hashed_password
             session.commit()
             return {"result code": 200, "response": "Password updated successfully"}
@@ -202,9 +202,18 @@ async def login(
     session: Session = Depends(sqldb.sessionmaker)):
     try:
         user_data = session.query(user).filter(user.id == id).first()
-        if not user_data or not bcrypt_context.verify(passwd, user_data.passwd):
+        if not user_data:
             raise HTTPException(status_code=401, detail="Invalid username or password")
-        
+
+        verified, new_hash = await verifyPassword(passwd, user_data.passwd)
+        if not verified:
+            raise HTTPException(status_code=401, detail="Invalid username or password")
+
+        # 기존 bcrypt 해시나 예전 작업량으로 만든 해시는 로그인 성공 시 새 설정으로 교체
+        if new_hash:
+            user_data.passwd = new_hash
+            session.commit()
+
         profile_image_data = base64.b64encode(user_data.profileImage).decode('utf-8') if user_data.profileImage else None
         
         return {
@@ -224,13 +233,13 @@ async def login(
 # 카카오 소셜 로그인
 @router.get("/login/kakao")
 def kakao_login():
-    kakao_auth_url = f"https://kauth.kakao.com/oauth/authorize?client_id={KAKAO_CLIENT_ID}&redirect_uri={KAKAO_REDIRECT_URI}&response_type=code"
+    kakao_auth_url = f"{providerUrl('kakao-auth')}/oauth/authorize?client_id={KAKAO_CLIENT_ID}&redirect_uri={KAKAO_REDIRECT_URI}&response_type=code"
     return RedirectResponse(url=kakao_auth_url)
 @router.get("/login/callback")
 async def kakao_login_callback(code: str):
     session = sqldb.sessionmaker()
     try:
-        token_url = "https://kauth.kakao.com/oauth/token"
+        token_url = f"{providerUrl('kakao-auth')}/oauth/token"
         token_params = {
             "grant_type": "authorization_code",
             "client_id": KAKAO_CLIENT_ID,
@@ -238,59 +247,60 @@ async def kakao_login_callback(code: str):
             "code": code,
         }
 
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(token_url, data=token_params)
+        with observeCall("kakao", "token"):
+            token_response = await httpClient.request("POST", token_url, data=token_params)
             if token_response.status_code != 200:
                 raise HTTPException(status_code=token_response.status_code, detail="Failed to fetch access token from Kakao")
 
-            token_data = token_response.json()
-            access_token = token_data.get("access_token")
+        token_data = token_response.json()
+        access_token = token_data.get("access_token")
 
-            profile_url = "https://kapi.kakao.com/v2/user/me"
-            headers = {"Authorization": f"Bearer {access_token}"}
-            profile_response = await client.get(profile_url, headers=headers)
+        profile_url = f"{providerUrl('kakao-api')}/v2/user/me"
+        headers = {"Authorization": f"Bearer {access_token}"}
+        with observeCall("kakao", "profile"):
+            profile_response = await httpClient.request("GET", profile_url, headers=headers)
             if profile_response.status_code != 200:
                 raise HTTPException(status_code=profile_response.status_code, detail="Failed to fetch user profile from Kakao")
 
-            profile_data = profile_response.json()
+        profile_data = profile_response.json()
 
-            kakao_id = profile_data["id"]
-            nickname = profile_data["properties"]["nickname"]
-            social_profile_image = profile_data["properties"].get("profile_image", "")
-            user_id = "소셜 로그인 회원입니다"
+        kakao_id = profile_data["id"]
+        nickname = profile_data["properties"]["nickname"]
+        social_profile_image = profile_data["properties"].get("profile_image", "")
+        user_id = "소셜 로그인 회원입니다"
 
-            # 기존 사용자 확인 및 생성/업데이트
-            user_entry = session.query(user).filter(user.id == kakao_id).first()
-            if not user_entry:
-                user_entry = user(
-                    userId=str(uuid.uuid4()),
-                    id=kakao_id,
-                    passwd="",  
-                    nickname=nickname,
-                    socialProfileImage=social_profile_image,
-                    birthDate='2024-01-01',
-                    sex="None",
-                    personality=None,
-                    mainTrip=Null
-                )
-                session.add(user_entry)
-            else:
-                user_entry.nickname = nickname
-                user_entry.socialProfileImage = social_profile_image
+        # 기존 사용자 확인 및 생성/업데이트
+        user_entry = session.query(user).filter(user.id == kakao_id).first()
+        if not user_entry:
+            user_entry = user(
+                userId=str(uuid.uuid4()),
+                id=kakao_id,
+                passwd="",  
+                nickname=nickname,
+                socialProfileImage=social_profile_image,
+                birthDate='2024-01-01',
+                sex="None",
+                personality=None,
+                mainTrip=Null
+            )
+            session.add(user_entry)
+        else:
+            user_entry.nickname = nickname
+            user_entry.socialProfileImage = social_profile_image
 
-            session.commit()
+        session.commit()
 
-            profile_image_data = base64.b64encode(user_entry.profileImage).decode('utf-8') if user_entry.profileImage else None
+        profile_image_data = base64.b64encode(user_entry.profileImage).decode('utf-8') if user_entry.profileImage else None
 
-            return {
-                "userId": user_entry.userId,
-                "id": user_entry.id,
-                "nickname": user_entry.nickname,
-                "birthDate": user_entry.birthDate,
-                "sex": user_entry.sex,
-                "personality": user_entry.personality,
-                "socialProfileImage": user_entry.socialProfileImage,
-                "mainTrip": user_entry.mainTrip
-            }
+        return {
+            "userId": user_entry.userId,
+            "id": user_entry.id,
+            "nickname": user_entry.nickname,
+            "birthDate": user_entry.birthDate,
+            "sex": user_entry.sex,
+            "personality": user_entry.personality,
+            "socialProfileImage": user_entry.socialProfileImage,
+            "mainTrip": user_entry.mainTrip
+        }
     finally:
         session.close()
\ No newline at end of file
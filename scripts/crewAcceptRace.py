@@ -0,0 +1,86 @@
+import os
+import sys
+import asyncio
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from database import sqldb
+from models.models import crew, joinRequests, tripPlans
+from routers.joinRequest import MAX_TRIPMATES
+
+# 남은 자리가 하나인 crew에 수락 요청을 동시에 보내서 인원 초과가 생기지 않는지 확인
+# 실행 중인 서버(MySQL)가 필요: python scripts/crewAcceptRace.py [BASE_URL] [요청 수]
+# 서버 없이 스레드로 확인하는 테스트는 tests/test_crewAcceptRace.py
+def setup(requests_count):
+    session = sqldb.sessionmaker()
+    try:
+        prefix = f"race-{uuid.uuid4().hex[:8]}"
+        leader = f"{prefix}-leader"
+        planId = str(uuid.uuid4())
+        crewId = str(uuid.uuid4())
+        session.add(tripPlans(
+            planId=planId, userId=leader, tripId=f"{prefix}-trip", title="race", date="2024-01-01", time="10:00:00",
+            place="race", address="race", latitude=0, longitude=0, description="race", crewId=crewId
+        ))
+        # 자리가 하나만 남도록 기존 인원 채우기
+        mates = [leader] + [f"{prefix}-mate{i}" for i in range(MAX_TRIPMATES - 2)]
+        applicants = [f"{prefix}-user{i}" for i in range(requests_count)]
+        session.add(crew(
+            crewId=crewId, planId=planId, tripId=f"{prefix}-trip", title="race", contact="race", note="race",
+            numOfMate=MAX_TRIPMATES, tripmate=",".join(mates), sincheongIn=",".join(applicants), crewLeader=leader
+        ))
+        for applicant in applicants:
+            session.add(joinRequests(crewId=crewId, tripId=f"{applicant}-trip", userId=applicant, status=0, alert=0))
+        session.commit()
+        return crewId, applicants
+    finally:
+        session.close()
+
+def cleanup(crewId):
+    session = sqldb.sessionmaker()
+    try:
+        session.query(joinRequests).filter(joinRequests.crewId == crewId).delete()
+        session.query(tripPlans).filter(tripPlans.crewId == crewId).delete()
+        session.query(crew).filter(crew.crewId == crewId).delete()
+        session.commit()
+    finally:
+        session.close()
+
+def crewState(crewId, applicants):
+    # (현재 tripmate 목록, 신청자 여행에 복사된 계획 수)
+    session = sqldb.sessionmaker()
+    try:
+        crew_data = session.query(crew).filter(crew.crewId == crewId).first()
+        tripmates = crew_data.tripmate.split(",")
+        copied = session.query(tripPlans).filter(tripPlans.crewId == crewId, tripPlans.userId.in_(applicants)).count()
+        return tripmates, copied
+    finally:
+        session.close()
+
+async def fire(base_url, crewId, applicants):
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        responses = await asyncio.gather(*[
+            client.post("/updateCrewTripMate", data={"crewId": crewId, "userId": applicant, "status": 1})
+            for applicant in applicants
+        ])
+    return [response.json().get("result code") for response in responses]
+
+def main(base_url="http://127.0.0.1:8000", requests_count=20):
+    crewId, applicants = setup(requests_count)
+    try:
+        codes = asyncio.run(fire(base_url, crewId, applicants))
+        tripmates, copied = crewState(crewId, applicants)
+
+        print(f"result codes: 200 x{codes.count(200)}, 409 x{codes.count(409)}, other {[code for code in codes if code not in (200, 409)]}")
+        print(f"tripmates {len(tripmates)}/{MAX_TRIPMATES}, copied plans {copied}")
+        ok = codes.count(200) == 1 and len(tripmates) == MAX_TRIPMATES and copied == 1
+        print("OK" if ok else "FAILED")
+        return 0 if ok else 1
+    finally:
+        cleanup(crewId)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    sys.exit(main(*(args[:1] or []), *([int(args[1])] if len(args) > 1 else [])))
@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chatBucket import ChatData_collection, claimLegacyDocument, migrateLegacyDocument
+
+# 기존 ChatData 문서(conversation 배열)를 ChatBucket 버킷 문서로 옮기는 일회성 마이그레이션
+# 실행: python scripts/migrateChatBuckets.py
+def main():
+    documents = 0
+    buckets = 0
+    for document in ChatData_collection.find({"conversation": {"$exists": True}}, {"_id": 1}):
+        # 서버가 같은 문서를 읽으면서 먼저 변환했으면 건너뜀
+        claimed = claimLegacyDocument({"_id": document["_id"]})
+        if claimed is None:
+            continue
+        buckets += migrateLegacyDocument(claimed)
+        documents += 1
+    print(f"migrated {documents} chat documents into {buckets} buckets")
+
+if __name__ == "__main__":
+    main()
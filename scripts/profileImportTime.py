@@ -0,0 +1,49 @@
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app import 시간 측정 (python -X importtime), 예산을 넘거나 무거운 SDK가 import 시점에 올라오면 실패
+# 실행: python scripts/profileImportTime.py [예산 ms] [상위 표시 개수]
+IMPORT_TIME_BUDGET_MS = 2000
+# 첫 사용 때 불러와야 하는 모듈 (import 시점에 보이면 회귀)
+LAZY_MODULES = ["langchain", "sklearn", "openai", "google.generativeai", "serpapi", "deep_translator", "aiohttp"]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def profile(module="app"):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr)
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+def main(budget_ms=IMPORT_TIME_BUDGET_MS, top=20):
+    rows = profile()
+    total_ms = next(cumulative for name, _, cumulative, depth in rows if name == "app" and depth == 0) / 1000
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda row: -row[2])[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    imported = {name for name, *_ in rows}
+    eager = [module for module in LAZY_MODULES if module in imported]
+    print(f"\nimport app: {total_ms:.0f} ms (budget {budget_ms} ms)")
+    if eager:
+        print(f"imported eagerly: {', '.join(eager)}")
+    ok = total_ms <= budget_ms and not eager
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    sys.exit(main(*args))
@@ -0,0 +1,30 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+from sklearn.metrics import classification_report
+from sklearn.model_selection import train_test_split
+from utils.intentRouter import INTENT_MODEL_PATH, collectTrainingData, trainIntentModel
+
+# IntentLog(LLM 라우터 결정)와 ChatBucket 대화 기록으로 로컬 의도 분류 모델 학습
+# 실행: python scripts/trainIntentModel.py
+def main():
+    samples = collectTrainingData()
+    labels = {label for _, label in samples}
+    if len(samples) < 20 or len(labels) < 2:
+        print(f"not enough training data ({len(samples)} samples, {len(labels)} intents)")
+        return
+
+    train, test = train_test_split(samples, test_size=0.2, random_state=42)
+    model = trainIntentModel(train)
+    predicted = model.predict([message for message, _ in test])
+    print(classification_report([label for _, label in test], predicted, zero_division=0))
+
+    # 평가 후 전체 데이터로 다시 학습해서 저장
+    joblib.dump(trainIntentModel(samples), INTENT_MODEL_PATH)
+    print(f"saved intent model to {INTENT_MODEL_PATH} ({len(samples)} samples)")
+
+if __name__ == "__main__":
+    main()
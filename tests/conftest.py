@@ -0,0 +1,58 @@
+import os
+import asyncio
+import uuid
+
+# 테스트는 임베디드 모드(SQLite + mongomock)로 외부 서비스 없이 실행, 실제 DB로 돌리려면 STORAGE_MODE=external
+os.environ.setdefault("STORAGE_MODE", "embedded")
+
+import httpx
+import pytest
+from database import sqldb
+from utils.queryDetector import trackQueries, NPlusOneDetected
+
+class AppClient:
+    # 요청을 테스트와 같은 스레드/컨텍스트에서 실행 (TestClient는 별도 스레드라 query_detector가 쿼리를 셀 수 없음)
+    def __init__(self, app):
+        self.app = app
+
+    def request(self, method, url, **kwargs):
+        async def send():
+            transport = httpx.ASGITransport(app=self.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.request(method, url, **kwargs)
+        return asyncio.run(send())
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+@pytest.fixture(scope="session")
+def client():
+    from app import app
+    return AppClient(app)
+
+@pytest.fixture
+def session():
+    session = sqldb.sessionmaker()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def newId():
+    return lambda: str(uuid.uuid4())
+
+@pytest.fixture
+def query_detector(request):
+    # 테스트 안에서 같은 SQL이 반복되면(N+1) 테스트 종료 시 NPlusOneDetected로 실패
+    # @pytest.mark.n_plus_one을 붙인 테스트는 반대로 N+1이 감지되어야 통과 (아직 고치지 않은 라우트 기록용)
+    if request.node.get_closest_marker("n_plus_one"):
+        with pytest.raises(NPlusOneDetected):
+            with trackQueries(request.node.nodeid, mode="raise") as counter:
+                yield counter
+    else:
+        with trackQueries(request.node.nodeid, mode="raise") as counter:
+            yield counter
@@ -0,0 +1,83 @@
+import datetime
+from utils import chatBucket
+from utils.chatBucket import (
+    ChatBucket_collection, ChatData_collection, appendChatMessage, claimLegacyDocument, getChatPage,
+    migrateLegacyChat, migrateLegacyDocument
+)
+
+
+def legacyConversation(userId, tripId, count):
+    start = datetime.datetime(2024, 5, 1, 9, 0)
+    ChatData_collection.insert_one({
+        "userId": userId,
+        "tripId": tripId,
+        "conversation": [
+            {"timestamp": start + datetime.timedelta(minutes=index), "sender": "user", "message": f"legacy {index}"}
+            for index in range(count)
+        ]
+    })
+
+
+def test_append_migrates_legacy_chat(newId):
+    # 기존 사용자가 처음 하는 일이 메시지 전송이어도 기존 대화가 버킷으로 옮겨져야 함
+    userId, tripId = newId(), newId()
+    legacyConversation(userId, tripId, 3)
+    appendChatMessage(userId, tripId, {"timestamp": datetime.datetime(2024, 5, 2, 9, 0), "sender": "user", "message": "new"})
+
+    assert ChatData_collection.find_one({"userId": userId, "tripId": tripId}) is None
+    page = getChatPage(userId, tripId)
+    assert [m["message"] for m in page["messages"]] == ["legacy 0", "legacy 1", "legacy 2", "new"]
+
+
+def test_legacy_chat_is_readable_while_claimed(newId):
+    # 다른 요청이 옮기는 중(또는 옮기다 실패)이어도 기존 대화는 계속 읽혀야 함
+    userId, tripId = newId(), newId()
+    legacyConversation(userId, tripId, 2)
+    claimed = claimLegacyDocument({"userId": userId, "tripId": tripId})
+    assert claimed is not None
+    assert claimLegacyDocument({"userId": userId, "tripId": tripId}) is None
+
+    page = getChatPage(userId, tripId)
+    assert [m["message"] for m in page["messages"]] == ["legacy 0", "legacy 1"]
+
+
+def test_expired_claim_is_retried_without_duplicates(monkeypatch, newId):
+    # 버킷을 넣은 뒤 기존 문서를 지우기 전에 실패한 경우, 임대 시간이 지나면 다른 요청이 다시 옮김
+    userId, tripId = newId(), newId()
+    legacyConversation(userId, tripId, 3)
+    claimed = claimLegacyDocument({"userId": userId, "tripId": tripId})
+    monkeypatch.setattr(ChatData_collection, "delete_one", lambda *args, **kwargs: None)
+    migrateLegacyDocument(claimed)
+    monkeypatch.undo()
+
+    # 옮기는 중에는 버킷과 기존 문서를 같이 읽어도 중복이 없음
+    page = getChatPage(userId, tripId)
+    assert [m["message"] for m in page["messages"]] == ["legacy 0", "legacy 1", "legacy 2"]
+
+    monkeypatch.setattr(chatBucket, "CHAT_MIGRATION_LEASE_SECONDS", -1)
+    assert migrateLegacyChat(userId, tripId) == 1
+    assert ChatData_collection.find_one({"userId": userId, "tripId": tripId}) is None
+    assert ChatBucket_collection.count_documents({"userId": userId, "tripId": tripId}) == 1
+    page = getChatPage(userId, tripId)
+    assert [m["message"] for m in page["messages"]] == ["legacy 0", "legacy 1", "legacy 2"]
+
+
+def test_pages_keep_messages_with_same_timestamp(client, newId):
+    # 같은 시각의 메시지가 페이지 경계에 걸려도 빠지거나 중복되지 않아야 함
+    userId, tripId = newId(), newId()
+    timestamp = datetime.datetime(2024, 5, 3, 12, 0)
+    for index in range(5):
+        appendChatMessage(userId, tripId, {"timestamp": timestamp, "sender": "user", "message": f"same {index}"})
+
+    seen = []
+    params = {"userId": userId, "tripId": tripId, "limit": 2}
+    while True:
+        body = client.get("/getChatMessages", params=params).json()
+        assert body["result_code"] == 200
+        seen = [m["message"] for m in body["messages"]] + seen
+        if not body["hasMore"]:
+            break
+        params = {**params, "before": body["nextBefore"], "beforeSeq": body["nextBeforeSeq"]}
+
+    assert sorted(seen) == [f"same {index}" for index in range(5)]
+    assert len(seen) == len(set(seen))
@@ -0,0 +1,48 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from database import DB_URL, sqldb
+from routers.joinRequest import MAX_TRIPMATES, updateCrewTripMate
+from scripts.crewAcceptRace import cleanup, crewState, setup
+
+# SQLite는 SELECT ... FOR UPDATE를 무시하므로 동시 수락은 MySQL에서만 확인 가능
+# 실행: SQL_URL=mysql+pymysql://<user>:<password>@<host>:<port>/<db> python -m pytest tests/test_crewAcceptRace.py
+MYSQL = DB_URL.startswith("mysql")
+
+
+def accept(crewId, userId):
+    # 요청마다 별도 세션, 스레드마다 별도 이벤트 루프로 라우트를 직접 실행
+    response = asyncio.run(updateCrewTripMate(crewId=crewId, userId=userId, status=1, session=sqldb.sessionmaker()))
+    return response["result code"]
+
+
+def acceptAll(crewId, applicants, workers):
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda applicant: accept(crewId, applicant), applicants))
+
+
+def assertLastSeatTakenOnce(codes, crewId, applicants):
+    tripmates, copied = crewState(crewId, applicants)
+    assert codes.count(200) == 1
+    assert codes.count(409) == len(applicants) - 1
+    assert len(tripmates) == MAX_TRIPMATES
+    assert copied == 1
+
+
+def test_accepts_after_last_seat_get_409():
+    crewId, applicants = setup(5)
+    try:
+        codes = acceptAll(crewId, applicants, workers=1)
+        assertLastSeatTakenOnce(codes, crewId, applicants)
+    finally:
+        cleanup(crewId)
+
+
+@pytest.mark.skipif(not MYSQL, reason="SQLite는 FOR UPDATE 행 잠금이 없음, SQL_URL에 MySQL 주소를 지정해서 실행")
+def test_concurrent_accepts_never_exceed_max_tripmates():
+    crewId, applicants = setup(20)
+    try:
+        codes = acceptAll(crewId, applicants, workers=len(applicants))
+        assertLastSeatTakenOnce(codes, crewId, applicants)
+    finally:
+        cleanup(crewId)
@@ -0,0 +1,51 @@
+import random
+import numpy as np
+from utils import crewIndex
+from utils.geo import EARTH_RADIUS_KM, haversine
+
+
+def resetIndex(monkeypatch):
+    monkeypatch.setattr(crewIndex, "_keys", [])
+    monkeypatch.setattr(crewIndex, "_entries", [])
+    monkeypatch.setattr(crewIndex, "_built_at", None)
+
+
+def test_ensureCrewIndex_builds_right_after_boot(monkeypatch):
+    # monotonic()이 TTL보다 작아도(부팅 직후) 처음 호출에서는 만들어야 함
+    resetIndex(monkeypatch)
+    calls = []
+    monkeypatch.setattr(crewIndex.time, "monotonic", lambda: 10.0)
+    monkeypatch.setattr(crewIndex, "rebuildCrewIndex", lambda session: calls.append(session))
+    crewIndex.ensureCrewIndex("session")
+    assert calls == ["session"]
+
+
+def destination(latitude, longitude, distance_km, bearing):
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    angle = distance_km / EARTH_RADIUS_KM
+    lat2 = np.arcsin(np.sin(lat1) * np.cos(angle) + np.cos(lat1) * np.sin(angle) * np.cos(bearing))
+    lon2 = lon1 + np.arctan2(
+        np.sin(bearing) * np.sin(angle) * np.cos(lat1), np.cos(angle) - np.sin(lat1) * np.sin(lat2)
+    )
+    return float(np.degrees(lat2)), float((np.degrees(lon2) + 180.0) % 360.0 - 180.0)
+
+
+def test_crewsNearby_matches_haversine_at_high_latitude(monkeypatch):
+    # 고위도에서 반경 가장자리 근처 점까지 전수 거리 계산과 같은 결과여야 함
+    resetIndex(monkeypatch)
+    rng = random.Random(38)
+    center_lat, center_lon, radius_km = 79.09, -95.33, 940.0
+    points = [destination(center_lat, center_lon, radius_km * 0.999, 2 * np.pi * k / 72) for k in range(72)]
+    points += [
+        destination(center_lat, center_lon, radius_km * rng.uniform(0.0, 1.2), rng.uniform(0, 2 * np.pi))
+        for _ in range(500)
+    ]
+    for index, (lat, lon) in enumerate(points):
+        crewIndex.addCrew(f"crew-{index}", f"plan-{index}", "trip", "2024-07-01", lat, lon)
+
+    distances = haversine(
+        np.array([lat for lat, _ in points]), np.array([lon for _, lon in points]), center_lat, center_lon
+    )
+    expected = {f"crew-{index}" for index, distance in enumerate(distances) if distance <= radius_km}
+    found = {entry["crewId"] for entry, _ in crewIndex.crewsNearby(center_lat, center_lon, radius_km)}
+    assert found == expected
@@ -0,0 +1,25 @@
+import os
+import runpy
+import pytest
+
+
+def loadConfig(monkeypatch, **env):
+    monkeypatch.delenv("NOTIFICATION_BACKEND", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path("gunicorn.conf.py")
+
+
+def test_multiple_workers_default_to_mongo_notifications(monkeypatch):
+    loadConfig(monkeypatch, WEB_CONCURRENCY="4")
+    assert os.environ["NOTIFICATION_BACKEND"] == "mongo"
+
+
+def test_multiple_workers_refuse_local_notifications(monkeypatch):
+    with pytest.raises(RuntimeError):
+        loadConfig(monkeypatch, WEB_CONCURRENCY="4", NOTIFICATION_BACKEND="local")
+
+
+def test_single_worker_keeps_local_notifications(monkeypatch):
+    loadConfig(monkeypatch, WEB_CONCURRENCY="1")
+    assert "NOTIFICATION_BACKEND" not in os.environ
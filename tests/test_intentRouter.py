@@ -0,0 +1,56 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from utils import function, intentRouter
+
+
+def test_recordIntent_writes_logs_off_the_event_loop(monkeypatch):
+    # 요청 처리 중에는 기록을 쌓아 두기만 하고 insert는 백그라운드 스레드에서 한 번에 실행
+    writes = []
+    monkeypatch.setattr(
+        intentRouter.IntentLog_collection, "insert_many",
+        lambda documents: writes.append((threading.get_ident(), [d["message"] for d in documents]))
+    )
+
+    async def run():
+        intentRouter.recordIntent("1번 저장", "save_place", 0.99, "rule", direct=True)
+        intentRouter.recordIntent("2번 저장", "save_place", 0.99, "rule", direct=True)
+        assert writes == []
+        await intentRouter.flushIntentLogs()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert [messages for _, messages in writes] == [["1번 저장", "2번 저장"]]
+    assert all(thread != loop_thread for thread, _ in writes)
+
+
+def test_shadow_route_task_is_kept_until_done(monkeypatch):
+    # 로컬에서 바로 처리한 메시지의 shadow 비교 작업은 끝날 때까지 참조가 유지되어야 함
+    released = None
+
+    async def dispatch(*args):
+        return "saved", [], False
+
+    async def routeWithLlm(messages):
+        await released.wait()
+        return SimpleNamespace(choices=[SimpleNamespace(message={"function_call": {"name": "save_place"}})])
+
+    monkeypatch.setattr(function, "classifyIntent", lambda query: ("save_place", 0.99, "rule"))
+    monkeypatch.setattr(function, "dispatch_function", dispatch)
+    monkeypatch.setattr(function, "shouldShadow", lambda: True)
+    monkeypatch.setattr(function, "route_with_llm", routeWithLlm)
+    monkeypatch.setattr(function, "recordIntent", lambda *args, **kwargs: None)
+
+    async def run():
+        nonlocal released
+        released = asyncio.Event()
+        response = await function.call_openai_function("1번 저장", "user", "trip")
+        assert response["function_name"] == "save_place"
+        assert len(function._shadow_tasks) == 1
+        task = next(iter(function._shadow_tasks))
+        released.set()
+        await task
+        await asyncio.sleep(0)
+        assert function._shadow_tasks == set()
+
+    asyncio.run(run())
@@ -0,0 +1,88 @@
+import collections
+import random
+import numpy as np
+from utils.geo import distanceMatrix, haversine
+from utils.itinerary import (
+    DEFAULT_SCHEDULE, MIN_GAP_MINUTES, buildItinerary, daySlots, routeOrder, scheduleDay, toMinutes, toTime
+)
+
+
+def place(title, latitude, longitude, time=None, date=None):
+    return {"title": title, "address": title, "latitude": latitude, "longitude": longitude, "time": time, "date": date}
+
+
+def routeLength(dist, route):
+    return sum(dist[a, b] for a, b in zip(route, route[1:]))
+
+
+def nearestNeighbourRoute(coords):
+    # routeOrder와 같은 시작점(중심에서 가장 먼 장소)에서 최근접 이웃만으로 만든 경로
+    dist = distanceMatrix(coords)
+    centroid = coords.mean(axis=0)
+    route = [int(haversine(coords[:, 0], coords[:, 1], centroid[0], centroid[1]).argmax())]
+    while len(route) < len(coords):
+        route.append(min((i for i in range(len(coords)) if i not in route), key=lambda i: dist[route[-1], i]))
+    return route
+
+
+def test_scheduleDay_without_free_slots_starts_at_day_start():
+    # 09:00~22:00을 30분 간격 고정 일정으로 채우면 관광지를 넣을 빈 시간이 없음
+    fixed = [
+        place(f"fixed {minute}", 37.56, 126.97, toTime(minute))
+        for minute in range(toMinutes("09:00"), toMinutes("22:00") + 1, MIN_GAP_MINUTES)
+    ]
+    sights = [place("palace", 37.5796, 126.9770), place("tower", 37.5512, 126.9882)]
+    assert daySlots(DEFAULT_SCHEDULE, len(sights), [toMinutes(p["time"]) for p in fixed]) == []
+
+    entries = scheduleDay("2024-07-01", fixed + sights, DEFAULT_SCHEDULE)
+
+    assert len(entries) == len(fixed) + len(sights)
+    start = toMinutes(DEFAULT_SCHEDULE["start"])
+    free_times = sorted(toMinutes(entry["time"]) for entry in entries if entry["title"] in ("palace", "tower"))
+    assert free_times == [start, start + MIN_GAP_MINUTES]
+
+
+def test_buildItinerary_respects_daily_capacity():
+    # 한곳에 모인 장소도 하루 용량(균등 배분이면 ceil(장소 수 / 일수), 아니면 +2)을 넘지 않게 나눔
+    rng = random.Random(36)
+    places = [place(f"sight {i}", 37.56 + rng.uniform(0, 0.01), 126.97 + rng.uniform(0, 0.01)) for i in range(9)]
+    for personality, capacity in [({"transport": "transport2"}, 3), ({}, 5)]:
+        schedule = buildItinerary(places, "2024-07-01", "2024-07-03", personality)
+        assert len(schedule) == len(places)
+        assert max(collections.Counter(entry["date"] for entry in schedule).values()) <= capacity
+
+
+def test_buildItinerary_keeps_preset_date_and_time():
+    places = [
+        place("museum", 37.5796, 126.9770, time="15:00", date="2024-07-02"),
+        place("palace", 37.5796, 126.9770),
+        place("tower", 37.5512, 126.9882),
+        place("market", 35.0980, 129.0300),
+    ]
+    schedule = buildItinerary(places, "2024-07-01", "2024-07-03")
+    museum = next(entry for entry in schedule if entry["title"] == "museum")
+    assert (museum["date"], museum["time"]) == ("2024-07-02", "15:00:00")
+
+
+def test_buildItinerary_places_meals_at_meal_times():
+    places = [
+        place("palace", 37.5796, 126.9770),
+        place("tower", 37.5512, 126.9882),
+        place("noodle restaurant", 37.5700, 126.9800),
+        place("hanok cafe", 37.5800, 126.9850),
+    ]
+    schedule = buildItinerary(places, "2024-07-01", "2024-07-01")
+    meal_times = sorted(entry["time"] for entry in schedule if entry["title"] in ("noodle restaurant", "hanok cafe"))
+    assert meal_times == ["12:00:00", "18:00:00"]
+    sight_times = [toMinutes(entry["time"]) for entry in schedule if entry["title"] in ("palace", "tower")]
+    assert all(abs(minute - toMinutes(meal)) >= MIN_GAP_MINUTES for minute in sight_times for meal in meal_times)
+
+
+def test_routeOrder_is_never_longer_than_nearest_neighbour():
+    rng = np.random.default_rng(36)
+    for _ in range(50):
+        coords = np.column_stack([37.5 + rng.uniform(0, 0.2, 12), 126.9 + rng.uniform(0, 0.2, 12)])
+        dist = distanceMatrix(coords)
+        route = routeOrder(coords)
+        assert sorted(route) == list(range(len(coords)))
+        assert routeLength(dist, route) <= routeLength(dist, nearestNeighbourRoute(coords)) + 1e-9
@@ -0,0 +1,25 @@
+import mongomock
+import pytest
+from pymongo.errors import OperationFailure
+import database
+from database import db
+from utils import mongoIndex
+
+
+@pytest.mark.skipif(database.MONGO_BACKEND != "mongomock", reason="mongomock 컬렉션의 create_index를 바꿔서 실패를 만듦")
+def test_failed_index_does_not_skip_the_rest(monkeypatch):
+    # 앞쪽 컬렉션의 인덱스가 실패해도 뒤쪽 TTL 인덱스는 만들어져야 함
+    create_index = mongomock.collection.Collection.create_index
+
+    def failingCreateIndex(self, keys, **options):
+        if self.name in ("ChatBucket", "ChatData"):
+            raise OperationFailure("Index build failed", code=67)
+        return create_index(self, keys, **options)
+
+    monkeypatch.setattr(mongomock.collection.Collection, "create_index", failingCreateIndex)
+
+    failed = mongoIndex.ensureIndexes()
+
+    assert failed == ["ChatBucket.userId_tripId_bucket", "ChatData.userId_tripId"]
+    assert "updatedAt_ttl" in db["SerpData"].index_information()
+    assert db["LLMCache"].index_information()["expiresAt_ttl"]["expireAfterSeconds"] == 0
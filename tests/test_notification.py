@@ -0,0 +1,37 @@
+import asyncio
+import pytest
+import database
+from utils import notification
+
+async def publishAndReceive(publisher):
+    # 두 사용자가 각자 구독 중일 때 한 명에게 보낸 알림은 그 사용자에게만 전달되어야 함
+    await notification.startNotificationHub()
+    try:
+        with notification.subscribe("leader") as leader_queue, notification.subscribe("member") as member_queue:
+            await publisher(["member"], {"type": "joinRequestAccepted", "crewId": "crew-1"})
+            event = await asyncio.wait_for(member_queue.get(), timeout=10)
+            assert leader_queue.empty()
+            return event
+    finally:
+        await notification.stopNotificationHub()
+
+def test_local_backend_delivers(monkeypatch):
+    monkeypatch.setattr(notification, "NOTIFICATION_BACKEND", "local")
+
+    async def publisher(recipients, event):
+        notification.publish(recipients, event)
+
+    event = asyncio.run(publishAndReceive(publisher))
+    assert event["type"] == "joinRequestAccepted" and event["crewId"] == "crew-1"
+
+@pytest.mark.skipif(database.MONGO_BACKEND != "mongodb", reason="tailable cursor는 실제 MongoDB 필요 (MONGO_BACKEND=mongodb), mongomock은 지원하지 않음")
+def test_mongo_backend_delivers_across_workers(monkeypatch):
+    monkeypatch.setattr(notification, "NOTIFICATION_BACKEND", "mongo")
+
+    async def publisher(recipients, event):
+        # 다른 워커처럼 이벤트 루프 밖의 스레드에서 capped collection에 기록, 이 워커의 tail 스레드가 읽어서 전달
+        await asyncio.sleep(0.5)
+        await asyncio.to_thread(notification.publish, recipients, event)
+
+    event = asyncio.run(publishAndReceive(publisher))
+    assert event["type"] == "joinRequestAccepted" and event["crewId"] == "crew-1"
@@ -0,0 +1,42 @@
+import pytest
+from models.models import tripPlans, crew
+from utils.queryDetector import trackQueries, NPlusOneDetected, normalizeStatement
+
+def addTripWithCrews(session, newId, count):
+    tripId, userId = newId(), newId()
+    for i in range(count):
+        planId, crewId = newId(), newId()
+        session.add(tripPlans(
+            planId=planId, userId=userId, tripId=tripId, title=f"plan {i}", date="2024-05-01", time="10:00:00",
+            place=f"place {i}", address="address", latitude=37.5, longitude=127.0, description="", crewId=crewId
+        ))
+        session.add(crew(
+            crewId=crewId, planId=planId, tripId=tripId, title=f"crew {i}", contact="", note="",
+            numOfMate=4, tripmate=userId, crewLeader=userId
+        ))
+    session.commit()
+    return tripId
+
+@pytest.mark.n_plus_one
+def test_getThisTripCrew_is_flagged(client, session, newId, query_detector):
+    # crew를 plan마다 따로 조회하는 라우트, 고치면 n_plus_one 표시를 지울 것
+    tripId = addTripWithCrews(session, newId, 3)
+    response = client.get("/getThisTripCrew", params={"tripId": tripId})
+    assert response.status_code == 200
+    assert len(response.json()["response"]) == 3
+
+def test_getCrewNearby_is_not_flagged(client, session, newId, query_detector):
+    tripId = addTripWithCrews(session, newId, 3)
+    planId = session.query(tripPlans.planId).filter(tripPlans.tripId == tripId).first().planId
+    response = client.get("/getCrewNearby", params={"planId": planId, "radiusKm": 5})
+    assert response.status_code == 200
+    assert sum(query_detector.values()) > 0
+
+def test_trackQueries_raise_mode(client, session, newId):
+    tripId = addTripWithCrews(session, newId, 3)
+    with pytest.raises(NPlusOneDetected, match="crew"):
+        with trackQueries("getThisTripCrew", mode="raise"):
+            client.get("/getThisTripCrew", params={"tripId": tripId})
+
+def test_normalizeStatement_groups_in_lists():
+    assert normalizeStatement("SELECT * FROM crew WHERE crewId IN (?, ?)") == normalizeStatement("SELECT *  FROM crew WHERE crewId IN (?)")
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from database import db
+from models.models import myTrips, tripPlans, user
+from utils import function
+
+
+@pytest.fixture
+def trip(session, newId):
+    userId, tripId = newId(), newId()
+    session.add(user(userId=userId, id=userId, passwd="pw", nickname="tester", birthDate="2000-01-01", sex="F", personality={}))
+    session.add(myTrips(
+        tripId=tripId, userId=userId, title="trip", contry="Korea", city="Seoul",
+        latitude=37.5665, longitude=126.978, startDate="2024-07-01", endDate="2024-07-01"
+    ))
+    session.commit()
+    db['SavePlace'].insert_one({"userId": userId, "tripId": tripId, "placeData": [
+        {"title": "palace", "address": "palace", "latitude": 37.5796, "longitude": 126.9770},
+        {"title": "tower", "address": "tower", "latitude": 37.5512, "longitude": 126.9882},
+    ]})
+    return userId, tripId
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    # 메모/설명 LLM 호출 대신 결과를 직접 정할 수 있는 코루틴, 취소되었는지 기록
+    calls = {"memo": None, "narrative": None, "cancelled": set()}
+
+    def fake(name):
+        async def call(*args):
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                calls["cancelled"].add(name)
+                raise
+            if isinstance(calls[name], Exception):
+                raise calls[name]
+            return calls[name]
+        return call
+
+    async def titles(places):
+        return [f"{place} 방문" for place in places]
+
+    monkeypatch.setattr(function, "openaiPlanMemo", fake("memo"))
+    monkeypatch.setattr(function, "planNarrative", fake("narrative"))
+    monkeypatch.setattr(function, "planTitles", titles)
+    return calls
+
+
+def savedPlans(session, tripId):
+    session.expire_all()
+    return session.query(tripPlans).filter(tripPlans.tripId == tripId).count()
+
+
+def test_store_failure_cancels_llm_tasks(monkeypatch, trip, llm, session):
+    userId, tripId = trip
+
+    def failingStore(*args):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(function, "storePlans", failingStore)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await function.savePlans(userId, tripId)
+        # asyncio.run이 끝나면서 남은 작업을 취소하기 전에, savePlans가 직접 취소했는지 확인
+        await asyncio.sleep(0)
+        return set(llm["cancelled"])
+
+    assert asyncio.run(run()) == {"memo", "narrative"}
+
+
+def test_llm_failure_after_store_still_succeeds(trip, llm, session):
+    userId, tripId = trip
+    llm["memo"] = RuntimeError("memo failed")
+    llm["narrative"] = RuntimeError("narrative failed")
+
+    response = asyncio.run(function.savePlans(userId, tripId))
+
+    assert response.startswith("여행 일정을 저장했어요!")
+    assert "palace 방문" in response
+    assert savedPlans(session, tripId) == 2
+    assert session.query(myTrips.memo).filter(myTrips.tripId == tripId).scalar() is None
+
+
+def test_save_plans_uses_memo_and_narrative(trip, llm, session):
+    userId, tripId = trip
+    llm["memo"] = "memo"
+    llm["narrative"] = "서울 여행 일정을 완성했어요!"
+
+    assert asyncio.run(function.savePlans(userId, tripId)) == "서울 여행 일정을 완성했어요!"
+    assert savedPlans(session, tripId) == 2
+    assert session.query(myTrips.memo).filter(myTrips.tripId == tripId).scalar() == "memo"
@@ -0,0 +1,58 @@
+import asyncio
+import time
+from serpapi import GoogleSearch
+from database import db
+from utils import function
+
+TRANSLATE_SECONDS = 0.2
+
+
+def serpResults(count):
+    return {"local_results": [
+        {
+            "title": f"place {index}",
+            "rating": 4.0,
+            "address": f"address {index}",
+            "gps_coordinates": {"latitude": 37.56 + index * 0.001, "longitude": 126.97},
+            "description": f"description {index}"
+        }
+        for index in range(count)
+    ] + [{"title": "no address", "gps_coordinates": {"latitude": 37.5, "longitude": 126.9}}]}
+
+
+def test_search_places_keeps_event_loop_free(monkeypatch, newId):
+    # serpapi, 번역, Mongo 호출은 스레드에서 실행되어 그동안 다른 코루틴이 계속 돌아야 함
+    translated = []
+
+    def slowTranslate(text, source, target):
+        time.sleep(TRANSLATE_SECONDS)
+        translated.append(text)
+        return f"ko: {text}"
+
+    def slowSearch(self):
+        time.sleep(TRANSLATE_SECONDS)
+        return serpResults(5)
+
+    monkeypatch.setattr(function, "translate", slowTranslate)
+    monkeypatch.setattr(GoogleSearch, "get_dict", slowSearch)
+    userId, tripId = newId(), newId()
+
+    async def run():
+        ticks = 0
+        task = asyncio.create_task(function.search_places("cafe", userId, tripId, 37.56, 126.97, "{}"))
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return await task, ticks
+
+    started = time.perf_counter()
+    (formatted, coordinates), ticks = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    # 주소가 없는 결과는 번역하지 않음, 번역 5번은 동시에 실행
+    assert sorted(translated) == [f"description {index}" for index in range(5)]
+    assert elapsed < TRANSLATE_SECONDS * 4
+    assert ticks >= 20
+    assert len(coordinates) == 5
+    assert "ko: description 0" in formatted
+    assert len(db['SerpData'].find_one({"userId": userId, "tripId": tripId})["data"]) == 5
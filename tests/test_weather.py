@@ -0,0 +1,77 @@
+import asyncio
+import datetime
+import httpx
+from models.models import myTrips
+from routers import myTrip
+from utils import GetWeather
+
+DAY = 86400
+
+
+def forecastSteps(first_day, days):
+    # 3시간 단위, 현지(UTC) 00시부터 days일치
+    start = int(datetime.datetime(*first_day, tzinfo=datetime.timezone.utc).timestamp())
+    return [
+        {
+            "dt": start + step * 10800,
+            "weather": [{"main": "Rain" if step % 8 == 4 else "Clouds", "icon": "10d" if step % 8 == 4 else "03d"}],
+            "main": {"temp": 10 + step % 8, "temp_min": 5 + step % 8, "temp_max": 12 + step % 8}
+        }
+        for step in range(days * 8)
+    ]
+
+
+def test_forecast_uses_free_endpoints_and_marks_days_past_horizon(monkeypatch):
+    requested = []
+
+    async def fakeRequest(method, url, **kwargs):
+        requested.append(url)
+        if url == GetWeather.FORECAST_API:
+            body = {"list": forecastSteps((2024, 7, 1), 5), "city": {"timezone": 0}}
+        else:
+            body = {"timezone": 0, "weather": [{"main": "Clear", "icon": "01d"}], "main": {"temp": 21.4}}
+        return httpx.Response(200, json=body)
+
+    monkeypatch.setattr(GetWeather.httpClient, "request", fakeRequest)
+    monkeypatch.setattr(GetWeather, "_forecast_cache", {})
+    data = asyncio.run(GetWeather.getForecastByCoord(37.5665, 126.978, "key"))
+
+    assert sorted(requested) == sorted([GetWeather.CURRENT_WEATHER_API, GetWeather.FORECAST_API])
+    assert GetWeather.FORECAST_API.endswith("/data/2.5/forecast")
+
+    summary = GetWeather.summarizeTripWeather(data, "2024-07-04", "2024-07-08")
+    assert (summary["weather"], summary["temperature"]) == ("Clear", 21)
+    assert [day["date"] for day in summary["daily"]] == [
+        "2024-07-04", "2024-07-05", "2024-07-06", "2024-07-07", "2024-07-08"
+    ]
+    assert [day["available"] for day in summary["daily"]] == [True, True, False, False, False]
+    # 정오(12시) 예보의 날씨, 하루 전체의 최저/최고 기온
+    assert summary["daily"][0] == {
+        "date": "2024-07-04", "weather": "Rain", "icon": "10d", "minTemperature": 5, "maxTemperature": 19, "available": True
+    }
+    assert summary["daily"][2]["weather"] is None
+
+
+def test_trip_weather_reports_bad_dates_per_trip(monkeypatch, client, session, newId):
+    # 날짜 형식이 잘못된 여행이 있어도 다른 여행의 날씨는 그대로 반환
+    async def fakeForecast(latitude, longitude, key):
+        return {
+            "current": {"weather": "Clear", "icon": "01d", "temperature": 21},
+            "daily": [{"date": "2024-07-01", "weather": "Rain", "icon": "10d", "minTemperature": 18, "maxTemperature": 25}]
+        }
+
+    monkeypatch.setattr(myTrip, "getForecastByCoord", fakeForecast)
+    good, bad = newId(), newId()
+    for tripId, startDate, endDate in [(good, "2024-07-01", "2024-07-02"), (bad, "7월 초", "7월 말")]:
+        session.add(myTrips(
+            tripId=tripId, userId=newId(), title="trip", contry="Korea", city="Seoul",
+            latitude=37.5665, longitude=126.978, startDate=startDate, endDate=endDate
+        ))
+    session.commit()
+
+    body = client.get("/getTripWeather", params={"tripId": [good, bad]}).json()
+
+    assert body["result code"] == 200
+    results = {result["tripId"]: result for result in body["response"]}
+    assert [day["available"] for day in results[good]["daily"]] == [True, False]
+    assert results[bad]["error"].startswith("Invalid trip dates")
@@ -1,15 +1,29 @@
-import requests
-from deep_translator import GoogleTranslator
+import asyncio
+import datetime
+from cachetools import TTLCache
+from utils.translate import translate
+from utils import httpClient
+from utils.metrics import observeCall
+from utils.providers import providerUrl
 
-def getWeather(city, WEATHER_API_KEY):
+# 둘 다 무료 키로 쓸 수 있는 2.5 API (One Call 3.0은 별도 구독이 없으면 401)
+# 예보는 3시간 단위 5일치라 여행 기간 중 그 이후 날짜는 available: False로 표시
+CURRENT_WEATHER_API = f"{providerUrl('weather')}/data/2.5/weather"
+FORECAST_API = f"{providerUrl('weather')}/data/2.5/forecast"
+
+# 좌표(소수점 2자리, 약 1km) 단위로 예보를 10분간 캐시
+_forecast_cache = TTLCache(maxsize=1024, ttl=600)
+
+async def getWeather(city, WEATHER_API_KEY):
     # 영어로 번역
-    city = GoogleTranslator(source='ko', target='en').translate(city)
+    city = await asyncio.to_thread(translate, city, 'ko', 'en')
     
-    api = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={WEATHER_API_KEY}&units=metric"
+    params = {"q": city, "appid": WEATHER_API_KEY, "units": "metric"}
     
-    result = requests.get(api)
-    if result.status_code != 200:
-        raise Exception(f"Failed to get weather data: {result.status_code} {result.text}")
+    with observeCall("weather", "current"):
+        result = await httpClient.request("GET", CURRENT_WEATHER_API, params=params)
+        if result.status_code != 200:
+            raise Exception(f"Failed to get weather data: {result.status_code} {result.text}")
     
     data = result.json()
     
@@ -19,4 +33,85 @@ def getWeather(city, WEATHER_API_KEY):
     weather = data['weather'][0]['main']
     icon = data['weather'][0]['icon']
     temp = round(data['main']['temp'])
-    return weather, icon, temp
\ No newline at end of file
+    return weather, icon, temp
+
+def roundCoord(latitude, longitude):
+    return round(latitude, 2), round(longitude, 2)
+
+async def requestWeather(url, endpoint, params):
+    with observeCall("weather", endpoint):
+        result = await httpClient.request("GET", url, params=params)
+        if result.status_code != 200:
+            raise Exception(f"Failed to get weather data: {result.status_code} {result.text}")
+    return result.json()
+
+def dailyForecast(steps, offset):
+    # 3시간 단위 예보를 현지 날짜별로 묶음, 날씨 아이콘은 현지 정오에 가장 가까운 시각 기준
+    days = {}
+    for step in steps:
+        local = datetime.datetime.fromtimestamp(step['dt'] + offset, datetime.timezone.utc)
+        days.setdefault(local.strftime("%Y-%m-%d"), []).append((abs(local.hour - 12), step))
+
+    daily = []
+    for date, entries in sorted(days.items()):
+        midday = min(entries, key=lambda entry: entry[0])[1]
+        daily.append({
+            "date": date,
+            "weather": midday['weather'][0]['main'],
+            "icon": midday['weather'][0]['icon'],
+            "minTemperature": round(min(step['main']['temp_min'] for _, step in entries)),
+            "maxTemperature": round(max(step['main']['temp_max'] for _, step in entries))
+        })
+    return daily
+
+async def getForecastByCoord(latitude, longitude, WEATHER_API_KEY):
+    # 현재 날씨와 일별 예보(최대 5일)를 동시에 요청해서 합침
+    key = roundCoord(latitude, longitude)
+    cached = _forecast_cache.get(key)
+    if cached is not None:
+        return cached
+
+    params = {"lat": key[0], "lon": key[1], "units": "metric", "appid": WEATHER_API_KEY}
+    current, forecast = await asyncio.gather(
+        requestWeather(CURRENT_WEATHER_API, "current", params),
+        requestWeather(FORECAST_API, "forecast", params)
+    )
+    if 'weather' not in current or 'main' not in current or 'list' not in forecast:
+        raise Exception("Invalid response from weather API")
+
+    offset = forecast.get('city', {}).get('timezone', current.get('timezone', 0))
+    data = {
+        "current": {
+            "weather": current['weather'][0]['main'],
+            "icon": current['weather'][0]['icon'],
+            "temperature": round(current['main']['temp'])
+        },
+        "daily": dailyForecast(forecast['list'], offset)
+    }
+    _forecast_cache[key] = data
+    return data
+
+def summarizeTripWeather(data, startDate, endDate):
+    # 현재 날씨 + 여행 기간(startDate~endDate)의 날짜별 예보, 예보 범위 밖의 날짜는 available: False
+    start = datetime.date.fromisoformat(str(startDate)[:10])
+    end = datetime.date.fromisoformat(str(endDate)[:10])
+    forecast_by_date = {day['date']: day for day in data['daily']}
+
+    daily = []
+    date = start
+    while date <= end:
+        day = forecast_by_date.get(date.isoformat())
+        if day:
+            daily.append({**day, "available": True})
+        else:
+            daily.append({
+                "date": date.isoformat(),
+                "weather": None,
+                "icon": None,
+                "minTemperature": None,
+                "maxTemperature": None,
+                "available": False
+            })
+        date += datetime.timedelta(days=1)
+
+    return {**data['current'], "daily": daily}
@@ -1,25 +1,23 @@
-import openai
-import requests
-from io import BytesIO
-import base64
-from deep_translator import GoogleTranslator
+import asyncio
+from utils.translate import translate
+from database import get_config
+from utils import httpClient
+from utils.llmGateway import createImage
 
-def imageGeneration(contry, city, title, OPENAI_API_KEY):
-    # OpenAI API 키 설정
-    openai.api_key = OPENAI_API_KEY
-    
+# 생성된 배너 이미지 다운로드 최대 크기
+IMAGE_MAX_BYTES = get_config("IMAGE_MAX_BYTES", 8 * 1024 * 1024)
+
+async def imageGeneration(contry, city, title):
     # 영어로 번역
     text = f'A beautiful travel photo of {city}, {contry}, {title}.'
-    result = GoogleTranslator(source='ko', target='en').translate(text)
+    result = await asyncio.to_thread(translate, text, 'ko', 'en')
     
     # 이미지 생성
-    response = openai.Image.create(
-	prompt=result,
-	n=1,
-	size='1024x1024'
- )
+    response = await createImage(
+        prompt=result,
+        n=1,
+        size='1024x1024'
+    )
     image_url = response['data'][0]['url']
-    response = requests.get(image_url)
-    img = BytesIO(response.content)
-    img_base64 = base64.b64encode(img.getvalue()).decode('utf-8')
-    return img_base64
\ No newline at end of file
+    # base64 변환 없이 이미지 바이트를 그대로 반환 (DB에 바로 저장)
+    return await httpClient.download(image_url, IMAGE_MAX_BYTES)
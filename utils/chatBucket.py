@@ -0,0 +1,161 @@
+import datetime
+from bson import ObjectId
+from pymongo import UpdateOne
+from database import db
+
+# 채팅 로그는 (userId, tripId)별로 고정 크기의 시간 버킷 문서에 나눠서 저장
+# 한 버킷은 CHAT_BUCKET_SECONDS 구간의 메시지를 최대 CHAT_BUCKET_SIZE개까지 담고, 가득 차면 같은 구간의 새 버킷이 생성됨
+# 메시지마다 seq(ObjectId 문자열)를 붙여서 (timestamp, seq) 순서로 정렬, 같은 시각의 메시지도 페이지 경계에서 빠지지 않음
+CHAT_BUCKET_SECONDS = 60 * 60 * 24
+CHAT_BUCKET_SIZE = 200
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# 기존 ChatData 문서를 옮기는 요청이 이 시간 안에 끝내지 못하면(프로세스 종료 등) 다른 요청이 다시 옮김
+CHAT_MIGRATION_LEASE_SECONDS = 60
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+ChatBucket_collection = db['ChatBucket']
+ChatData_collection = db['ChatData']
+
+def bucketStart(timestamp):
+    seconds = int((timestamp - EPOCH).total_seconds())
+    return EPOCH + datetime.timedelta(seconds=seconds - seconds % CHAT_BUCKET_SECONDS)
+
+def newSeq():
+    return str(ObjectId())
+
+def messageKey(message):
+    return (message["timestamp"], message.get("seq", ""))
+
+def appendChatMessage(userId, tripId, message):
+    migrateLegacyChat(userId, tripId)
+    message = {**message, "seq": message.get("seq") or newSeq()}
+    timestamp = message["timestamp"]
+    result = ChatBucket_collection.update_one(
+        {
+            "userId": userId,
+            "tripId": tripId,
+            "bucket": bucketStart(timestamp),
+            "count": {"$lt": CHAT_BUCKET_SIZE}
+        },
+        {
+            "$push": {"messages": message},
+            "$inc": {"count": 1},
+            "$min": {"first": timestamp},
+            "$max": {"last": timestamp}
+        },
+        upsert=True
+    )
+    return result.upserted_id is not None
+
+def clearChat(userId, tripId):
+    ChatBucket_collection.delete_many({"userId": userId, "tripId": tripId})
+    ChatData_collection.delete_many({"userId": userId, "tripId": tripId})
+
+def buildBuckets(userId, tripId, conversation, seqPrefix=None):
+    # 기존 conversation 배열을 시간 순서대로 버킷 문서 목록으로 변환
+    # _id는 (userId, tripId, 버킷 시작, 같은 구간 안의 순번)으로 정해서 다시 실행해도 같은 문서가 됨
+    # seqPrefix(기존 문서의 _id)를 주면 메시지 seq도 순서대로 정해짐
+    messages = sorted((m for m in conversation if m.get("timestamp")), key=lambda m: m["timestamp"])
+    buckets = []
+    for index, message in enumerate(messages):
+        seq = f"{seqPrefix}-{index:06d}" if seqPrefix is not None else newSeq()
+        message = {**message, "seq": message.get("seq") or seq}
+        start = bucketStart(message["timestamp"])
+        current = buckets[-1] if buckets else None
+        if current is None or current["bucket"] != start or current["count"] >= CHAT_BUCKET_SIZE:
+            part = sum(1 for bucket in buckets if bucket["bucket"] == start)
+            current = {
+                "_id": f"{userId}:{tripId}:{start:%Y%m%d%H%M%S}:{part}",
+                "userId": userId,
+                "tripId": tripId,
+                "bucket": start,
+                "count": 0,
+                "first": message["timestamp"],
+                "last": message["timestamp"],
+                "messages": []
+            }
+            buckets.append(current)
+        current["messages"].append(message)
+        current["count"] += 1
+        current["last"] = message["timestamp"]
+    return buckets
+
+def legacyMessages(document):
+    return [message for bucket in legacyBuckets(document) for message in bucket["messages"]]
+
+def legacyBuckets(document):
+    return buildBuckets(document["userId"], document["tripId"], document.get("conversation", []), str(document["_id"]))
+
+def claimLegacyDocument(query):
+    # migratingAt을 원자적으로 기록해서 동시에 읽어도 한 요청만 변환하도록 함
+    # 기록된 지 CHAT_MIGRATION_LEASE_SECONDS가 지났으면 중간에 실패한 것으로 보고 다시 가져감
+    now = datetime.datetime.now()
+    expired = now - datetime.timedelta(seconds=CHAT_MIGRATION_LEASE_SECONDS)
+    return ChatData_collection.find_one_and_update(
+        {**query, "$or": [{"migratingAt": {"$exists": False}}, {"migratingAt": {"$lt": expired}}]},
+        {"$set": {"migratingAt": now}}
+    )
+
+def migrateLegacyDocument(document):
+    # 이미 들어간 버킷은 그대로 두고($setOnInsert) 없는 버킷만 추가하므로 다시 실행해도 중복되지 않음
+    buckets = legacyBuckets(document)
+    if buckets:
+        ChatBucket_collection.bulk_write(
+            [UpdateOne({"_id": bucket["_id"]}, {"$setOnInsert": bucket}, upsert=True) for bucket in buckets],
+            ordered=False
+        )
+    ChatData_collection.delete_one({"_id": document["_id"]})
+    return len(buckets)
+
+def migrateLegacyChat(userId, tripId):
+    # 아직 버킷으로 옮겨지지 않은 기존 문서는 버킷 유무와 관계없이 처음 읽거나 쓸 때 변환
+    legacy = claimLegacyDocument({"userId": userId, "tripId": tripId})
+    if legacy is None:
+        return 0
+    return migrateLegacyDocument(legacy)
+
+def beforeCursor(messages, before, beforeSeq):
+    if before is not None and beforeSeq is not None:
+        return [m for m in messages if messageKey(m) < (before, beforeSeq)]
+    if before is not None:
+        return [m for m in messages if m["timestamp"] < before]
+    return messages
+
+def getChatPage(userId, tripId, before=None, limit=DEFAULT_PAGE_SIZE, beforeSeq=None):
+    # 최신 메시지부터 limit개를 가져오고, before가 있으면 그 시각 이전 메시지만 가져옴
+    # 이전 페이지의 nextBeforeSeq를 함께 주면 같은 시각의 메시지 중 그 seq 이전 메시지도 가져옴
+    migrateLegacyChat(userId, tripId)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = {"userId": userId, "tripId": tripId}
+    if before is not None:
+        query["first"] = {"$lte": before} if beforeSeq is not None else {"$lt": before}
+
+    # 다른 요청이 옮기는 중이면 아직 남아 있는 기존 문서도 함께 읽음 (이미 옮겨진 메시지는 seq로 중복 제거)
+    legacy = ChatData_collection.find_one({"userId": userId, "tripId": tripId})
+
+    cursor = ChatBucket_collection.find(query, {"_id": 0, "messages": 1}).sort([("bucket", -1), ("first", -1)])
+    collected = []
+    found = False
+    for document in cursor:
+        found = True
+        collected = beforeCursor(document.get("messages", []), before, beforeSeq) + collected
+        if legacy is None and len(collected) > limit:
+            break
+    cursor.close()
+
+    if legacy is not None:
+        found = True
+        seen = {m.get("seq") for m in collected}
+        collected += [m for m in beforeCursor(legacyMessages(legacy), before, beforeSeq) if m["seq"] not in seen]
+
+    if not found and before is None:
+        return None
+
+    collected.sort(key=messageKey)
+    has_more = len(collected) > limit
+    page = collected[-limit:]
+    next_before = page[0]["timestamp"] if has_more and page else None
+    next_before_seq = page[0].get("seq") if has_more and page else None
+    return {"messages": page, "hasMore": has_more, "nextBefore": next_before, "nextBeforeSeq": next_before_seq}
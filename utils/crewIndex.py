@@ -0,0 +1,97 @@
+import bisect
+import threading
+import time
+import numpy as np
+from sqlalchemy.orm import Session
+from models.models import crew, tripPlans
+from database import get_config
+from utils.geo import geohashEncode, geohashCover, haversine
+
+# 크루가 있는 tripPlans 좌표의 geohash 정렬 목록 (프로세스 메모리)
+# 반경 검색은 geohash 접두사 범위만 bisect로 찾고 거리는 후보에 대해서만 계산
+# 다른 워커에서 추가/삭제된 크루는 CREW_INDEX_TTL_SECONDS 마다 다시 읽어서 반영
+CREW_INDEX_TTL_SECONDS = get_config("CREW_INDEX_TTL_SECONDS", 300)
+CREW_INDEX_PRECISION = 8
+
+_lock = threading.Lock()
+_keys = []
+_entries = []
+# 아직 만들지 않았으면 None (monotonic()은 부팅 시점 기준이라 0과 비교하면 부팅 직후에는 만들지 않음)
+_built_at = None
+
+def _entry(crewId, planId, tripId, date, latitude, longitude):
+    return {
+        "crewId": crewId,
+        "planId": planId,
+        "tripId": tripId,
+        "date": str(date)[:10],
+        "latitude": float(latitude),
+        "longitude": float(longitude)
+    }
+
+def _insert(entry):
+    key = (geohashEncode(entry["latitude"], entry["longitude"], CREW_INDEX_PRECISION), entry["crewId"])
+    index = bisect.bisect_left(_keys, key)
+    _keys.insert(index, key)
+    _entries.insert(index, entry)
+
+def rebuildCrewIndex(session: Session):
+    # 배너 같은 큰 컬럼 없이 좌표와 날짜만 조회
+    rows = session.query(
+        crew.crewId, crew.planId, crew.tripId, tripPlans.date, tripPlans.latitude, tripPlans.longitude
+    ).join(tripPlans, tripPlans.planId == crew.planId).all()
+    entries = [_entry(*row) for row in rows]
+    keyed = sorted(
+        ((geohashEncode(entry["latitude"], entry["longitude"], CREW_INDEX_PRECISION), entry["crewId"]), entry)
+        for entry in entries
+    )
+    global _keys, _entries, _built_at
+    with _lock:
+        _keys = [key for key, _ in keyed]
+        _entries = [entry for _, entry in keyed]
+        _built_at = time.monotonic()
+    return len(_entries)
+
+def ensureCrewIndex(session: Session):
+    if _built_at is None or time.monotonic() - _built_at > CREW_INDEX_TTL_SECONDS:
+        rebuildCrewIndex(session)
+
+def addCrew(crewId, planId, tripId, date, latitude, longitude):
+    with _lock:
+        _insert(_entry(crewId, planId, tripId, date, latitude, longitude))
+
+def removeCrew(crewId):
+    with _lock:
+        for index, entry in enumerate(_entries):
+            if entry["crewId"] == crewId:
+                del _keys[index]
+                del _entries[index]
+                return True
+    return False
+
+def crewsNearby(latitude, longitude, radius_km, startDate=None, endDate=None, excludeTripId=None):
+    # (entry, 거리 km) 목록을 거리, 날짜 순으로 반환
+    candidates = []
+    with _lock:
+        for prefix in geohashCover(latitude, longitude, radius_km, CREW_INDEX_PRECISION):
+            start = bisect.bisect_left(_keys, (prefix,))
+            end = bisect.bisect_left(_keys, (prefix + "~",))
+            candidates.extend(_entries[start:end])
+
+    if startDate is not None:
+        candidates = [entry for entry in candidates if entry["date"] >= str(startDate)[:10]]
+    if endDate is not None:
+        candidates = [entry for entry in candidates if entry["date"] <= str(endDate)[:10]]
+    if excludeTripId is not None:
+        candidates = [entry for entry in candidates if entry["tripId"] != excludeTripId]
+    if not candidates:
+        return []
+
+    distances = haversine(
+        np.array([entry["latitude"] for entry in candidates]),
+        np.array([entry["longitude"] for entry in candidates]),
+        latitude, longitude
+    )
+    results = [(entry, float(distance)) for entry, distance in zip(candidates, distances) if distance <= radius_km]
+    results.sort(key=lambda result: (result[1], result[0]["date"]))
+    return results
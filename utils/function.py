@@ -1,219 +1,248 @@
 import os
 import json
-import openai
-from serpapi import GoogleSearch
-from deep_translator import GoogleTranslator
+import asyncio
 from sqlalchemy.ext.declarative import declarative_base
 import re
 import uuid
 from sqlalchemy import *
 from sqlalchemy.orm import sessionmaker
-import google.generativeai as genai
-from database import sqldb, OPENAI_API_KEY, GEMINI_API_KEY, SERP_API_KEY,db
+from database import sqldb, SERP_API_KEY, db
 from models.models import myTrips, tripPlans, user
-from langchain.memory import ConversationBufferMemory
-from langchain.schema import BaseMessage, AIMessage, HumanMessage, SystemMessage
-from langchain.embeddings import OpenAIEmbeddings
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
 from typing import Optional
 import datetime
 from utils.openaiMemo import openaiPlanMemo
-
-openai.api_key = OPENAI_API_KEY
-
-# ConversationBufferMemory 초기화
-if 'memory' not in globals():
-    memory = ConversationBufferMemory()
+from utils.llmGateway import chatCompletion, createEmbeddings, generateContent
+from utils.intentRouter import classifyIntent, isDirectIntent, recordIntent, shouldShadow
+from utils.placeRanking import PLACE_RANKING_MODE, rankPlaces, applyLlmOrder
+from utils.itinerary import buildItinerary
+from utils.planStore import bulkInsertPlans
+from utils.translate import translate
+from utils.metrics import observeCall
+from utils.providers import providerUrl
+
+# ConversationBufferMemory는 langchain import가 무거워서 처음 사용할 때 생성
+_memory = None
+
+def getMemory():
+    global _memory
+    if _memory is None:
+        from langchain.memory import ConversationBufferMemory
+        _memory = ConversationBufferMemory()
+    return _memory
 
 pending_updates = {}
 
-def get_embedding(text):
-    response = openai.Embedding.create(input=text, model="text-embedding-ada-002")
-    return response['data'][0]['embedding']
+async def get_embeddings(texts):
+    return await createEmbeddings(texts)
 
-def message_to_dict(msg: BaseMessage):
-
-    if isinstance(msg, HumanMessage):
-        return {"role": "user", "content": msg.content}
-    elif isinstance(msg, AIMessage):
-        return {"role": "assistant", "content": msg.content}
-    elif isinstance(msg, SystemMessage):
-        return {"role": "system", "content": msg.content}
-    else:
+def message_to_dict(msg):
+    # langchain 메시지 타입(human/ai/system)을 OpenAI role로 변환
+    roles = {"human": "user", "ai": "assistant", "system": "system"}
+    if msg.type not in roles:
         raise ValueError(f"Unknown message type: {type(msg)}")
+    return {"role": roles[msg.type], "content": msg.content}
+
+def cosine_similarity(a, b):
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+# GPT-4o 라우터에 넘기는 함수 목록
+FUNCTION_SCHEMAS = [
+    {
+        "name": "search_places",
+        "description": "Search for various types of places based on user query, such as 'popular cafes in Barcelona'. This function should be used for general searches where the user is looking for multiple options or recommendations.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The search query for finding places. Include keywords like 'find', 'popular', 'recommend', 'cafes', 'restaurants', etc. If the query isn't in English, translate it to English."
+                }
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "just_chat",
+        "description": "Respond to general questions and provide information",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The user's general query"
+                }
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "save_place",
+        "description": "사용자의 query에서 숫자가 있다면 숫자를 추출하여 SerpData의 MongoDB 데이터를 SavePlace MongoDB에 저장합니다. 사용자가 숫자와 함께, 또는 숫자 없이 '저장', '추가', '갈래' 등의 다양한 표현으로 저장을 요청할 수 있습니다.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "사용자가 숫자와 함께 또는 숫자 없이 저장 또는 추가를 요청하는 다양한 표현의 쿼리 문자열"
+                }
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "save_plan",
+        "description": "SavePlace의 placeData를 mysql tripPlans Table에 저장",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "사용자가 여행 계획 짜줘, 여행 일정 만들어줘, 최종 일정 만들어줘, 그걸로 일정 짜줘 등 여행 관련 일정을 만들어달라는 요청하는 모든 말을 했을 때 실행"
+                }
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "update_trip_plan",
+        "description": "Update a trip plan with the given details",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "사용자가 일정을 수정하고 싶다는 내용을 담은 문자열"
+                },
+                "userId": {
+                    "type": "string",
+                    "description": "The user ID for the search context"
+                },
+                "tripId": {
+                    "type": "string",
+                    "description": "The trip ID for the search context"
+                }
+            },
+            "required": ["query", "userId", "tripId"]
+        }
+    },
+    {
+        "name": "search_place_details",
+        "description": "Fetch detailed information about a specific place based on the place name. This function should be used when the user provides a specific place name and wants detailed information about it.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The name of the place to get details for. If the query isn't english, translate it in english."
+                }
+            },
+            "required": ["query"]
+        }
+    }
+]
 
-def call_openai_function(query: str, userId: str, tripId: str, latitude: Optional[float] = None, longitude: Optional[float] = None, personality: Optional[str] = None):
+async def call_openai_function(query: str, userId: str, tripId: str, latitude: Optional[float] = None, longitude: Optional[float] = None, personality: Optional[str] = None):
     isSerp = False
     geo_coordinates = []
     function_name = None
     
     if query.strip().lower() == "확인":
         result = update_trip_plan_confirmed(userId)
-        memory.save_context({"input": query}, {"output": result})
+        getMemory().save_context({"input": query}, {"output": result})
         return {"result": result, "geo_coordinates": geo_coordinates, "isSerp": isSerp, "function_name": "update_trip_plan_confirmed"}
 
     if userId in pending_updates and query.strip().lower() != "확인":
         pending_updates.pop(userId)
         result = "일정 수정을 취소합니다! 수정을 원하시면 다시 수정사항을 말씀해주세요!"
-        memory.save_context({"input": query}, {"output": result})
+        getMemory().save_context({"input": query}, {"output": result})
         return {"result": result, "geo_coordinates": geo_coordinates, "isSerp": isSerp, "function_name": "cancel_update"}
 
-    memory.save_context({"input": query}, {"output": ""})
-    print(memory.chat_memory)
+    getMemory().save_context({"input": query}, {"output": ""})
+    print(getMemory().chat_memory)
     
     messages = [
         {"role": "system", "content": "You are a helpful assistant that helps users plan their travel plans."},
-    ] + [message_to_dict(msg) for msg in memory.chat_memory.messages] + [
+    ] + [message_to_dict(msg) for msg in getMemory().chat_memory.messages] + [
         {"role": "user", "content": query}
     ]
-    
-    response = openai.ChatCompletion.create(
-        model="gpt-4o",
-        messages=messages,
-        functions=[
-            {
-                "name": "search_places",
-                "description": "Search for various types of places based on user query, such as 'popular cafes in Barcelona'. This function should be used for general searches where the user is looking for multiple options or recommendations.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "The search query for finding places. Include keywords like 'find', 'popular', 'recommend', 'cafes', 'restaurants', etc. If the query isn't in English, translate it to English."
-                        }
-                    },
-                    "required": ["query"]
-                }
-            },
-            {
-                "name": "just_chat",
-                "description": "Respond to general questions and provide information",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "The user's general query"
-                        }
-                    },
-                    "required": ["query"]
-                }
-            },
-            {
-                "name": "save_place",
-                "description": "사용자의 query에서 숫자가 있다면 숫자를 추출하여 SerpData의 MongoDB 데이터를 SavePlace MongoDB에 저장합니다. 사용자가 숫자와 함께, 또는 숫자 없이 '저장', '추가', '갈래' 등의 다양한 표현으로 저장을 요청할 수 있습니다.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "사용자가 숫자와 함께 또는 숫자 없이 저장 또는 추가를 요청하는 다양한 표현의 쿼리 문자열"
-                        }
-                    },
-                    "required": ["query"]
-                }
-            },
-            {
-                "name": "save_plan",
-                "description": "SavePlace의 placeData를 mysql tripPlans Table에 저장",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "사용자가 여행 계획 짜줘, 여행 일정 만들어줘, 최종 일정 만들어줘, 그걸로 일정 짜줘 등 여행 관련 일정을 만들어달라는 요청하는 모든 말을 했을 때 실행"
-                        }
-                    },
-                    "required": ["query"]
-                }
-            },
-            {
-                "name": "update_trip_plan",
-                "description": "Update a trip plan with the given details",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "사용자가 일정을 수정하고 싶다는 내용을 담은 문자열"
-                        },
-                        "userId": {
-                            "type": "string",
-                            "description": "The user ID for the search context"
-                        },
-                        "tripId": {
-                            "type": "string",
-                            "description": "The trip ID for the search context"
-                        }
-                    },
-                    "required": ["query", "userId", "tripId"]
-                }
-            },
-            {
-                "name": "search_place_details",
-                "description": "Fetch detailed information about a specific place based on the place name. This function should be used when the user provides a specific place name and wants detailed information about it.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "The name of the place to get details for. If the query isn't english, translate it in english."
-                        }
-                    },
-                    "required": ["query"]
-                }
-            }
-        ],
-        function_call="auto"
-    )
 
-    try:
-        function_call = response.choices[0].message["function_call"]
-        function_name = function_call["name"]
-
-        # 호출된 함수 이름을 출력
-        print(f"Calling function: {function_name}")
-
-        if function_name == "search_places":
-            args = json.loads(function_call["arguments"])
-            search_query = args["query"]
+    # 로컬 의도 분류기가 확신하는 경우 LLM 라우터를 거치지 않고 바로 실행
+    intent, confidence, source = classifyIntent(query)
+    if isDirectIntent(intent, confidence):
+        function_name = intent
+        print(f"Calling function: {function_name} (local {source}, {confidence:.2f})")
+        result, geo_coordinates, isSerp = await dispatch_function(function_name, {"query": query}, userId, tripId, latitude, longitude, personality)
+        recordIntent(query, intent, confidence, source, direct=True)
+        if shouldShadow():
+            # 작업 참조를 남겨 두지 않으면 실행 중에 가비지 컬렉션될 수 있음
+            task = asyncio.ensure_future(shadow_route(messages, query, intent, confidence, source))
+            _shadow_tasks.add(task)
+            task.add_done_callback(_shadow_tasks.discard)
+    else:
+        response = await route_with_llm(messages)
+        try:
+            function_call = response.choices[0].message["function_call"]
+            function_name = function_call["name"]
 
-            result, geo_coordinates = search_places(search_query, userId, tripId, latitude, longitude, personality)
-            isSerp = True
+            # 호출된 함수 이름을 출력
+            print(f"Calling function: {function_name}")
 
-        elif function_name == "search_place_details":
-            args = json.loads(function_call["arguments"])
-            search_query = args["query"]
-            
-            result, geo_coordinates = search_place_details(search_query, userId, tripId, latitude, longitude)
-            isSerp = True
-        elif function_name == "just_chat":
-            args = json.loads(function_call["arguments"])
-            result = just_chat(args["query"])
-        elif function_name == "save_place":
             args = json.loads(function_call["arguments"])
-            result = savePlace(args["query"], userId, tripId)
-        elif function_name == "save_plan":
-            args = json.loads(function_call["arguments"])
-            result = savePlans(userId, tripId)
-        elif function_name == "update_trip_plan":
-            args = json.loads(function_call["arguments"])
-            result = handle_update_trip_plan(args["query"], userId, tripId)
-        else:
+            result, geo_coordinates, isSerp = await dispatch_function(function_name, args, userId, tripId, latitude, longitude, personality)
+        except KeyError:
             result = response.choices[0].message["content"]
-    except KeyError:
-        result = response.choices[0].message["content"]
+        recordIntent(query, intent, confidence, source, llm_intent=function_name or "none")
 
     # 대화 메모리에 응답 추가
-    memory.save_context({"input": query}, {"output": result})
+    getMemory().save_context({"input": query}, {"output": result})
 
     return {"result" : result, 
             "geo_coordinates": geo_coordinates, 
             "isSerp": isSerp, 
             "function_name": function_name}
 
+async def route_with_llm(messages):
+    return await chatCompletion(
+        model="gpt-4o",
+        messages=messages,
+        functions=FUNCTION_SCHEMAS,
+        function_call="auto"
+    )
+
+# 실행 중인 shadow_route 작업
+_shadow_tasks = set()
 
-def search_places(query: str, userId: str, tripId: str, latitude: float, longitude: float, personality: str):
+async def shadow_route(messages, query, intent, confidence, source):
+    # 로컬에서 처리한 메시지를 LLM 라우터에도 보내 결과 비교만 기록
+    try:
+        response = await route_with_llm(messages)
+        function_call = response.choices[0].message.get("function_call")
+        recordIntent(query, intent, confidence, source, llm_intent=function_call["name"] if function_call else "none")
+    except Exception as e:
+        print(f"Shadow routing failed: {e}")
+
+async def dispatch_function(function_name, args, userId, tripId, latitude, longitude, personality):
+    # (결과, 좌표 목록, isSerp) 반환, 알 수 없는 함수면 KeyError
+    if function_name == "search_places":
+        result, geo_coordinates = await search_places(args["query"], userId, tripId, latitude, longitude, personality)
+        return result, geo_coordinates, True
+    if function_name == "search_place_details":
+        result, geo_coordinates = search_place_details(args["query"], userId, tripId, latitude, longitude)
+        return result, geo_coordinates, True
+    if function_name == "just_chat":
+        return await just_chat(args["query"]), [], False
+    if function_name == "save_place":
+        return savePlace(args["query"], userId, tripId), [], False
+    if function_name == "save_plan":
+        return await savePlans(userId, tripId), [], False
+    if function_name == "update_trip_plan":
+        return await handle_update_trip_plan(args["query"], userId, tripId), [], False
+    raise KeyError(function_name)
+
+
+async def search_places(query: str, userId: str, tripId: str, latitude: float, longitude: float, personality: str):
     
     # JSON 문자열을 파이썬 딕셔너리로 변환
     try:
@@ -234,89 +263,64 @@ def search_places(query: str, userId: str, tripId: str, latitude: float, longitu
         "api_key": SERP_API_KEY,
         "ll": ll_param
     }
+    from serpapi import GoogleSearch
     search = GoogleSearch(params)
-    data = search.get_dict()
+    search.BACKEND = providerUrl("serpapi")
+    # serpapi, 번역, pymongo는 동기 호출이라 이벤트 루프를 막지 않도록 스레드에서 실행
+    with observeCall("serpapi", "google_maps"):
+        data = await asyncio.to_thread(search.get_dict)
     
-    personality_dict = {
-        "money1": "이왕 여행을 간 김에 가격이 비싸고 좋은 곳으로 알려줘",
-        "money2": "여행 경비를 아껴야해 가격이 저렴한 곳으로 알려줘",
-        "food1": "맛집 웨이팅 기다릴 수 있어 평점이 높은 곳 위주로",
-        "food2": "그냥 끌리는대로 다닐래 평점 낮아도 상관 없어",
-        "transport1": "경도 위도가 가까운 곳으로 알려줘",
-        "transport2": "좀 멀어도 괜찮아",
-        "schedule1": "즐기면서 천천히 다니고 싶어",
-        "schedule2": "일정 알차게 돌아다니고 싶어",
-        "photo1": "사진은 중요하지 않아",
-        "photo2": "포토스팟 위주로 알려줘"
-    }
+    trip_latitude, trip_longitude = latitude, longitude
+    serp_collection = db['SerpData']
+
+    # 주소나 좌표가 없는 결과는 번역하지 않고 제외
+    results = [
+        result for result in data['local_results']
+        if result.get('address') and result.get('gps_coordinates', {}).get('latitude') and result.get('gps_coordinates', {}).get('longitude')
+    ]
+    # 설명 번역(결과마다 한 번)은 동시에 요청하고, 그동안 이전 검색 결과 삭제
+    *translated_descriptions, _ = await asyncio.gather(
+        *(asyncio.to_thread(translate, result.get('description', 'No description available.'), 'en', 'ko') for result in results),
+        asyncio.to_thread(serp_collection.delete_one, {"userId": userId, "tripId": tripId})
+    )
 
-    personality_query = "사용자의 성향: "
-    for key, value in personality.items():
-        personality_query += personality_dict[value] + " "
-    
     parsed_results = []
-    serp_collection = db['SerpData']
-    serp_collection.delete_one({"userId": userId, "tripId": tripId})
-    translator = GoogleTranslator(source='en', target='ko')
-    
+    hints = []
     # 결과 파싱
-    for result in data['local_results']:
-        title = result.get('title')
-        rating = result.get('rating')
-        address = result.get('address')
-        gps_coordinates = result.get('gps_coordinates', {})
-        latitude = gps_coordinates.get('latitude')
-        longitude = gps_coordinates.get('longitude')
-        description = result.get('description', 'No description available.')
-        translated_description = translator.translate(description)
-        price = result.get('price', None)
-
-        if not address or not latitude or not longitude:
-            continue
-
+    for result, translated_description in zip(results, translated_descriptions):
+        gps_coordinates = result['gps_coordinates']
         place_data = {
-            "title": title,
-            "rating": rating,
-            "address": address,
-            "latitude": latitude,
-            "longitude": longitude,
+            "title": result.get('title'),
+            "rating": result.get('rating'),
+            "reviews": result.get('reviews'),
+            "address": result['address'],
+            "latitude": gps_coordinates['latitude'],
+            "longitude": gps_coordinates['longitude'],
             "description": translated_description,
-            "price": price,
+            "price": result.get('price', None),
             "date": None,
             "time": None
         }
         parsed_results.append(place_data)
+        # 장소 분류(type) 정보는 정렬에만 사용
+        hints.append(" ".join([result.get('type') or ""] + (result.get('types') or [])))
 
-    # Gemini API를 사용하여 정렬
-    genai.configure(api_key=GEMINI_API_KEY)
-    prompt = (personality_query + "\n"
-              "장소 목록:\n" +
-              '\n'.join([f"{i+1}. 장소 이름: {place['title']}\n    별점: {place['rating']}\n    주소: {place['address']}\n    설명: {place['description']}\n    가격: {place.get('price', '없음')}\n" 
-                         for i, place in enumerate(parsed_results)]) + "\n"
-              "위 성향에 맞게 장소 목록을 재정렬해주세요. 해당 성향에 적합한 장소를 먼저 정렬해주세요 모든 장소를 사용해야하고 중복되지 않게 해주세요 이 장소 말고 다른 장소는 추가해서 안돼")
-    
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    response = model.generate_content(prompt).text
-    
-    # 응답에서 정렬된 장소 목록 추출
-    sorted_results = response.strip().split('\n')
-    
-    # parsed_results를 sorted_results 순서에 맞게 정렬
-    sorted_parsed_results = []
-    for result in sorted_results:
-        for place in parsed_results:
-            if place['title'] in result:
-                sorted_parsed_results.append(place)
-                break
+    # 성향에 맞게 정렬, 기본은 로컬 점수 계산이고 PLACE_RANKING_MODE가 "llm"이면 Gemini 사용
+    if PLACE_RANKING_MODE == "llm" and isinstance(personality, dict):
+        sorted_parsed_results = await rerank_with_llm(parsed_results, personality)
+    else:
+        sorted_parsed_results = rankPlaces(parsed_results, personality, trip_latitude, trip_longitude, hints)
     
     # 정렬된 결과를 MongoDB에 저장
     document = {
         "userId": userId,
         "tripId": tripId,
-        "data": sorted_parsed_results
+        "data": sorted_parsed_results,
+        "updatedAt": datetime.datetime.now(datetime.timezone.utc)
     }
 
-    serp_collection.update_one(
+    await asyncio.to_thread(
+        serp_collection.update_one,
         {"userId": userId, "tripId": tripId},
         {"$set": document},
         upsert=True
@@ -334,8 +338,37 @@ def search_places(query: str, userId: str, tripId: str, latitude: float, longitu
     resultFormatted = '\n'.join(final_formatted_results)
     return resultFormatted, geo_coordinates
 
-def just_chat(query: str):
-    response = openai.ChatCompletion.create(
+# search_places LLM 재정렬 모드에서 쓰는 성향 설명
+SEARCH_PERSONALITY_DICT = {
+    "money1": "이왕 여행을 간 김에 가격이 비싸고 좋은 곳으로 알려줘",
+    "money2": "여행 경비를 아껴야해 가격이 저렴한 곳으로 알려줘",
+    "food1": "맛집 웨이팅 기다릴 수 있어 평점이 높은 곳 위주로",
+    "food2": "그냥 끌리는대로 다닐래 평점 낮아도 상관 없어",
+    "transport1": "경도 위도가 가까운 곳으로 알려줘",
+    "transport2": "좀 멀어도 괜찮아",
+    "schedule1": "즐기면서 천천히 다니고 싶어",
+    "schedule2": "일정 알차게 돌아다니고 싶어",
+    "photo1": "사진은 중요하지 않아",
+    "photo2": "포토스팟 위주로 알려줘"
+}
+
+async def rerank_with_llm(parsed_results, personality):
+    personality_query = "사용자의 성향: "
+    for key, value in personality.items():
+        personality_query += SEARCH_PERSONALITY_DICT[value] + " "
+
+    # Gemini API를 사용하여 정렬
+    prompt = (personality_query + "\n"
+              "장소 목록:\n" +
+              '\n'.join([f"{i+1}. 장소 이름: {place['title']}\n    별점: {place['rating']}\n    주소: {place['address']}\n    설명: {place['description']}\n    가격: {place.get('price', '없음')}\n" 
+                         for i, place in enumerate(parsed_results)]) + "\n"
+              "위 성향에 맞게 장소 목록을 재정렬해주세요. 해당 성향에 적합한 장소를 먼저 정렬해주세요 모든 장소를 사용해야하고 중복되지 않게 해주세요 이 장소 말고 다른 장소는 추가해서 안돼")
+    
+    response = await generateContent(prompt)
+    return applyLlmOrder(parsed_results, response)
+
+async def just_chat(query: str):
+    response = await chatCompletion(
 
         model="gpt-4o",
 
@@ -388,99 +421,122 @@ def savePlace(query, userId, tripId):
     except Exception as e:
         return "잠시 오류가 있었어요😭 다시 한번 말해주세요!"
 
-def savePlans(userId, tripId):
+async def savePlans(userId, tripId):
+    # 세션은 조회할 때만 짧게 사용하고 LLM 호출 동안에는 잡고 있지 않음
     session = sqldb.sessionmaker()
-    # 사용자 성향 데이터 가져오기
-    user_data = session.query(user).filter(user.userId == userId).first().personality
-    personality = json.loads(user_data)
-    
-    transport_preference = personality.get("transport", "")
-    schedule_preference = personality.get("schedule", "")
-
-    # 성향에 따른 설명 매핑
-    personality_dict = {
-        "transport1": "관광지들끼리 경도 위도가 가까운 곳으로 알려줘",
-        "transport2": "관광지들끼리 경도 위도가 좀 멀어도 괜찮아",
-        "schedule1": "여행 스케줄을 즐기면서 천천히 다니고 싶어",
-        "schedule2": "여행 스케줄 일정 알차게 돌아다니고 싶어"
-    }
-
-    # 사용자의 성향에 따른 query 구성
-    personality_query = f"사용자의 성향은 {personality_dict.get(transport_preference, '')}, {personality_dict.get(schedule_preference, '')}"
-    
-    mytrip = session.query(myTrips).filter(myTrips.tripId == tripId).first()
+    try:
+        # 사용자 성향 데이터 가져오기
+        user_data = session.query(user.personality).filter(user.userId == userId).first().personality
+        mytrip = session.query(myTrips.startDate, myTrips.endDate).filter(myTrips.tripId == tripId).first()
+    finally:
+        session.close()
+    personality = json.loads(user_data) if isinstance(user_data, str) else (user_data or {})
     startDate = mytrip.startDate
     endDate = mytrip.endDate
-    genai.configure(api_key=GEMINI_API_KEY)
+
     save_place_collection = db['SavePlace']
     document = save_place_collection.find_one({"userId": userId, "tripId": tripId})
     if not document:
         response = "아직 저장하신 장소들이 없어요🤔\n제가 추천해드리는 장소를 저장하시거나 가고 싶은 장소를 직접 입력해보세요!"
         return response
-    place_data = document['placeData']
-    place_data_str = json.dumps(place_data, ensure_ascii=False)
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    query = f"""
-    {startDate}부터 {endDate}까지 다음 장소들만 포함한 상세한 여행 일정을 만들어줘. {place_data_str} 데이터만을 모두 사용해서 모든 날짜에 관광지, 레스토랑, 카페가 균형있게 포함되게 짜주고 되도록 {personality_query} 니까 사용자의 성향에 맞춰서 짜줘. 같은 장소는 여러 일정을 만들지는 말아줘. 되도록 식사시간 그니까 12시, 6시는 식당이나 카페에 방문하게 해주고 
-    시간은 시작 시간만 HH:MM:SS 형태로 뽑아주고 날짜는 YYYY-MM-DD이렇게 뽑아줘 description 절대 생략하지 말고 다 넣어줘. title 은 장소에서 해야할 일을 알려주면 좋겠다 예를 들어 에펠탑 관광 이런식으로 뽑아줘.
 
-    일정에 들어가야하는 정보는 다음과 같은 포맷으로 만들어줘: title: [title], date: [YYYY-MM-DD], time: [HH:MM:SS], place: [place], address: [address], latitude: [latitude], longitude: [longitude], description: [description].의 json배열로 뽑아줘
-    date랑 time이 null이 아니라면 그 시간으로 일정을 짜줘. startDate 부터 endDate까지 스케줄이 있어야해 다른 장소는 일정 만들 때 사용하지마 절대 내가 넣은 데이터만 사용해야해
+    # 날짜/시간/동선은 로컬에서 계산하고 LLM은 일정 제목과 설명만 작성
+    datas = buildItinerary(document['placeData'], startDate, endDate, personality)
+    if not datas:
+        return "저장하신 장소들의 위치 정보가 없어서 일정을 만들지 못했어요🤔\n다른 장소를 저장해보세요!"
 
-    """
-    response = model.generate_content(query)
-    print(response.text)
-    cleaned_string = response.text.strip('```')
-    cleaned_string= cleaned_string.replace('json', '').strip()
-    
-    datas = json.loads(cleaned_string)
-    
+    # 메모는 장소 목록만 있으면 되므로 제목 생성과 동시에 시작
+    places = [data['place'] for data in datas]
+    memo_task = asyncio.ensure_future(openaiPlanMemo(places))
+    narrative_task = None
+    try:
+        titles = await planTitles(places)
+        for data, title in zip(datas, titles):
+            data['title'] = title[:255]
+
+        # 일정 설명은 일정 저장과 동시에 생성, 저장이 실패하면 메모/설명 LLM 호출은 필요 없으므로 취소
+        narrative_task = asyncio.ensure_future(planNarrative(datas))
+        await asyncio.to_thread(storePlans, userId, tripId, datas)
+    except BaseException:
+        for task in (memo_task, narrative_task):
+            if task is not None:
+                task.cancel()
+        raise
+
+    # 일정은 이미 저장됐으므로 메모/설명 생성이 실패해도 요청은 성공으로 처리
+    # 메모가 실패하면 기존 메모를 그대로 두고, 설명이 실패하면 저장한 일정 목록으로 대신 답변
+    ai_memo, response = await asyncio.gather(memo_task, narrative_task, return_exceptions=True)
+    if isinstance(ai_memo, Exception):
+        print(f"Plan memo failed: {ai_memo}")
+    else:
+        await asyncio.to_thread(updateTripMemo, tripId, ai_memo)
+    if isinstance(response, Exception):
+        print(f"Plan narrative failed: {response}")
+        response = planSummary(datas)
 
-    for data in datas:
-        new_trip = tripPlans(
-            planId= str(uuid.uuid4()),
-            userId= userId,
-            tripId= tripId,
-            title=data['title'],
-            date=data['date'],
-            time=data['time'],
-            place=data['place'],
-            address=data['address'],
-            latitude=data['latitude'],
-            longitude=data['longitude'],
-            description=data['description']
-        )
-        session.add(new_trip)
-    
-    session.commit()
+    return response
 
-    # 저장한 계획들로 ai가 계획 별 메모 만들어주
-    places = [data['place'] for data in datas]
-    ai_memo = openaiPlanMemo(places, GEMINI_API_KEY)
+def planSummary(datas):
+    lines = ["여행 일정을 저장했어요!"]
+    for data in datas:
+        lines.append(f"{data['date']} {str(data['time'])[:5]} {data['title']}")
+    return "\n".join(lines)
 
-    mytrip = session.query(myTrips).filter(myTrips.tripId == tripId).first()
-    mytrip.memo = ai_memo
-    session.commit()
+def storePlans(userId, tripId, datas):
+    session = sqldb.sessionmaker()
+    try:
+        bulkInsertPlans(session, userId, tripId, datas)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    db['SavePlace'].delete_one({"userId": userId, "tripId": tripId})
 
-    save_place_collection.delete_one({"userId": userId, "tripId": tripId})
-    session.close()
+def updateTripMemo(tripId, memo):
+    # 저장한 계획들로 ai가 만든 메모 반영
+    session = sqldb.sessionmaker()
+    try:
+        session.query(myTrips).filter(myTrips.tripId == tripId).update({"memo": memo})
+        session.commit()
+    finally:
+        session.close()
 
+async def planNarrative(datas):
+    schedule_str = json.dumps(datas, ensure_ascii=False)
     query = f"""
-    {cleaned_string}이걸 상세하게 설명해서 답변해줘 챗봇이 일정을 만들어준 것처럼 예를 들어 바르셀로나 여행 일정을 완성했어요! 1일차 - 이런식으로
+    {schedule_str}이걸 상세하게 설명해서 답변해줘 챗봇이 일정을 만들어준 것처럼 예를 들어 바르셀로나 여행 일정을 완성했어요! 1일차 - 이런식으로
     """
-    response = model.generate_content(query).text.replace('*', '')
+    return (await generateContent(query)).replace('*', '')
 
-    return response
+async def planTitles(places):
+    # 장소 목록 순서대로 "에펠탑 관광" 같은 일정 제목을 한 번에 받아옴, 응답이 이상하면 기본 제목 사용
+    fallback = [f"{place} 방문" for place in places]
+    query = f"""
+    다음 장소 목록 순서대로 각 장소에서 할 일을 짧은 일정 제목으로 만들어줘. 예를 들어 에펠탑 -> 에펠탑 관광 이런식으로.
+    다른 설명 없이 제목 문자열만 담은 json 배열로 장소 개수({len(places)}개)만큼 뽑아줘.
+    {json.dumps(places, ensure_ascii=False)}
+    """
+    try:
+        response = await generateContent(query)
+        cleaned_string = response.strip().strip('`').replace('json', '', 1).strip()
+        titles = json.loads(cleaned_string)
+    except Exception as e:
+        print(f"Error generating plan titles: {e}")
+        return fallback
+    if not isinstance(titles, list) or len(titles) != len(places):
+        return fallback
+    return [str(title).strip() or default for title, default in zip(titles, fallback)]
 
-def handle_update_trip_plan(query, userId, tripId):
+async def handle_update_trip_plan(query, userId, tripId):
     session = sqldb.sessionmaker()
     plans = session.query(tripPlans).filter_by(userId=userId, tripId=tripId).all()
     
     plan_texts = [f"{plan.title} {plan.date} {plan.time} {plan.place} {plan.address} {plan.description}" for plan in plans]
-    plan_embeddings = [get_embedding(text) for text in plan_texts]
-    
-    query_embedding = get_embedding(query)
-    similarities = [cosine_similarity([query_embedding], [embedding])[0][0] for embedding in plan_embeddings]
+    # 계획 문장들과 질문을 한 번의 요청으로 임베딩
+    *plan_embeddings, query_embedding = await get_embeddings(plan_texts + [query])
+    similarities = [cosine_similarity(query_embedding, embedding) for embedding in plan_embeddings]
     
     most_similar_index = similarities.index(max(similarities))
     most_similar_plan = plans[most_similar_index]
@@ -643,10 +699,12 @@ def search_place_details(query: str, userId: str, tripId: str, latitude: float,
         "api_key": SERP_API_KEY,
         "ll": ll_param
     }
+    from serpapi import GoogleSearch
     search = GoogleSearch(params)
-    data = search.get_dict()
+    search.BACKEND = providerUrl("serpapi")
+    with observeCall("serpapi", "google_maps"):
+        data = search.get_dict()
     
-    translator = GoogleTranslator(source='en', target='ko')
     result = data.get('place_results', {})
     
     # place_results가 비어 있을 경우 처리
@@ -663,7 +721,7 @@ def search_place_details(query: str, userId: str, tripId: str, latitude: float,
     latitude = gps_coordinates.get('latitude')
     longitude = gps_coordinates.get('longitude')
     description = result.get('description', 'No description available.')
-    translated_description = translator.translate(description)
+    translated_description = translate(description, 'en', 'ko')
     price = result.get('price', None)
 
     if not address or not latitude or not longitude:
@@ -692,7 +750,8 @@ def search_place_details(query: str, userId: str, tripId: str, latitude: float,
     document = {
         "userId": userId,
         "tripId": tripId,
-        "data": place_data
+        "data": place_data,
+        "updatedAt": datetime.datetime.now(datetime.timezone.utc)
     }
 
     serp_collection.update_one(
@@ -0,0 +1,119 @@
+import numpy as np
+from database import get_config
+
+# 좌표 계산 공통 함수 (NumPy 브로드캐스팅으로 한 번에 계산, 단위 km)
+EARTH_RADIUS_KM = 6371.0
+# 하루 일정이 이 개수나 이동 거리(km)를 넘으면 과밀한 날로 표시
+MAX_PLANS_PER_DAY = get_config("MAX_PLANS_PER_DAY", 8)
+MAX_KM_PER_DAY = get_config("MAX_KM_PER_DAY", 30.0)
+
+def haversine(latitudes, longitudes, latitude, longitude):
+    lat1, lon1 = np.radians(latitudes), np.radians(longitudes)
+    lat2, lon2 = np.radians(latitude), np.radians(longitude)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+def distanceMatrix(coords, others=None):
+    # coords(n, 2)와 others(m, 2) 사이 거리 행렬 (n, m), others가 없으면 coords끼리
+    coords = np.asarray(coords, dtype=float)
+    others = coords if others is None else np.asarray(others, dtype=float)
+    return haversine(coords[:, None, 0], coords[:, None, 1], others[None, :, 0], others[None, :, 1])
+
+def legDistances(coords):
+    # 연속한 두 지점 사이 거리, 길이 n-1
+    coords = np.asarray(coords, dtype=float)
+    if len(coords) < 2:
+        return np.zeros(0)
+    return haversine(coords[:-1, 0], coords[:-1, 1], coords[1:, 0], coords[1:, 1])
+
+def dailyRouteStats(plans):
+    # plans: date, time, planId, place, latitude, longitude 를 가진 행 목록
+    # 날짜/시간 순으로 정렬한 뒤 전체 구간 거리를 한 번에 계산하고 날짜 경계 구간만 제외
+    plans = sorted(plans, key=lambda plan: (str(plan["date"]), str(plan["time"])))
+    if not plans:
+        return []
+    coords = np.array([[plan["latitude"], plan["longitude"]] for plan in plans], dtype=float)
+    dates = np.array([str(plan["date"]) for plan in plans])
+    legs = legDistances(coords)
+    same_day = dates[:-1] == dates[1:]
+
+    starts = np.flatnonzero(np.r_[True, ~same_day])
+    ends = np.r_[starts[1:], len(plans)]
+    # 날짜별 합계도 reduceat으로 한 번에, 반올림도 배열 단위로 처리
+    totals = np.add.reduceat(np.r_[np.where(same_day, legs, 0.0), 0.0], starts)
+    legs_km = np.round(legs, 3).tolist()
+    days = []
+    for start, end, total in zip(starts.tolist(), ends.tolist(), totals.tolist()):
+        count = end - start
+        days.append({
+            "date": str(plans[start]["date"]),
+            "planCount": count,
+            "totalKm": round(total, 3),
+            "legs": [
+                {
+                    "fromPlanId": plans[i]["planId"],
+                    "toPlanId": plans[i + 1]["planId"],
+                    "fromPlace": plans[i]["place"],
+                    "toPlace": plans[i + 1]["place"],
+                    "km": legs_km[i]
+                }
+                for i in range(start, end - 1)
+            ],
+            "overPacked": count > MAX_PLANS_PER_DAY or total > MAX_KM_PER_DAY
+        })
+    return days
+
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def geohashEncode(latitude, longitude, precision=8):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    code = []
+    bits = 0
+    value = 0
+    even = True
+    while len(code) < precision:
+        # 경도, 위도 순서로 번갈아 가며 범위를 반으로 나눔
+        target, span = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (span[0] + span[1]) / 2
+        if target >= middle:
+            value = value * 2 + 1
+            span[0] = middle
+        else:
+            value = value * 2
+            span[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            code.append(GEOHASH_BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(code)
+
+def geohashCellSize(precision):
+    # (위도 높이, 경도 너비) 단위 도
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+def geohashCover(latitude, longitude, radius_km, max_precision=8):
+    # 반경 원을 감싸는 사각형과 겹치는 geohash 접두사 목록, 셀 크기는 반경 이상인 가장 작은 셀
+    # 경도 폭은 적도에서 가장 먼 사각형 가장자리(경도 1도가 가장 짧은 곳) 기준
+    dlat = np.degrees(radius_km / EARTH_RADIUS_KM)
+    edge_latitude = min(abs(latitude) + dlat, 90.0)
+    dlon = min(dlat / max(np.cos(np.radians(edge_latitude)), 1e-6), 180.0)
+    precision = 1
+    for candidate in range(max_precision, 0, -1):
+        height, width = geohashCellSize(candidate)
+        if height >= dlat and width >= dlon:
+            precision = candidate
+            break
+    height, width = geohashCellSize(precision)
+
+    lat_min, lat_max = max(latitude - dlat, -90.0), min(latitude + dlat, 90.0 - 1e-9)
+    lats = list(np.arange(lat_min, lat_max, height)) + [lat_max]
+    lons = list(np.arange(longitude - dlon, longitude + dlon, width)) + [longitude + dlon]
+    cells = set()
+    for lat in lats:
+        for lon in lons:
+            cells.add(geohashEncode(lat, (lon + 180.0) % 360.0 - 180.0, precision))
+    return sorted(cells)
@@ -0,0 +1,98 @@
+import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+import httpx
+from database import get_config
+
+# 외부 API 호출용 공용 HTTP 클라이언트 설정
+HTTP_MAX_CONNECTIONS = get_config("HTTP_MAX_CONNECTIONS", 100)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = get_config("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+HTTP_KEEPALIVE_EXPIRY = get_config("HTTP_KEEPALIVE_EXPIRY", 30)
+HTTP_PER_HOST_LIMIT = get_config("HTTP_PER_HOST_LIMIT", 20)
+HTTP_CONNECT_TIMEOUT = get_config("HTTP_CONNECT_TIMEOUT", 5)
+HTTP_TIMEOUT = get_config("HTTP_TIMEOUT", 30)
+
+_client = None
+_host_limits = {}
+
+class DownloadTooLarge(Exception):
+    pass
+
+def createHttpClient():
+    return httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+    )
+
+async def startHttpClient():
+    global _client
+    if _client is None:
+        _client = createHttpClient()
+
+async def closeHttpClient():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _host_limits.clear()
+
+def getHttpClient():
+    # lifespan 밖(스크립트 등)에서 호출되면 그때 생성
+    global _client
+    if _client is None:
+        _client = createHttpClient()
+    return _client
+
+def _hostLimit(url):
+    host = urlsplit(str(url)).netloc
+    limit = _host_limits.get(host)
+    if limit is None:
+        limit = _host_limits[host] = asyncio.Semaphore(HTTP_PER_HOST_LIMIT)
+    return limit
+
+async def request(method, url, **kwargs):
+    # 호스트별 동시 요청 수를 제한한 뒤 공용 커넥션 풀로 전송
+    async with _hostLimit(url):
+        return await getHttpClient().request(method, url, **kwargs)
+
+@asynccontextmanager
+async def stream(method, url, **kwargs):
+    async with _hostLimit(url):
+        async with getHttpClient().stream(method, url, **kwargs) as response:
+            yield response
+
+async def download(url, max_bytes, **kwargs):
+    # 응답 본문을 스트리밍으로 받아 하나의 버퍼에 바로 채움, max_bytes를 넘으면 중단
+    async with stream("GET", url, **kwargs) as response:
+        response.raise_for_status()
+        length = response.headers.get("content-length")
+        if length is not None and int(length) > max_bytes:
+            raise DownloadTooLarge(f"{url} is {length} bytes (limit {max_bytes})")
+
+        # 압축되지 않은 응답은 content-length 크기로 미리 할당해 재할당 없이 채움
+        if length is not None and response.headers.get("content-encoding", "identity") == "identity":
+            buffer = bytearray(int(length))
+            view = memoryview(buffer)
+            received = 0
+            async for chunk in response.aiter_bytes():
+                end = received + len(chunk)
+                if end > len(buffer):
+                    raise DownloadTooLarge(f"{url} sent more than its content-length")
+                view[received:end] = chunk
+                received = end
+            view.release()
+            del buffer[received:]
+            return buffer
+
+        buffer = bytearray()
+        async for chunk in response.aiter_bytes():
+            buffer += chunk
+            if len(buffer) > max_bytes:
+                raise DownloadTooLarge(f"{url} exceeded {max_bytes} bytes")
+        return buffer
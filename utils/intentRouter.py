@@ -0,0 +1,175 @@
+import asyncio
+import datetime
+import logging
+import os
+import random
+import re
+import threading
+from database import db, get_config, BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+# GPT-4o function calling 전에 로컬에서 의도를 먼저 분류
+# 확신도가 높고 인자 재작성이 필요 없는 의도만 바로 실행하고, 나머지는 LLM 라우터로 넘김
+INTENTS = ["search_places", "search_place_details", "just_chat", "save_place", "save_plan", "update_trip_plan"]
+DIRECT_INTENTS = {"save_place", "save_plan", "update_trip_plan"}
+
+INTENT_MODEL_PATH = get_config("INTENT_MODEL_PATH", os.path.join(BASE_DIR, "intentModel.joblib"))
+INTENT_CONFIDENCE = get_config("INTENT_CONFIDENCE", 0.9)
+# 로컬에서 바로 처리한 메시지 중 일부는 LLM 라우터에도 보내서 일치율 측정
+INTENT_SHADOW_RATE = get_config("INTENT_SHADOW_RATE", 0.1)
+
+IntentLog_collection = db['IntentLog']
+
+UPDATE_WORDS = r"(수정|변경|바꿔|바꾸|옮겨|미뤄|당겨)"
+RULES = [
+    ("update_trip_plan", re.compile(r"(일정|시간|날짜|계획).*" + UPDATE_WORDS)),
+    ("save_place", re.compile(r"^\s*(\d+\s*번?\s*[,.와과랑및]?\s*)+(저장|추가|담아|갈래|넣어)")),
+    ("save_place", re.compile(r"^\s*(이거|이곳|여기|거기)?\s*(저장|추가)\s*(할게|해줘|해 줘|해주세요|하기)?\s*[.!]?\s*$")),
+    ("save_plan", re.compile(r"^\s*(여행\s*)?(최종\s*)?(일정|계획|플랜)\s*(을|를)?\s*(만들어|짜|완성해)")),
+]
+
+_model = None
+_model_mtime = None
+_stats = {"direct": 0, "compared": 0, "agreed": 0}
+# IntentLog 기록은 요청 처리 중에 기다리지 않도록 모아 두었다가 백그라운드에서 insert_many
+_pending_logs = []
+_pending_lock = threading.Lock()
+_flush_task = None
+
+def matchRule(message):
+    for intent, pattern in RULES:
+        if intent != "update_trip_plan" and re.search(UPDATE_WORDS, message):
+            continue
+        if pattern.search(message):
+            return intent
+    return None
+
+def loadModel():
+    # 학습된 모델 파일이 바뀌면 다시 읽음, 파일이 없으면 규칙만 사용
+    global _model, _model_mtime
+    if not os.path.exists(INTENT_MODEL_PATH):
+        return None
+    mtime = os.path.getmtime(INTENT_MODEL_PATH)
+    if _model is None or mtime != _model_mtime:
+        import joblib
+        _model = joblib.load(INTENT_MODEL_PATH)
+        _model_mtime = mtime
+    return _model
+
+def classifyIntent(message):
+    # (의도, 확신도, 출처) 반환
+    intent = matchRule(message)
+    if intent:
+        return intent, 1.0, "rule"
+
+    model = loadModel()
+    if model is None:
+        return None, 0.0, "none"
+    probabilities = model.predict_proba([message])[0]
+    best = probabilities.argmax()
+    return model.classes_[best], float(probabilities[best]), "model"
+
+def isDirectIntent(intent, confidence):
+    return intent in DIRECT_INTENTS and confidence >= INTENT_CONFIDENCE
+
+def shouldShadow():
+    return random.random() < INTENT_SHADOW_RATE
+
+def recordIntent(message, intent, confidence, source, llm_intent=None, direct=False):
+    if direct:
+        _stats["direct"] += 1
+    if intent is not None and llm_intent is not None:
+        _stats["compared"] += 1
+        _stats["agreed"] += int(intent == llm_intent)
+
+    agreement = _stats["agreed"] / _stats["compared"] if _stats["compared"] else None
+    logger.info(
+        "intent local=%s confidence=%.2f source=%s llm=%s direct=%s agreement=%s",
+        intent, confidence, source, llm_intent, direct,
+        f"{agreement:.2%}" if agreement is not None else "n/a"
+    )
+    with _pending_lock:
+        _pending_logs.append({
+            "message": message,
+            "localIntent": intent,
+            "confidence": confidence,
+            "source": source,
+            "llmIntent": llm_intent,
+            "direct": direct,
+            "timestamp": datetime.datetime.now()
+        })
+    scheduleIntentLogFlush()
+
+def scheduleIntentLogFlush():
+    global _flush_task
+    if _flush_task is not None and not _flush_task.done():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # 이벤트 루프 밖(스크립트)에서는 바로 기록
+        writeIntentLogs()
+        return
+    _flush_task = loop.create_task(flushIntentLogs())
+
+def writeIntentLogs():
+    with _pending_lock:
+        batch = _pending_logs[:]
+        del _pending_logs[:]
+    if not batch:
+        return
+    try:
+        IntentLog_collection.insert_many(batch)
+    except Exception:
+        logger.exception("failed to write %d intent logs", len(batch))
+
+async def flushIntentLogs():
+    # 기록하는 동안 새로 쌓인 로그도 이어서 기록
+    while _pending_logs:
+        await asyncio.to_thread(writeIntentLogs)
+
+def intentStats():
+    stats = dict(_stats)
+    stats["agreement"] = stats["agreed"] / stats["compared"] if stats["compared"] else None
+    return stats
+
+def labelBotReply(reply):
+    # 기록된 챗봇 답변 형태로 사용자 메시지의 의도를 추정 (학습 데이터용)
+    message = reply.get("message") or ""
+    if reply.get("isSerp"):
+        return "search_place_details" if "입력하신 장소가 맞나요" in message else "search_places"
+    if "저장되었습니다" in message:
+        return "save_place"
+    if "이대로 수정하시겠습니까" in message:
+        return "update_trip_plan"
+    if "일정" in message and "일차" in message:
+        return "save_plan"
+    return "just_chat"
+
+def collectTrainingData():
+    samples = []
+    # LLM 라우터가 결정한 의도 기록
+    for log in IntentLog_collection.find({"llmIntent": {"$in": INTENTS}}, {"message": 1, "llmIntent": 1}):
+        samples.append((log["message"], log["llmIntent"]))
+    # 채팅 로그의 (사용자 메시지, 챗봇 답변) 쌍
+    for bucket in db['ChatBucket'].find({}, {"messages": 1}):
+        messages = bucket.get("messages", [])
+        for question, reply in zip(messages, messages[1:]):
+            if question.get("sender") != "bot" and reply.get("sender") == "bot" and question.get("message"):
+                samples.append((question["message"], labelBotReply(reply)))
+    return samples
+
+def trainIntentModel(samples):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+
+    messages = [message for message, _ in samples]
+    labels = [label for _, label in samples]
+    model = make_pipeline(
+        TfidfVectorizer(analyzer="char_wb", ngram_range=(1, 3), sublinear_tf=True),
+        LogisticRegression(max_iter=1000, class_weight="balanced")
+    )
+    model.fit(messages, labels)
+    return model
@@ -0,0 +1,225 @@
+import datetime
+import math
+import re
+import numpy as np
+from utils.geo import haversine, distanceMatrix
+
+# 저장한 장소(SavePlace.placeData)로 날짜별 일정을 로컬에서 계산
+# 1) 좌표 기준으로 여행 일수만큼 묶고 2) 하루 동선을 최근접 이웃 + 2-opt로 정하고
+# 3) 식당/카페는 12:00, 18:00 식사 시간에 배치
+MEAL_KEYWORDS = re.compile(
+    r"restaurant|cafe|café|coffee|bistro|bakery|dining|brunch|food|eatery|tapas|ramen|sushi|pizza|"
+    r"식당|레스토랑|카페|맛집|음식|커피|베이커리|브런치|빵집|요리",
+    re.IGNORECASE
+)
+MEAL_TIMES = ["12:00", "18:00"]
+MEAL_MINUTES = 90
+DAY_END = "22:00"
+MIN_GAP_MINUTES = 30
+
+# 성향별 하루 시작 시간과 관광지 사이 간격(분)
+SCHEDULE_SETTINGS = {
+    "schedule1": {"start": "10:00", "gap": 150},
+    "schedule2": {"start": "09:00", "gap": 90},
+}
+DEFAULT_SCHEDULE = {"start": "09:30", "gap": 120}
+
+def toMinutes(value):
+    hour, minute = str(value).split(":")[:2]
+    return int(hour) * 60 + int(minute)
+
+def toTime(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+
+def dateRange(startDate, endDate):
+    start = datetime.date.fromisoformat(str(startDate)[:10])
+    end = datetime.date.fromisoformat(str(endDate)[:10])
+    return [(start + datetime.timedelta(days=offset)).isoformat() for offset in range((end - start).days + 1)]
+
+def isMeal(place):
+    return bool(MEAL_KEYWORDS.search(f"{place.get('title') or ''} {place.get('description') or ''}"))
+
+def clusterDays(coords, days, fixed, balanced):
+    # 용량 제한 k-means: fixed[i]가 있으면 그 날짜에 고정, 나머지는 가까운 날짜 묶음에 배정
+    count = len(coords)
+    capacity = math.ceil(count / days) + (0 if balanced else 2)
+    centers = np.zeros((days, 2))
+    seeded = np.zeros(days, dtype=bool)
+    for day in range(days):
+        members = [i for i in range(count) if fixed[i] == day]
+        if members:
+            centers[day] = coords[members].mean(axis=0)
+            seeded[day] = True
+
+    # 고정 장소가 없는 날은 기존 중심에서 가장 먼 장소를 중심으로 시작
+    free = [i for i in range(count) if fixed[i] is None]
+    for day in range(days):
+        if seeded[day] or not free:
+            continue
+        if seeded.any():
+            gaps = distanceMatrix(coords[free], centers[seeded]).min(axis=1)
+            pick = free[int(gaps.argmax())]
+        else:
+            pick = free[0]
+        centers[day] = coords[pick]
+        seeded[day] = True
+
+    assignment = None
+    for _ in range(20):
+        new_assignment = np.full(count, -1)
+        load = np.zeros(days, dtype=int)
+        for i in range(count):
+            if fixed[i] is not None:
+                new_assignment[i] = fixed[i]
+                load[fixed[i]] += 1
+
+        # 가장 가까운 (장소, 날짜) 쌍부터 하루 용량이 남아 있으면 배정
+        distances = distanceMatrix(coords, centers)
+        for flat in np.argsort(distances, axis=None, kind="stable"):
+            i, day = divmod(int(flat), days)
+            if new_assignment[i] != -1 or load[day] >= capacity:
+                continue
+            new_assignment[i] = day
+            load[day] += 1
+        for i in np.flatnonzero(new_assignment == -1):
+            new_assignment[i] = int(distances[i].argmin())
+
+        for day in range(days):
+            members = new_assignment == day
+            if members.any():
+                centers[day] = coords[members].mean(axis=0)
+        if assignment is not None and np.array_equal(new_assignment, assignment):
+            break
+        assignment = new_assignment
+    return assignment
+
+def routeOrder(coords):
+    # 열린 경로: 중심에서 가장 먼 장소에서 시작해 최근접 이웃으로 잇고 2-opt로 교차 제거
+    count = len(coords)
+    if count <= 2:
+        return list(range(count))
+    dist = distanceMatrix(coords)
+    centroid = coords.mean(axis=0)
+    start = int(haversine(coords[:, 0], coords[:, 1], centroid[0], centroid[1]).argmax())
+
+    route = [start]
+    visited = np.zeros(count, dtype=bool)
+    visited[start] = True
+    for _ in range(count - 1):
+        candidates = np.where(visited, np.inf, dist[route[-1]])
+        nearest = int(candidates.argmin())
+        route.append(nearest)
+        visited[nearest] = True
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, count - 1):
+            for j in range(i + 1, count):
+                before = dist[route[i - 1], route[i]] + (dist[route[j], route[j + 1]] if j + 1 < count else 0)
+                after = dist[route[i - 1], route[j]] + (dist[route[i], route[j + 1]] if j + 1 < count else 0)
+                if after < before - 1e-9:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+    return route
+
+def daySlots(setting, sight_count, taken):
+    # 식사 시간을 피해서 관광지 시작 시간 목록 생성, 장소가 많으면 간격을 줄임
+    gap = setting["gap"]
+    while True:
+        slots = []
+        current = toMinutes(setting["start"])
+        while current < toMinutes(DAY_END):
+            meal = next((toMinutes(t) for t in MEAL_TIMES if toMinutes(t) - gap < current < toMinutes(t) + MEAL_MINUTES), None)
+            if meal is not None and current < meal + MEAL_MINUTES:
+                current = meal + MEAL_MINUTES
+                continue
+            if all(abs(current - minute) >= MIN_GAP_MINUTES for minute in taken):
+                slots.append(current)
+            current += gap
+        if len(slots) >= sight_count or gap <= MIN_GAP_MINUTES:
+            return slots
+        gap = max(MIN_GAP_MINUTES, int(gap * 0.75))
+
+def scheduleDay(date, places, setting):
+    entries = []
+    taken = []
+    free = []
+    for place in places:
+        if place.get("time"):
+            entries.append((toMinutes(place["time"]), place))
+            taken.append(toMinutes(place["time"]))
+        else:
+            free.append(place)
+
+    meals = [place for place in free if isMeal(place)]
+    sights = [place for place in free if not isMeal(place)]
+    # 식사 시간보다 식당/카페가 많으면 나머지는 관광지처럼 배치
+    meal_times = [toMinutes(t) for t in MEAL_TIMES if all(abs(toMinutes(t) - minute) >= MIN_GAP_MINUTES for minute in taken)]
+    sights += meals[len(meal_times):]
+    meals = meals[:len(meal_times)]
+
+    if sights:
+        coords = np.array([[place["latitude"], place["longitude"]] for place in sights], dtype=float)
+        sights = [sights[i] for i in routeOrder(coords)]
+    slots = daySlots(setting, len(sights), taken + meal_times[:len(meals)])
+    for index, place in enumerate(sights):
+        if index < len(slots):
+            minute = slots[index]
+        elif slots:
+            minute = slots[-1] + (index - len(slots) + 1) * MIN_GAP_MINUTES
+        else:
+            # 고정 일정이 하루를 다 채워서 빈 시간이 없으면 하루 시작 시간부터 배치
+            minute = toMinutes(setting["start"]) + index * MIN_GAP_MINUTES
+        entries.append((minute, place))
+
+    # 식사 장소는 식사 직전 일정과 가장 가까운 곳부터 배정
+    for meal_time in meal_times[:len(meals)]:
+        anchor = max(((minute, place) for minute, place in entries if minute < meal_time), key=lambda entry: entry[0], default=None)
+        if anchor is not None:
+            meal_index = int(np.argmin([haversine(m["latitude"], m["longitude"], anchor[1]["latitude"], anchor[1]["longitude"]) for m in meals]))
+        else:
+            meal_index = 0
+        entries.append((meal_time, meals.pop(meal_index)))
+
+    entries.sort(key=lambda entry: entry[0])
+    return [planEntry(date, minute, place) for minute, place in entries]
+
+def planEntry(date, minute, place):
+    return {
+        "title": place.get("title") or "",
+        "date": date,
+        "time": toTime(minute) if minute < 24 * 60 else "23:59:00",
+        "place": (place.get("title") or "")[:255],
+        "address": (place.get("address") or "")[:255],
+        "latitude": place["latitude"],
+        "longitude": place["longitude"],
+        "description": (place.get("description") or "")[:255]
+    }
+
+def buildItinerary(place_data, startDate, endDate, personality=None):
+    personality = personality if isinstance(personality, dict) else {}
+    dates = dateRange(startDate, endDate)
+    # 같은 장소는 한 번만, 좌표가 없는 장소는 제외
+    places = []
+    seen = set()
+    for item in place_data:
+        for place in (item if isinstance(item, list) else [item]):
+            key = (place.get("title"), place.get("address"))
+            if key in seen or place.get("latitude") is None or place.get("longitude") is None:
+                continue
+            seen.add(key)
+            places.append(place)
+    if not places or not dates:
+        return []
+
+    fixed = [dates.index(str(place["date"])[:10]) if place.get("date") and str(place["date"])[:10] in dates else None for place in places]
+    coords = np.array([[place["latitude"], place["longitude"]] for place in places], dtype=float)
+    assignment = clusterDays(coords, len(dates), fixed, balanced=personality.get("transport") == "transport2")
+
+    setting = SCHEDULE_SETTINGS.get(personality.get("schedule"), DEFAULT_SCHEDULE)
+    schedule = []
+    for day, date in enumerate(dates):
+        day_places = [place for place, assigned in zip(places, assignment) if assigned == day]
+        schedule.extend(scheduleDay(date, day_places, setting))
+    return schedule
@@ -0,0 +1,57 @@
+import asyncio
+import datetime
+import hashlib
+import re
+import unicodedata
+from cachetools import TTLCache
+from database import db, get_config
+from utils.llmGateway import generateContent, DEFAULT_GEMINI_MODEL
+
+# 같은 프롬프트(정규화 기준)와 모델의 결과를 메모리 -> MongoDB 순서로 재사용
+LLM_CACHE_TTL_SECONDS = get_config("LLM_CACHE_TTL_SECONDS", 60 * 60 * 24 * 7)
+LLM_CACHE_MAX_ENTRIES = get_config("LLM_CACHE_MAX_ENTRIES", 2048)
+
+LLMCache_collection = db['LLMCache']
+
+_memory_cache = TTLCache(maxsize=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL_SECONDS)
+_inflight = {}
+
+def normalizePrompt(prompt):
+    prompt = unicodedata.normalize("NFC", prompt)
+    return re.sub(r"\s+", " ", prompt).strip().casefold()
+
+def promptFingerprint(prompt, model):
+    return hashlib.sha256(f"{model}\n{normalizePrompt(prompt)}".encode("utf-8")).hexdigest()
+
+async def cachedGenerateContent(prompt, model=DEFAULT_GEMINI_MODEL):
+    key = promptFingerprint(prompt, model)
+
+    cached = _memory_cache.get(key)
+    if cached is not None:
+        return cached
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    document = LLMCache_collection.find_one({"_id": key, "expiresAt": {"$gt": now}})
+    if document:
+        _memory_cache[key] = document["response"]
+        return document["response"]
+
+    # 같은 프롬프트가 동시에 들어오면 한 번만 호출하고 결과를 공유
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.ensure_future(generateContent(prompt, model))
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    result = await asyncio.shield(task)
+
+    if key not in _memory_cache:
+        _memory_cache[key] = result
+        LLMCache_collection.update_one(
+            {"_id": key},
+            {"$set": {
+                "model": model,
+                "response": result,
+                "expiresAt": now + datetime.timedelta(seconds=LLM_CACHE_TTL_SECONDS)
+            }},
+            upsert=True
+        )
+    return result
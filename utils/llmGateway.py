@@ -0,0 +1,150 @@
+import asyncio
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+from database import get_config, OPENAI_API_KEY, GEMINI_API_KEY
+from utils.metrics import observeCall
+from utils.providers import providerUrl
+
+# 모든 OpenAI / Gemini 호출은 이 모듈을 거쳐서 실행
+# 공급자별 동시 호출 수 제한, 호출 제한 시간, 일시적 오류 재시도를 한 곳에서 처리
+# openai, google.generativeai SDK는 import가 무거워서 첫 호출 때 불러옴
+LLM_CONCURRENCY = {
+    "openai": get_config("OPENAI_CONCURRENCY", 8),
+    "gemini": get_config("GEMINI_CONCURRENCY", 8),
+}
+LLM_TIMEOUT = {
+    "openai": get_config("OPENAI_TIMEOUT", 60),
+    "gemini": get_config("GEMINI_TIMEOUT", 60),
+}
+LLM_RETRY_ATTEMPTS = get_config("LLM_RETRY_ATTEMPTS", 3)
+LLM_RETRY_MAX_WAIT = get_config("LLM_RETRY_MAX_WAIT", 10)
+
+DEFAULT_CHAT_MODEL = "gpt-4o"
+DEFAULT_EMBEDDING_MODEL = "text-embedding-ada-002"
+DEFAULT_GEMINI_MODEL = "gemini-1.5-flash"
+
+_sdk = {}
+_limits = {}
+_gemini_models = {}
+_openai_session = None
+
+def _openai():
+    openai = _sdk.get("openai")
+    if openai is None:
+        import openai
+        openai.api_key = OPENAI_API_KEY
+        openai.api_base = providerUrl("openai")
+        _sdk["openai"] = openai
+    return openai
+
+def _genai():
+    genai = _sdk.get("genai")
+    if genai is None:
+        import google.generativeai as genai
+        endpoint = providerUrl("gemini")
+        if endpoint:
+            # 주소를 바꾼 경우(가짜 서버 등)는 REST로 호출
+            genai.configure(api_key=GEMINI_API_KEY, transport="rest", client_options={"api_endpoint": endpoint})
+        else:
+            genai.configure(api_key=GEMINI_API_KEY)
+        _sdk["genai"] = genai
+    return genai
+
+def transientErrors():
+    # 재시도할 일시적 오류 목록, SDK를 불러온 뒤에 구성
+    errors = _sdk.get("transient_errors")
+    if errors is None:
+        import aiohttp
+        from google.api_core import exceptions as google_exceptions
+        openai = _openai()
+        errors = _sdk["transient_errors"] = (
+            asyncio.TimeoutError,
+            aiohttp.ClientConnectionError,
+            openai.error.Timeout,
+            openai.error.APIError,
+            openai.error.APIConnectionError,
+            openai.error.RateLimitError,
+            openai.error.ServiceUnavailableError,
+            openai.error.TryAgain,
+            google_exceptions.ResourceExhausted,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.DeadlineExceeded,
+            google_exceptions.InternalServerError,
+        )
+    return errors
+
+def _limit(provider):
+    limit = _limits.get(provider)
+    if limit is None:
+        limit = _limits[provider] = asyncio.Semaphore(LLM_CONCURRENCY[provider])
+    return limit
+
+def _openaiSession():
+    # openai 비동기 호출이 요청마다 새 aiohttp 세션을 만들지 않도록 공용 세션 사용
+    global _openai_session
+    if _openai_session is None or _openai_session.closed:
+        import aiohttp
+        _openai_session = aiohttp.ClientSession()
+    _openai().aiosession.set(_openai_session)
+
+def getGeminiModel(model):
+    gemini_model = _gemini_models.get(model)
+    if gemini_model is None:
+        gemini_model = _gemini_models[model] = _genai().GenerativeModel(model)
+    return gemini_model
+
+async def _call(provider, operation, factory):
+    # 지연 시간은 재시도와 대기를 포함한 전체 호출 기준으로 기록
+    with observeCall(provider, operation):
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception_type(transientErrors()),
+            stop=stop_after_attempt(LLM_RETRY_ATTEMPTS),
+            wait=wait_exponential_jitter(initial=1, max=LLM_RETRY_MAX_WAIT),
+            reraise=True,
+        ):
+            with attempt:
+                async with _limit(provider):
+                    return await asyncio.wait_for(factory(), LLM_TIMEOUT[provider])
+
+async def chatCompletion(**kwargs):
+    kwargs.setdefault("model", DEFAULT_CHAT_MODEL)
+
+    async def factory():
+        _openaiSession()
+        return await _openai().ChatCompletion.acreate(**kwargs)
+
+    return await _call("openai", "chat", factory)
+
+async def createEmbeddings(texts, model=DEFAULT_EMBEDDING_MODEL):
+    # 여러 문장을 한 번의 요청으로 임베딩
+    async def factory():
+        _openaiSession()
+        return await _openai().Embedding.acreate(input=texts, model=model)
+
+    response = await _call("openai", "embeddings", factory)
+    return [item['embedding'] for item in sorted(response['data'], key=lambda item: item['index'])]
+
+async def createImage(**kwargs):
+    async def factory():
+        _openaiSession()
+        return await _openai().Image.acreate(**kwargs)
+
+    return await _call("openai", "image", factory)
+
+async def generateContent(prompt, model=DEFAULT_GEMINI_MODEL):
+    gemini_model = getGeminiModel(model)
+
+    async def factory():
+        # REST 전송은 비동기 호출도 내부에서 동기로 실행되므로 이벤트 루프를 막지 않게 스레드에서 호출
+        if providerUrl("gemini"):
+            return await asyncio.to_thread(gemini_model.generate_content, prompt)
+        return await gemini_model.generate_content_async(prompt)
+
+    response = await _call("gemini", "generate", factory)
+    return response.text
+
+async def closeLlmGateway():
+    global _openai_session
+    if _openai_session is not None:
+        await _openai_session.close()
+        _openai_session = None
+    _limits.clear()
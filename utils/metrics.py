@@ -0,0 +1,122 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from prometheus_client import CollectorRegistry, Counter, Histogram, CONTENT_TYPE_LATEST, generate_latest, REGISTRY
+from pymongo import monitoring
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Prometheus 지표: 라우트 지연/상태 코드, 요청별 DB 쿼리 수/시간, Mongo 명령 지연, 외부 API(공급자별) 지연/오류
+# gunicorn 여러 워커에서는 PROMETHEUS_MULTIPROC_DIR 환경 변수를 지정하면 워커 지표를 합쳐서 노출
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests", ["method", "route", "status"])
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency", ["method", "route"], buckets=LATENCY_BUCKETS)
+
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed", ["route"])
+DB_QUERY_LATENCY = Histogram("db_query_duration_seconds", "SQL statement latency", buckets=LATENCY_BUCKETS)
+DB_QUERIES_PER_REQUEST = Histogram("db_queries_per_request", "SQL statements per HTTP request", ["route"], buckets=QUERY_COUNT_BUCKETS)
+DB_TIME_PER_REQUEST = Histogram("db_time_per_request_seconds", "SQL time per HTTP request", ["route"], buckets=LATENCY_BUCKETS)
+
+MONGO_LATENCY = Histogram("mongo_command_duration_seconds", "MongoDB command latency", ["command"], buckets=LATENCY_BUCKETS)
+MONGO_FAILURES = Counter("mongo_command_failures_total", "MongoDB command failures", ["command"])
+MONGO_TIME_PER_REQUEST = Histogram("mongo_time_per_request_seconds", "MongoDB time per HTTP request", ["route"], buckets=LATENCY_BUCKETS)
+
+EXTERNAL_LATENCY = Histogram("external_call_duration_seconds", "External provider call latency", ["provider", "operation"], buckets=LATENCY_BUCKETS)
+EXTERNAL_ERRORS = Counter("external_call_errors_total", "External provider call errors", ["provider", "operation"])
+
+# 현재 요청의 DB/Mongo 사용량 (asyncio.to_thread로 넘어간 작업도 같은 dict를 공유)
+_request_usage = ContextVar("request_usage", default=None)
+
+@contextmanager
+def observeCall(provider, operation):
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        EXTERNAL_ERRORS.labels(provider, operation).inc()
+        raise
+    finally:
+        EXTERNAL_LATENCY.labels(provider, operation).observe(time.perf_counter() - start)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _beforeCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _afterCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_QUERY_LATENCY.observe(elapsed)
+    usage = _request_usage.get()
+    if usage is not None:
+        usage["db_queries"] += 1
+        usage["db_seconds"] += elapsed
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._observe(event)
+
+    def failed(self, event):
+        MONGO_FAILURES.labels(event.command_name).inc()
+        self._observe(event)
+
+    def _observe(self, event):
+        elapsed = event.duration_micros / 1e6
+        MONGO_LATENCY.labels(event.command_name).observe(elapsed)
+        usage = _request_usage.get()
+        if usage is not None:
+            usage["mongo_seconds"] += elapsed
+
+# MongoClient 생성 전에 등록해야 적용됨 (database.getMongoClient는 처음 사용할 때 생성)
+monitoring.register(MongoCommandMetrics())
+
+def routeName(scope):
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    # 순수 ASGI 미들웨어: 스트리밍(SSE) 응답도 그대로 통과, WebSocket은 측정하지 않음
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        usage = {"db_queries": 0, "db_seconds": 0.0, "mongo_seconds": 0.0}
+        token = _request_usage.set(usage)
+        status = {"code": 500}
+        start = time.perf_counter()
+
+        async def sendWrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, sendWrapper)
+        finally:
+            _request_usage.reset(token)
+            route = routeName(scope)
+            method = scope.get("method", "")
+            HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route, str(status["code"])).inc()
+            DB_QUERIES.labels(route).inc(usage["db_queries"])
+            DB_QUERIES_PER_REQUEST.labels(route).observe(usage["db_queries"])
+            DB_TIME_PER_REQUEST.labels(route).observe(usage["db_seconds"])
+            MONGO_TIME_PER_REQUEST.labels(route).observe(usage["mongo_seconds"])
+
+def metricsPayload():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,74 @@
+import logging
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+from database import db, SERP_DATA_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# 컬렉션별 인덱스 정의: (키 목록, create_index 옵션)
+MONGO_INDEXES = {
+    "ChatBucket": [
+        ([("userId", ASCENDING), ("tripId", ASCENDING), ("bucket", DESCENDING), ("first", DESCENDING)], {"name": "userId_tripId_bucket"}),
+    ],
+    "ChatData": [
+        ([("userId", ASCENDING), ("tripId", ASCENDING)], {"name": "userId_tripId"}),
+    ],
+    "SavePlace": [
+        ([("userId", ASCENDING), ("tripId", ASCENDING)], {"name": "userId_tripId"}),
+        ([("tripId", ASCENDING)], {"name": "tripId"}),
+    ],
+    "SerpData": [
+        ([("userId", ASCENDING), ("tripId", ASCENDING)], {"name": "userId_tripId"}),
+        ([("updatedAt", ASCENDING)], {"name": "updatedAt_ttl", "expireAfterSeconds": SERP_DATA_TTL_SECONDS}),
+    ],
+    "LLMCache": [
+        ([("expiresAt", ASCENDING)], {"name": "expiresAt_ttl", "expireAfterSeconds": 0}),
+    ],
+}
+
+# IndexOptionsConflict, IndexKeySpecsConflict
+INDEX_CONFLICT_CODES = (85, 86)
+
+def ensureIndexes():
+    # 인덱스 하나가 실패해도 나머지(TTL 포함)는 계속 만들고, 실패한 인덱스 이름 목록을 반환
+    # 서버 연결 실패 같은 OperationFailure 이외의 오류는 다른 인덱스도 실패할 것이므로 그대로 발생
+    failed = []
+    for collection_name, indexes in MONGO_INDEXES.items():
+        collection = db[collection_name]
+        for keys, options in indexes:
+            try:
+                ensureIndex(collection, collection_name, keys, options)
+            except OperationFailure:
+                logger.exception("failed to ensure index %s.%s", collection_name, options["name"])
+                failed.append(f"{collection_name}.{options['name']}")
+                continue
+            logger.info("ensured index %s.%s", collection_name, options["name"])
+    if failed:
+        logger.error("failed to ensure %d mongo indexes: %s", len(failed), ", ".join(failed))
+    return failed
+
+def ensureIndex(collection, collection_name, keys, options):
+    try:
+        collection.create_index(keys, **options)
+    except OperationFailure as e:
+        if e.code not in INDEX_CONFLICT_CODES or "expireAfterSeconds" not in options:
+            raise
+        # TTL 설정값만 바뀐 경우 인덱스를 다시 만들지 않고 collMod로 갱신
+        db.command(
+            "collMod", collection_name,
+            index={"name": options["name"], "expireAfterSeconds": options["expireAfterSeconds"]}
+        )
+
+def indexUsageStats():
+    stats = {}
+    for collection_name in MONGO_INDEXES:
+        usage = db[collection_name].aggregate([{"$indexStats": {}}])
+        stats[collection_name] = [
+            {
+                "name": index["name"],
+                "ops": index["accesses"]["ops"],
+                "since": index["accesses"]["since"]
+            }
+            for index in usage
+        ]
+    return stats
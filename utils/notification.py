@@ -0,0 +1,117 @@
+import asyncio
+import datetime
+import logging
+import threading
+from contextlib import contextmanager
+from pymongo import CursorType
+from database import db, get_config
+
+logger = logging.getLogger(__name__)
+
+# 참가 신청 상태 변경을 접속 중인 사용자에게 바로 전달하는 pub/sub
+# "local": 같은 프로세스 안에서만 전달 (워커 1개일 때)
+# "mongo": capped collection에 기록하고 각 워커가 tailable cursor로 읽어서 전달 (워커 여러 개일 때)
+# gunicorn.conf.py는 워커가 2개 이상이면 mongo를 기본값으로 지정하고 local이 지정되어 있으면 시작하지 않음
+NOTIFICATION_BACKEND = get_config("NOTIFICATION_BACKEND", "local")
+NOTIFICATION_COLLECTION = "Notifications"
+NOTIFICATION_CAPPED_BYTES = get_config("NOTIFICATION_CAPPED_BYTES", 16 * 1024 * 1024)
+NOTIFICATION_QUEUE_SIZE = 100
+SSE_KEEPALIVE_SECONDS = 15
+
+_subscribers = {}
+_loop = None
+_tail_task = None
+_stop = threading.Event()
+
+@contextmanager
+def subscribe(userId):
+    queue = asyncio.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+    _subscribers.setdefault(userId, set()).add(queue)
+    try:
+        yield queue
+    finally:
+        queues = _subscribers.get(userId)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                _subscribers.pop(userId, None)
+
+def _deliver(recipients, event):
+    for userId in recipients:
+        for queue in list(_subscribers.get(userId, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # 읽지 못하는 연결은 오래된 알림을 버리고 최신 알림 유지
+                queue.get_nowait()
+                queue.put_nowait(event)
+
+def publish(recipients, event):
+    recipients = sorted({userId for userId in recipients if userId})
+    if not recipients:
+        return
+    event = {**event, "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()}
+    if NOTIFICATION_BACKEND == "mongo":
+        db[NOTIFICATION_COLLECTION].insert_one({"recipients": recipients, "event": event})
+    else:
+        _deliver(recipients, event)
+
+def joinRequestEvent(event_type, join_request, crew_data=None):
+    return {
+        "type": event_type,
+        "requestId": join_request.requestId,
+        "crewId": join_request.crewId,
+        "userId": join_request.userId,
+        "tripId": join_request.tripId,
+        "status": join_request.status,
+        "crewTitle": crew_data.title if crew_data else None,
+        "crewLeader": crew_data.crewLeader if crew_data else None
+    }
+
+def _ensureCappedCollection():
+    if NOTIFICATION_COLLECTION not in db.list_collection_names():
+        db.create_collection(NOTIFICATION_COLLECTION, capped=True, size=NOTIFICATION_CAPPED_BYTES)
+    collection = db[NOTIFICATION_COLLECTION]
+    latest = collection.find_one(sort=[("$natural", -1)])
+    if latest is None:
+        # 빈 capped collection에서는 tailable cursor가 바로 닫히므로 시작 문서를 하나 넣어 둠
+        collection.insert_one({"recipients": [], "event": None})
+        latest = collection.find_one(sort=[("$natural", -1)])
+    return latest["_id"]
+
+def _tail(last_id):
+    collection = db[NOTIFICATION_COLLECTION]
+    while not _stop.is_set():
+        try:
+            # 처음 조회 결과가 비면 tailable cursor가 바로 닫히므로 마지막으로 읽은 문서부터 다시 읽고 건너뜀
+            cursor = collection.find({"_id": {"$gte": last_id}}, cursor_type=CursorType.TAILABLE_AWAIT).max_await_time_ms(1000)
+            while cursor.alive and not _stop.is_set():
+                # 새 문서가 없으면 max_await_time_ms만큼 기다린 뒤 StopIteration, 커서는 계속 살아 있음
+                try:
+                    document = next(cursor)
+                except StopIteration:
+                    continue
+                if document["_id"] == last_id:
+                    continue
+                last_id = document["_id"]
+                if document.get("event"):
+                    _loop.call_soon_threadsafe(_deliver, document["recipients"], document["event"])
+        except Exception:
+            logger.exception("notification tail cursor failed")
+        _stop.wait(1)
+
+async def startNotificationHub():
+    global _loop, _tail_task
+    _loop = asyncio.get_running_loop()
+    if NOTIFICATION_BACKEND != "mongo":
+        return
+    _stop.clear()
+    last_id = await asyncio.to_thread(_ensureCappedCollection)
+    _tail_task = asyncio.ensure_future(asyncio.to_thread(_tail, last_id))
+
+async def stopNotificationHub():
+    global _tail_task
+    _stop.set()
+    if _tail_task is not None:
+        await _tail_task
+        _tail_task = None
@@ -1,21 +1,16 @@
-import os
-import google.generativeai as genai
+from utils.llmCache import cachedGenerateContent
 
-def openaiMemo(contry, city, GEMINI_API_KEY):
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-1.5-flash')
+async def openaiMemo(contry, city):
+    contry, city = contry.strip(), city.strip()
     query = f"{city}, {contry} 여행 할 때 신경써야할 점을 한국어 200자 이내로 알려줘 '\n'(개행) 꼭 넣어서"
 
-    response = model.generate_content(query)
-    
-    result = response.text
+    result = await cachedGenerateContent(query)
     return result
 
-def openaiPlanMemo(places, GEMINI_API_KEY):
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-1.5-flash')
+async def openaiPlanMemo(places):
+    # 같은 장소 묶음이면 순서와 상관없이 같은 프롬프트가 되도록 정렬
+    places = sorted(set(places))
     query = f"{places} 여행 할 때 신경써야할 점을 한국어 200자 이내로 알려줘 '\n'(개행) 꼭 넣어서 "
-    response = model.generate_content(query)
-    
-    result = response.text
+
+    result = await cachedGenerateContent(query)
     return result
@@ -0,0 +1,39 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from passlib.context import CryptContext
+from database import get_config
+
+# 비밀번호 해시 설정, 작업량(work factor)은 secret.json에서 조정 가능
+PASSWORD_HASH_SCHEME = get_config("PASSWORD_HASH_SCHEME", "argon2")
+PASSWORD_HASH_WORKERS = get_config("PASSWORD_HASH_WORKERS", 4)
+ARGON2_TIME_COST = get_config("ARGON2_TIME_COST", 3)
+ARGON2_MEMORY_COST = get_config("ARGON2_MEMORY_COST", 65536)
+ARGON2_PARALLELISM = get_config("ARGON2_PARALLELISM", 1)
+BCRYPT_ROUNDS = get_config("BCRYPT_ROUNDS", 12)
+
+# 기본 스킴이 아닌 해시(기존 bcrypt 등)는 deprecated로 취급되어 로그인 시 재해시됨
+pwd_context = CryptContext(
+    schemes=[PASSWORD_HASH_SCHEME] + [scheme for scheme in ("argon2", "bcrypt") if scheme != PASSWORD_HASH_SCHEME],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+    bcrypt__rounds=BCRYPT_ROUNDS,
+)
+
+# 해시 계산은 이벤트 루프를 막지 않도록 크기가 제한된 전용 스레드 풀에서 실행
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+async def hashPassword(password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, pwd_context.hash, password)
+
+async def verifyPassword(password, hashed):
+    # (검증 결과, 새 해시) 반환, 새 해시가 있으면 호출한 쪽에서 저장
+    if not hashed:
+        return False, None
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_executor, pwd_context.verify_and_update, password, hashed)
+    except ValueError:
+        return False, None
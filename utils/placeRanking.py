@@ -0,0 +1,119 @@
+import re
+import numpy as np
+from database import get_config
+from utils.geo import haversine
+
+# 검색 결과를 사용자 성향(personality)에 맞게 로컬에서 점수화해서 정렬
+# "llm"으로 설정하면 기존처럼 Gemini에게 재정렬을 맡김
+PLACE_RANKING_MODE = get_config("PLACE_RANKING_MODE", "local")
+DISTANCE_SCALE_KM = get_config("PLACE_RANKING_DISTANCE_SCALE_KM", 2.0)
+
+FEATURES = ["rating", "popularity", "price", "distance", "photo"]
+
+# 기본 가중치 + 성향 값별 가중치 변화량, secret.json의 PLACE_RANKING_WEIGHTS로 덮어쓸 수 있음
+DEFAULT_WEIGHTS = {
+    "base": {"rating": 1.0, "popularity": 0.3, "price": 0.0, "distance": -0.5, "photo": 0.0},
+    "money1": {"price": 0.8},
+    "money2": {"price": -0.8},
+    "food1": {"rating": 1.0, "popularity": 0.3},
+    "food2": {"rating": -0.6},
+    "transport1": {"distance": -1.5},
+    "transport2": {"distance": 0.4},
+    "photo1": {},
+    "photo2": {"photo": 1.2},
+}
+PLACE_RANKING_WEIGHTS = {
+    key: {**DEFAULT_WEIGHTS.get(key, {}), **value}
+    for key, value in {**DEFAULT_WEIGHTS, **get_config("PLACE_RANKING_WEIGHTS", {})}.items()
+}
+
+PHOTO_KEYWORDS = re.compile(
+    r"view|scenic|landmark|observ|tower|viewpoint|park|garden|beach|bridge|palace|museum|gallery|cathedral|temple|"
+    r"photo|instagram|sunset|night view|전망|야경|포토|사진|명소|공원|해변|궁|성당|사원|미술관|박물관",
+    re.IGNORECASE
+)
+CURRENCY_SYMBOLS = "$₩€£¥"
+
+def priceLevel(price):
+    # "$$" 같은 기호 표기는 1~4단계로, 없으면 nan
+    if not price:
+        return np.nan
+    price = str(price).strip()
+    if price and all(char in CURRENCY_SYMBOLS for char in price):
+        return min(len(price), 4)
+    return np.nan
+
+def priceAmount(price):
+    # "₩10,000–20,000" 같은 금액 표기는 평균 금액, 없으면 nan
+    amounts = [float(number.replace(",", "")) for number in re.findall(r"\d[\d,]*", str(price or ""))]
+    return sum(amounts) / len(amounts) if amounts else np.nan
+
+def priceScores(prices):
+    # 기호 단계는 0~1로 변환, 금액 표기는 금액 표기끼리의 순위로 0~1, 정보가 없으면 0.5
+    levels = np.array([priceLevel(price) for price in prices], dtype=float)
+    amounts = np.array([priceAmount(price) for price in prices], dtype=float)
+    scores = np.full(len(prices), 0.5)
+    has_level = ~np.isnan(levels)
+    scores[has_level] = (levels[has_level] - 1) / 3
+    has_amount = ~has_level & ~np.isnan(amounts)
+    if has_amount.sum() > 1:
+        scores[has_amount] = amounts[has_amount].argsort().argsort() / (has_amount.sum() - 1)
+    return scores
+
+def personalityWeights(personality):
+    weights = dict(PLACE_RANKING_WEIGHTS["base"])
+    values = personality.values() if isinstance(personality, dict) else []
+    for value in values:
+        for feature, delta in PLACE_RANKING_WEIGHTS.get(value, {}).items():
+            weights[feature] = weights.get(feature, 0.0) + delta
+    return np.array([weights.get(feature, 0.0) for feature in FEATURES])
+
+def featureMatrix(places, latitude, longitude, hints=None):
+    hints = hints or [""] * len(places)
+
+    ratings = np.array([place.get("rating") or np.nan for place in places], dtype=float)
+    ratings = np.where(np.isnan(ratings), 3.0, ratings) / 5.0
+
+    reviews = np.array([place.get("reviews") or 0 for place in places], dtype=float)
+    popularity = np.log1p(reviews)
+    popularity = popularity / popularity.max() if popularity.max() > 0 else popularity
+
+    prices = priceScores([place.get("price") for place in places])
+
+    if latitude is not None and longitude is not None:
+        distances = haversine(
+            np.array([place["latitude"] for place in places], dtype=float),
+            np.array([place["longitude"] for place in places], dtype=float),
+            latitude, longitude
+        )
+        distances = distances / (distances + DISTANCE_SCALE_KM)
+    else:
+        distances = np.zeros(len(places))
+
+    photo = np.array([
+        1.0 if PHOTO_KEYWORDS.search(f"{place.get('title', '')} {place.get('description', '')} {hint}") else 0.0
+        for place, hint in zip(places, hints)
+    ])
+
+    return np.column_stack([ratings, popularity, prices, distances, photo])
+
+def rankPlaces(places, personality, latitude=None, longitude=None, hints=None):
+    if not places:
+        return []
+    scores = featureMatrix(places, latitude, longitude, hints) @ personalityWeights(personality)
+    order = np.argsort(-scores, kind="stable")
+    return [places[index] for index in order]
+
+def applyLlmOrder(places, response):
+    # LLM 응답 줄 순서대로 장소를 배치, 응답에 빠진 장소는 원래 순서로 뒤에 붙임
+    remaining = list(places)
+    ordered = []
+    for line in response.strip().split("\n"):
+        match = re.search(r"장소 이름:\s*(.+)", line)
+        title = match.group(1).strip() if match else None
+        index = next((i for i, place in enumerate(remaining) if place["title"] == title), None)
+        if index is None:
+            index = next((i for i, place in enumerate(remaining) if place["title"] and place["title"] in line), None)
+        if index is not None:
+            ordered.append(remaining.pop(index))
+    return ordered + remaining
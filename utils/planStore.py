@@ -0,0 +1,31 @@
+import uuid
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from models.models import tripPlans
+from database import db
+
+SavePlace_collection = db['SavePlace']
+
+PLAN_FIELDS = ["title", "date", "time", "place", "address", "latitude", "longitude", "description", "crewId"]
+
+def bulkInsertPlans(session: Session, userId, tripId, plans):
+    # 여러 계획을 한 번의 executemany INSERT로 저장하고 생성한 planId 목록 반환
+    # commit은 호출하는 쪽에서 (같은 트랜잭션으로 묶을 수 있도록)
+    rows = [
+        {"planId": str(uuid.uuid4()), "userId": userId, "tripId": tripId, **{field: plan.get(field) for field in PLAN_FIELDS}}
+        for plan in plans
+    ]
+    if rows:
+        session.execute(insert(tripPlans), rows)
+    return [row["planId"] for row in rows]
+
+def pullSavedPlaces(userId, tripId, places):
+    # 일정으로 옮긴 장소들을 SavePlace에서 한 번에 제거
+    places = sorted({place for place in places if place})
+    if not places:
+        return 0
+    result = SavePlace_collection.update_one(
+        {"userId": userId, "tripId": tripId},
+        {"$pull": {"placeData": {"title": {"$in": places}}}}
+    )
+    return result.modified_count
@@ -0,0 +1,20 @@
+from database import get_config
+
+# 외부 API 주소, secret.json의 PROVIDER_URLS로 공급자별로 바꿀 수 있음
+# FAKE_PROVIDER_URL을 지정하면 모든 공급자를 로컬 가짜 서버(benchmarks/fakeProviders.py)로 보냄
+DEFAULT_PROVIDER_URLS = {
+    "openai": "https://api.openai.com/v1",
+    "gemini": None,  # None이면 SDK 기본 주소(gRPC)
+    "serpapi": "https://serpapi.com",
+    "translate": "https://translate.google.com/m",
+    "weather": "https://api.openweathermap.org",
+    "kakao-auth": "https://kauth.kakao.com",
+    "kakao-api": "https://kapi.kakao.com",
+}
+FAKE_PROVIDER_URL = get_config("FAKE_PROVIDER_URL", None)
+PROVIDER_URLS = {**DEFAULT_PROVIDER_URLS, **get_config("PROVIDER_URLS", {})}
+
+def providerUrl(name):
+    if FAKE_PROVIDER_URL:
+        return f"{FAKE_PROVIDER_URL.rstrip('/')}/{name}"
+    return PROVIDER_URLS[name]
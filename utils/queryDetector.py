@@ -0,0 +1,76 @@
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from database import get_config
+
+logger = logging.getLogger(__name__)
+
+# 한 요청(또는 테스트) 안에서 같은 SQL 문이 반복 실행되는 N+1 패턴 감지
+# "off": 사용 안 함(운영), "log": 경고 로그(개발), "raise": NPlusOneDetected 예외 발생(테스트/CI)
+QUERY_DETECTOR_MODE = get_config("QUERY_DETECTOR_MODE", "off")
+# 같은 문장이 이 횟수 이상이면 N+1로 판단
+QUERY_DETECTOR_THRESHOLD = get_config("QUERY_DETECTOR_THRESHOLD", 3)
+
+_tracker = ContextVar("query_tracker", default=None)
+
+class NPlusOneDetected(Exception):
+    pass
+
+def normalizeStatement(statement):
+    # 파라미터 바인딩 문장은 그대로 같고, IN (...) 목록 길이만 다른 경우도 같은 문장으로 취급
+    statement = re.sub(r"\s+", " ", statement).strip()
+    return re.sub(r"IN \((?:[^()]|\([^()]*\))*\)", "IN (...)", statement, flags=re.IGNORECASE)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _countStatement(conn, cursor, statement, parameters, context, executemany):
+    counter = _tracker.get()
+    if counter is not None:
+        counter[normalizeStatement(statement)] += 1
+
+def repeatedStatements(counter, threshold=None):
+    threshold = threshold or QUERY_DETECTOR_THRESHOLD
+    return [(statement, count) for statement, count in counter.most_common() if count >= threshold]
+
+def report(label, repeated, mode):
+    message = "N+1 queries in %s: %s" % (
+        label, "; ".join(f"{count}x {statement[:200]}" for statement, count in repeated)
+    )
+    if mode == "raise":
+        raise NPlusOneDetected(message)
+    logger.warning(message)
+
+@contextmanager
+def trackQueries(label="block", mode=None, threshold=None):
+    # with 블록 안에서 실행된 SQL을 세고, 끝날 때 반복된 문장이 있으면 로그 또는 예외
+    mode = mode or QUERY_DETECTOR_MODE
+    counter = Counter()
+    token = _tracker.set(counter)
+    try:
+        yield counter
+    finally:
+        _tracker.reset(token)
+    repeated = repeatedStatements(counter, threshold)
+    if repeated:
+        report(label() if callable(label) else label, repeated, mode)
+
+class QueryDetectorMiddleware:
+    # 개발용 ASGI 미들웨어: 라우트 이름과 함께 기록, raise 모드에서는 응답 후 예외를 올려서 테스트 클라이언트가 실패하게 함
+    def __init__(self, app, mode=None):
+        self.app = app
+        self.mode = mode or QUERY_DETECTOR_MODE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        def label():
+            route = scope.get("route")
+            return f"{scope.get('method')} {getattr(route, 'path', None) or scope.get('path')}"
+
+        with trackQueries(label, self.mode):
+            await self.app(scope, receive, send)
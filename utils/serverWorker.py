@@ -0,0 +1,6 @@
+from uvicorn.workers import UvicornWorker
+
+# gunicorn이 관리하는 uvicorn 워커: uvloop 이벤트 루프 + httptools 파서
+# lifespan은 워커마다 실행되므로 DB 풀, HTTP 클라이언트도 워커별로 생성됨
+class TripPassWorker(UvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
@@ -0,0 +1,11 @@
+from utils.metrics import observeCall
+from utils.providers import providerUrl
+
+# deep_translator는 import가 무거워서 첫 번역 때 불러옴 (동기 함수, 비동기 코드에서는 asyncio.to_thread로 호출)
+def translate(text, source="auto", target="ko"):
+    from deep_translator import GoogleTranslator
+    with observeCall("translate", f"{source}-{target}"):
+        translator = GoogleTranslator(source=source, target=target)
+        # 생성자에서 주소를 받지 않아서 생성 후 교체
+        translator._base_url = providerUrl("translate")
+        return translator.translate(text)